@@ -11,6 +11,8 @@ sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from app.core.config import settings  # noqa
 from app.models.user import Base  # noqa
+import app.models.audit  # noqa
+import app.models.contact  # noqa
 
 # this is the Alembic Config object
 config = context.config
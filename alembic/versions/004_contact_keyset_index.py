@@ -0,0 +1,21 @@
+"""add (user_id, id) index for keyset pagination of contacts
+
+Revision ID: 004_contact_keyset_index
+Revises: 003_create_initial_superuser
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004_contact_keyset_index'
+down_revision = '003_create_initial_superuser'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    # Serves WHERE user_id = :uid [AND id > :cursor] ORDER BY id LIMIT :n
+    op.create_index('ix_t_contact_user_id_id', 't_contact', ['user_id', 'id'], unique=False)
+
+def downgrade() -> None:
+    op.drop_index('ix_t_contact_user_id_id', table_name='t_contact')
@@ -0,0 +1,35 @@
+"""add indexed search for contacts (pg_trgm on PostgreSQL, FTS5 on SQLite)
+
+Revision ID: 005_contact_search_indexes
+Revises: 004_contact_keyset_index
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+from app.models.contact import CONTACT_SEARCH_DDL, CONTACT_SEARCH_DROP_DDL
+
+# revision identifiers, used by Alembic.
+revision = '005_contact_search_indexes'
+down_revision = '004_contact_keyset_index'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    # pg_trgm GIN indexes on PostgreSQL, the FTS5 table and its triggers on
+    # SQLite: the same DDL that runs when the table is created
+    for statement in CONTACT_SEARCH_DDL.get(dialect, []):
+        op.execute(statement)
+
+    if dialect == 'sqlite':
+        # Index the contacts that already exist
+        op.execute("INSERT INTO t_contact_fts (t_contact_fts) VALUES ('rebuild')")
+
+    # Other databases keep using plain ILIKE (see CONTACT_SEARCH_BACKEND)
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+
+    for statement in CONTACT_SEARCH_DROP_DDL.get(dialect, []):
+        op.execute(statement)
@@ -1,6 +1,9 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import users, contacts
+from app.core.config import settings
+from app.api.v1.endpoints import users, contacts, metrics
 
 api_router = APIRouter()
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(contacts.router, prefix="/contacts", tags=["contacts"])
+if settings.METRICS_ENABLED:
+    api_router.include_router(metrics.router, tags=["metrics"])
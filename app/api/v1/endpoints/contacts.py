@@ -1,63 +1,130 @@
 import logging
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import CachedResponse
+from app.core.conditional import entity_tag, is_not_modified, not_modified_response, set_validators
+from app.core.config import settings
+from app.core import database
+from app.core.database import get_async_db
+from app.core.pagination import InvalidCursorError
 from app.api.v1.endpoints.users import get_current_user
-from app.models.user import User
-from app.schemas.contact import Contact, ContactCreate, ContactUpdate
+from app.schemas.user import User
+from app.schemas.contact import (
+    Contact, ContactBulkResult, ContactBulkSelection, ContactBulkUpdate, ContactCreate,
+    ContactImportResponse, ContactUpdate, PaginatedContactResponse, contact_page_serializer
+)
 from app.services import contact as contact_service
+from app.services.contact_export import EXPORT_MEDIA_TYPES, export_contacts_async
+from app.services.contact_import import ContactImportFormatError, import_contacts_async
 
 log = logging.getLogger(__name__)
 router = APIRouter()
 
-@router.get("/", response_model=List[Contact])
-def list_contacts(
-    db: Session = Depends(get_db),
+IMPORT_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+@router.get("/", response_model=PaginatedContactResponse)
+async def list_contacts(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     search: Optional[str] = Query(None, min_length=1),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; overrides skip"),
+    include_total: bool = Query(True, description="Set to false to skip counting matching contacts"),
 ):
     """
-    Retrieve all contacts for the current user.
-    Optional search parameter will search across name, email, and phone.
+    Retrieve all contacts for the current user, ordered by id.
+    Optional search parameter will search across name, email, and phone;
+    search results are ordered by relevance where the database supports it.
+    Use `next_cursor` from the response as `cursor` to page through large
+    address books; every cursor page costs the same as the first one.
+    Send the ETag back in If-None-Match to get a 304 while nothing changed.
     """
-    contacts = contact_service.get_user_contacts(
-        db=db,
-        user_id=current_user.id,
-        skip=skip,
-        limit=limit,
-        search=search
-    )
-    total = contact_service.get_total_contacts(
-        db=db,
-        user_id=current_user.id,
-        search=search
-    )
-    return {
-        "items": contacts,
-        "total": total,
-        "page": skip // limit + 1,
-        "page_size": limit
+    # What the page depends on; search matching is case-insensitive and
+    # skip is ignored when paging with a cursor
+    params = {
+        "limit": limit,
+        "search": search.lower() if search else None,
+        "include_total": include_total,
+        **({"skip": skip} if cursor is None else {"cursor": cursor}),
+    }
+    cached, generation = contact_service.contact_list_cache.get(current_user.id, params)
+    if cached is not None:
+        if is_not_modified(request, cached.etag):
+            return not_modified_response(cached.etag)
+        response = Response(content=cached.body, media_type="application/json")
+        set_validators(response, cached.etag)
+        return response
+
+    # Lists only carry an ETag: deleting a contact doesn't move max(updated_at),
+    # so a Last-Modified date couldn't reflect it
+    version = await contact_service.get_user_contacts_version_async(db, current_user.id, search)
+    etag = entity_tag("contacts", current_user.id, *sorted(params.items()), *version)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    try:
+        page = await contact_service.get_user_contacts_page_async(
+            db=db,
+            user_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            search=search,
+            cursor=cursor,
+            include_total=include_total
+        )
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    content = {
+        "items": page.items,
+        "total": page.total,
+        "page": skip // limit + 1 if cursor is None else None,
+        "page_size": limit,
+        "next_cursor": page.next_cursor
     }
+    if contact_service.contact_list_cache.enabled:
+        body = contact_page_serializer.dump_json(content)
+        contact_service.contact_list_cache.set(
+            current_user.id, params, generation, CachedResponse(body=body, etag=etag)
+        )
+        response = Response(content=body, media_type="application/json")
+    elif settings.FAST_JSON_RESPONSES:
+        response = contact_page_serializer.response(content)
+    else:
+        set_validators(response, etag)
+        return content
+    set_validators(response, etag)
+    return response
 
 @router.post("/", response_model=Contact, status_code=201)
-def create_contact(
+async def create_contact(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
     contact_in: ContactCreate,
 ):
     """Create a new contact for the current user."""
     try:
-        contact = contact_service.create_contact(
+        contact = await contact_service.create_contact_async(
             db=db,
             user_id=current_user.id,
             contact_in=contact_in
         )
         log.info(f"Created contact {contact.id} for user {current_user.id}")
         return contact
+    except PoolTimeoutError:
+        # Answered with 503 by the app's handler
+        raise
     except Exception as e:
         log.error(f"Error creating contact: {str(e)}")
         raise HTTPException(
@@ -65,14 +132,150 @@ def create_contact(
             detail="Error creating contact"
         )
 
+@router.post("/import", response_model=ContactImportResponse)
+async def import_contacts(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="Defaults to the Content-Type"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Import contacts from the raw request body, either CSV with a header row
+    (first_name, last_name, email, phone) or NDJSON (one object per line).
+    The body is streamed and inserted in batches, so uploads of any size run
+    in constant memory. Invalid rows are skipped and reported by line number.
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        format = IMPORT_CONTENT_TYPES.get(content_type)
+        if format is None:
+            raise HTTPException(
+                status_code=415,
+                detail="Send text/csv or application/x-ndjson, or pass ?format="
+            )
+
+    try:
+        report = await import_contacts_async(
+            db=db,
+            user_id=current_user.id,
+            chunks=request.stream(),
+            fmt=format
+        )
+    except ContactImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except PoolTimeoutError:
+        raise
+    except Exception as e:
+        log.error(f"Error importing contacts: {str(e)}")
+        raise HTTPException(
+            status_code=400,
+            detail="Error importing contacts"
+        )
+    log.info(f"Imported {report.imported} contacts for user {current_user.id}")
+    return report._asdict()
+
+@router.patch("/bulk", response_model=ContactBulkResult)
+async def bulk_update_contacts(
+    *,
+    bulk_in: ContactBulkUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Apply the same changes to many contacts at once, selected by `ids` or
+    by `search` (same matching as the listing). Runs a single UPDATE;
+    ids that don't exist or belong to someone else are ignored.
+    """
+    if not bulk_in.changes.model_dump(exclude_unset=True):
+        raise HTTPException(
+            status_code=400,
+            detail="No changes given"
+        )
+
+    try:
+        affected = await contact_service.update_contacts_async(
+            db=db,
+            user_id=current_user.id,
+            contact_in=bulk_in.changes,
+            ids=bulk_in.ids,
+            search=bulk_in.search
+        )
+        log.info(f"Bulk updated {affected} contacts for user {current_user.id}")
+        return {"affected": affected}
+    except PoolTimeoutError:
+        raise
+    except Exception as e:
+        log.error(f"Error updating contacts: {str(e)}")
+        raise HTTPException(
+            status_code=400,
+            detail="Error updating contacts"
+        )
+
+@router.post("/bulk-delete", response_model=ContactBulkResult)
+async def bulk_delete_contacts(
+    *,
+    selection: ContactBulkSelection,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Delete many contacts at once, selected by `ids` or by `search` (same
+    matching as the listing). Runs a single DELETE; ids that don't exist
+    or belong to someone else are ignored.
+    """
+    try:
+        affected = await contact_service.delete_contacts_async(
+            db=db,
+            user_id=current_user.id,
+            ids=selection.ids,
+            search=selection.search
+        )
+        log.info(f"Bulk deleted {affected} contacts for user {current_user.id}")
+        return {"affected": affected}
+    except PoolTimeoutError:
+        raise
+    except Exception as e:
+        log.error(f"Error deleting contacts: {str(e)}")
+        raise HTTPException(
+            status_code=400,
+            detail="Error deleting contacts"
+        )
+
+async def _export_stream(user_id: int, format: str, search: Optional[str]):
+    # The response body is sent after request dependencies have been torn
+    # down, so the stream owns its session instead of using get_async_db
+    async with database.AsyncSessionLocal() as db:
+        async for chunk in export_contacts_async(db, user_id, format, search):
+            yield chunk
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_contacts(
+    current_user: User = Depends(get_current_user),
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    search: Optional[str] = Query(None, min_length=1),
+):
+    """
+    Download all contacts of the current user (optionally filtered by
+    search) as CSV or NDJSON, ordered by id. The file is streamed from a
+    server-side cursor, so it starts immediately and memory stays flat
+    however many contacts there are.
+    """
+    return StreamingResponse(
+        _export_stream(current_user.id, format, search),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="contacts.{format}"'}
+    )
+
 @router.get("/{contact_id}", response_model=Contact)
-def get_contact(
+async def get_contact(
+    request: Request,
+    response: Response,
     contact_id: int = Path(..., ge=1),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Get a specific contact by ID."""
-    contact = contact_service.get_contact(
+    """Get a specific contact by ID. Supports If-None-Match / If-Modified-Since."""
+    contact = await contact_service.get_contact_async(
         db=db,
         user_id=current_user.id,
         contact_id=contact_id
@@ -82,18 +285,22 @@ def get_contact(
             status_code=404,
             detail="Contact not found"
         )
+    etag = entity_tag("contact", contact.id, contact.updated_at)
+    if is_not_modified(request, etag, contact.updated_at):
+        return not_modified_response(etag, contact.updated_at)
+    set_validators(response, etag, contact.updated_at)
     return contact
 
 @router.put("/{contact_id}", response_model=Contact)
-def update_contact(
+async def update_contact(
     *,
     contact_id: int = Path(..., ge=1),
     contact_in: ContactUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Update a contact."""
-    contact = contact_service.get_contact(
+    contact = await contact_service.get_contact_async(
         db=db,
         user_id=current_user.id,
         contact_id=contact_id
@@ -105,13 +312,15 @@ def update_contact(
         )
     
     try:
-        updated_contact = contact_service.update_contact(
+        updated_contact = await contact_service.update_contact_async(
             db=db,
             contact=contact,
             contact_in=contact_in
         )
         log.info(f"Updated contact {contact_id}")
         return updated_contact
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         log.error(f"Error updating contact: {str(e)}")
         raise HTTPException(
@@ -120,13 +329,13 @@ def update_contact(
         )
 
 @router.delete("/{contact_id}", status_code=204)
-def delete_contact(
+async def delete_contact(
     contact_id: int = Path(..., ge=1),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user),
 ):
     """Delete a contact."""
-    contact = contact_service.get_contact(
+    contact = await contact_service.get_contact_async(
         db=db,
         user_id=current_user.id,
         contact_id=contact_id
@@ -138,8 +347,10 @@ def delete_contact(
         )
     
     try:
-        contact_service.delete_contact(db=db, contact=contact)
+        await contact_service.delete_contact_async(db=db, contact=contact)
         log.info(f"Deleted contact {contact_id}")
+    except PoolTimeoutError:
+        raise
     except Exception as e:
         log.error(f"Error deleting contact: {str(e)}")
         raise HTTPException(
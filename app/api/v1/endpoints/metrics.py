@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Response
+from app.core.metrics import CONTENT_TYPE, registry
+
+router = APIRouter()
+
+@router.get("/metrics",
+            include_in_schema=False,
+            summary="Prometheus metrics")
+async def metrics() -> Response:
+    """Expose the process metrics in the Prometheus text format."""
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
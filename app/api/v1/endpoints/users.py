@@ -1,39 +1,45 @@
 import logging
 from datetime import timedelta
-from typing import Any
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from typing import Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
-from jose import JWTError, jwt
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession
+from jose import JWTError
 
+from app.core.conditional import entity_tag, is_not_modified, not_modified_response, set_validators
 from app.core.config import settings
-from app.core.database import get_db
-from app.core.security import create_access_token, oauth2_scheme  # Move oauth2_scheme to security.py
+from app.core.database import get_async_db, remember_write
+from app.core.pagination import decode_id_cursor, encode_cursor
+from app.core.security import (  # Move oauth2_scheme to security.py
+    PasswordHasherBusyError, create_access_token, decode_access_token, oauth2_scheme
+)
 from app.services import (
-    get_user_by_id, get_user_by_email, create_user, update_user,
-    authenticate_user, get_users
+    get_user_by_id_async, get_cached_user_async, get_user_by_email_async, create_user_async,
+    update_user_async, authenticate_user_async, get_users_async
 )
 from app.schemas.user import (
-    User, UserCreate, UserUpdate, Token, UserSearchParams, PaginatedResponse
+    User, UserCreate, UserUpdate, Token, UserSearchParams, PaginatedResponse, user_page_serializer
 )
 
 log = logging.getLogger(__name__)
 router = APIRouter()
 
 async def get_current_user(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     token: str = Depends(oauth2_scheme)
 ) -> User:
-    """Get current user from JWT token."""
+    """
+    Get current user from JWT token.
+    Returns a cached snapshot of the user, not an ORM instance.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_access_token(token)
         user_id: int = payload.get("sub")
         if user_id is None:
             log.warning("JWT token missing 'sub' claim")
@@ -42,7 +48,7 @@ async def get_current_user(
         log.error(f"JWT token validation error: {str(e)}")
         raise credentials_exception
 
-    user = get_user_by_id(db, int(user_id))
+    user = await get_cached_user_async(db, int(user_id))
     if user is None:
         log.warning(f"User with ID {user_id} not found")
         raise credentials_exception
@@ -64,13 +70,13 @@ async def get_current_active_superuser(
              status_code=status.HTTP_201_CREATED,
              summary="Register a new user",
              description="Create a new user account with the provided details.")
-def register_user(
+async def register_user(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_in: UserCreate,
 ) -> Any:
     """Register a new user."""
-    user = get_user_by_email(db, email=user_in.email)
+    user = await get_user_by_email_async(db, email=user_in.email)
     if user:
         log.warning(f"Registration failed: Email {user_in.email} already registered")
         raise HTTPException(
@@ -78,9 +84,13 @@ def register_user(
             detail="Email already registered",
         )
     try:
-        user = create_user(db, user_in)
+        user = await create_user_async(db, user_in, actor=user_in.email)
+        # The request had no token, so its write was tracked by IP
+        remember_write(user.id)
         log.info(f"Successfully registered user with ID: {user.id}")
         return user
+    except (PasswordHasherBusyError, PoolTimeoutError):
+        raise
     except Exception as e:
         log.error(f"Error during user registration: {str(e)}")
         raise HTTPException(
@@ -97,12 +107,12 @@ def register_user(
              """)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> Any:
     """
     Get JWT access token.
     """
-    user = authenticate_user(db, form_data.username, form_data.password)
+    user = await authenticate_user_async(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -121,11 +131,17 @@ async def login(
             description="Get details of currently logged in user",
             dependencies=[Depends(oauth2_scheme)])
 async def read_users_me(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user)
 ):
     """
-    Get current user.
+    Get current user. Supports If-None-Match / If-Modified-Since.
     """
+    etag = entity_tag("user", current_user.id, current_user.updated_at)
+    if is_not_modified(request, etag, current_user.updated_at):
+        return not_modified_response(etag, current_user.updated_at)
+    set_validators(response, etag, current_user.updated_at)
     return current_user
 
 @router.put("/me",
@@ -135,14 +151,17 @@ async def read_users_me(
             dependencies=[Depends(oauth2_scheme)])
 async def update_user_me(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_in: UserUpdate,
     current_user: User = Depends(get_current_user)
 ):
     """
     Update own user.
     """
-    user = update_user(db, current_user, user_in)
+    user = await get_user_by_id_async(db, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    user = await update_user_async(db, user, user_in, actor=current_user.email)
     return user
 
 @router.get("/",
@@ -151,19 +170,41 @@ async def update_user_me(
             description="Get list of users. Only available to superusers.",
             dependencies=[Depends(oauth2_scheme)])
 async def read_users(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page; overrides skip"),
+    include_total: bool = Query(True, description="Set to false to skip counting matching users"),
     search_params: UserSearchParams = Depends(),
     current_user: User = Depends(get_current_active_superuser)
 ):
     """
-    Retrieve users. Only superusers can access this endpoint.
+    Retrieve users, ordered by id. Only superusers can access this endpoint.
+    Use `next_cursor` from the response as `cursor` for keyset pagination.
     """
-    users, total = get_users(db, skip=skip, limit=limit, search_params=search_params)
-    return {
+    after_id = None
+    if cursor is not None:
+        try:
+            after_id = decode_id_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    # Fetch one extra row to know whether there is a next page
+    users, total = await get_users_async(
+        db, skip=skip, limit=limit + 1, search_params=search_params,
+        after_id=after_id, include_total=include_total
+    )
+    next_cursor = None
+    if len(users) > limit:
+        users = users[:limit]
+        next_cursor = encode_cursor({"id": users[-1].id})
+    content = {
         "items": users,
         "total": total,
-        "page": skip // limit + 1,
-        "page_size": limit
-    }
\ No newline at end of file
+        "page": skip // limit + 1 if cursor is None else None,
+        "page_size": limit,
+        "next_cursor": next_cursor
+    }
+    if settings.FAST_JSON_RESPONSES:
+        return user_page_serializer.response(content)
+    return content
\ No newline at end of file
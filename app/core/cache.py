@@ -0,0 +1,287 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, NamedTuple, Optional, Tuple
+from app.core.config import settings
+
+log = logging.getLogger(__name__)
+
+class TTLCache:
+    """
+    Thread-safe in-process LRU cache whose entries expire after a TTL.
+
+    `generation` is bumped on every invalidation. Loaders can read it before
+    hitting the database and pass it back to `set`, so a value loaded while
+    a concurrent invalidation happened is not cached.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl > 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or `default` on a miss or expired entry."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        generation: Optional[int] = None,
+    ) -> bool:
+        """
+        Store a value, evicting the least recently used entry when full.
+        `ttl` can shorten (never extend) the default time-to-live.
+        Returns False if nothing was stored.
+        """
+        if not self.enabled:
+            return False
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return False
+        expires_at = time.monotonic() + ttl
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return False
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return True
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a single entry."""
+        with self._lock:
+            self.generation += 1
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self.generation += 1
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, float]:
+        """Return size and hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+class CacheBackend(ABC):
+    """
+    Storage behind a ResponseCache. Values are bytes so that backends shared
+    between processes (Redis) can hold them; counters never go back.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the stored value or None."""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store a value for `ttl` seconds."""
+
+    @abstractmethod
+    def get_counter(self, key: str) -> int:
+        """Return a counter's value (0 if it was never incremented)."""
+
+    @abstractmethod
+    def incr(self, key: str) -> int:
+        """Increment a counter and return its new value."""
+
+class LocalCacheBackend(CacheBackend):
+    """Per-process backend: values and counters in LRUs of `maxsize` entries."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.values = TTLCache(maxsize, ttl)
+        self.max_counters = maxsize
+        self._counters: "OrderedDict[str, int]" = OrderedDict()
+        # Missing counters read as the floor, which stays above every
+        # evicted counter: restarting one at 0 would make old entries current again
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.values.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.values.set(key, value, ttl=ttl)
+
+    def get_counter(self, key: str) -> int:
+        with self._lock:
+            value = self._counters.get(key)
+            if value is None:
+                return self._floor
+            self._counters.move_to_end(key)
+            return value
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value = self._counters.pop(key, self._floor) + 1
+            self._counters[key] = value
+            while len(self._counters) > self.max_counters:
+                _, evicted = self._counters.popitem(last=False)
+                self._floor = max(self._floor, evicted + 1)
+            return value
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Backend shared by every worker through a Redis server (or anything
+    speaking its protocol). `client` is a redis-py compatible client.
+    """
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCacheBackend":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("The redis cache backend requires the 'redis' package") from e
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        self.client.set(key, value, px=max(1, int(ttl * 1000)))
+
+    def get_counter(self, key: str) -> int:
+        value = self.client.get(key)
+        return int(value) if value is not None else 0
+
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(key))
+
+def create_cache_backend() -> Optional[CacheBackend]:
+    """Build the backend selected by RESPONSE_CACHE_BACKEND (None when disabled)."""
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        return RedisCacheBackend.from_url(settings.RESPONSE_CACHE_REDIS_URL)
+    if settings.RESPONSE_CACHE_BACKEND == "local" and settings.RESPONSE_CACHE_MAX_SIZE > 0:
+        return LocalCacheBackend(settings.RESPONSE_CACHE_MAX_SIZE, settings.RESPONSE_CACHE_TTL_SECONDS)
+    return None
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+
+class ResponseCache:
+    """
+    Cache of rendered responses, partitioned by scope (e.g. a user id).
+
+    Keys embed the scope's generation counter: `invalidate(scope)` bumps it,
+    which makes every entry of that scope unreachable at once (they then
+    age out of the backend). A response is stored under the generation read
+    before it was loaded, so one built while a write happened is never
+    served afterwards.
+    """
+
+    def __init__(self, namespace: str, backend: Optional[CacheBackend], ttl: float):
+        self.namespace = namespace
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None and self.ttl > 0
+
+    def _generation_key(self, scope: Hashable) -> str:
+        return f"{self.namespace}:{scope}:generation"
+
+    def _key(self, scope: Hashable, generation: int, params: Dict[str, Any]) -> str:
+        normalized = json.dumps(params, sort_keys=True, separators=(",", ":"), default=str)
+        digest = hashlib.sha1(normalized.encode()).hexdigest()
+        return f"{self.namespace}:{scope}:{generation}:{digest}"
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, scope: Hashable, params: Dict[str, Any]) -> Tuple[Optional[CachedResponse], Optional[int]]:
+        """
+        Look up the response for `params`. Returns (cached response or None,
+        generation to pass to `set`); the generation is None if the backend
+        failed, in which case nothing should be stored.
+        """
+        if not self.enabled:
+            return None, None
+        try:
+            generation = self.backend.get_counter(self._generation_key(scope))
+            value = self.backend.get(self._key(scope, generation, params))
+        except Exception as e:
+            log.warning(f"Response cache lookup failed: {str(e)}")
+            self._count("errors")
+            return None, None
+        if value is None:
+            self._count("misses")
+            return None, generation
+        self._count("hits")
+        etag, _, body = value.partition(b"\n")
+        return CachedResponse(body=body, etag=etag.decode()), generation
+
+    def set(self, scope: Hashable, params: Dict[str, Any], generation: Optional[int], response: CachedResponse) -> None:
+        if not self.enabled or generation is None:
+            return
+        try:
+            value = response.etag.encode() + b"\n" + response.body
+            self.backend.set(self._key(scope, generation, params), value, self.ttl)
+        except Exception as e:
+            log.warning(f"Response cache store failed: {str(e)}")
+            self._count("errors")
+
+    def invalidate(self, scope: Hashable) -> None:
+        """Drop every cached response of a scope."""
+        if self.backend is None:
+            return
+        try:
+            self.backend.incr(self._generation_key(scope))
+        except Exception as e:
+            log.error(f"Response cache invalidation failed: {str(e)}")
+            self._count("errors")
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,61 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+from fastapi import Request, Response, status
+
+# Responses are per user: browsers may keep them but must revalidate
+CACHE_CONTROL = "private, no-cache"
+
+def entity_tag(*parts: Any) -> str:
+    """Weak ETag derived from the values identifying a representation's version."""
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+def _utc(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; the database clock is UTC
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+def http_date(value: datetime) -> str:
+    return format_datetime(_utc(value), usegmt=True)
+
+def _opaque_tag(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since (RFC 9110 13.1) against the
+    current validators. If-None-Match wins when both are sent.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        current = _opaque_tag(etag)
+        return any(_opaque_tag(tag) == current for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        return False
+    # HTTP dates have whole-second resolution
+    return _utc(last_modified).replace(microsecond=0) <= since
+
+def set_validators(response: Response, etag: str, last_modified: Optional[datetime] = None) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    if last_modified is not None:
+        response.headers["Last-Modified"] = http_date(last_modified)
+
+def not_modified_response(etag: str, last_modified: Optional[datetime] = None) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, etag, last_modified)
+    return response
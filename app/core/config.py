@@ -15,6 +15,40 @@ class Settings(BaseSettings):
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     
+    # Password hashing worker pool (bcrypt runs off the event loop)
+    PASSWORD_HASH_EXECUTOR: str = "thread"  # thread or process
+    PASSWORD_HASH_WORKERS: int = 0  # 0 means one worker per CPU
+    PASSWORD_HASH_QUEUE_SIZE: int = 32  # Waiting jobs before rejecting with 503
+
+    # Authenticated user cache (per process)
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 60  # 0 disables the cache
+
+    # Verified JWT cache (per process); entries never outlive the token's exp
+    TOKEN_CACHE_MAX_SIZE: int = 10000  # 0 disables the cache
+
+    # Response cache for contact listings: "local" (per process LRU),
+    # "redis" (shared through RESPONSE_CACHE_REDIS_URL) or "none"
+    RESPONSE_CACHE_BACKEND: str = "local"
+    RESPONSE_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    RESPONSE_CACHE_MAX_SIZE: int = 10000  # Entries, local backend only
+    RESPONSE_CACHE_TTL_SECONDS: int = 30  # 0 disables the cache
+
+    # Contact search: "auto" uses the indexed backend of the database
+    # (pg_trgm on PostgreSQL, FTS5 on SQLite), "like" forces plain ILIKE
+    CONTACT_SEARCH_BACKEND: str = "auto"
+
+    # Bulk contact import (POST /contacts/import)
+    CONTACT_IMPORT_BATCH_SIZE: int = 1000  # Rows per insert + commit
+    CONTACT_IMPORT_MAX_ERRORS: int = 100  # Rejected rows reported back in detail
+
+    # Contact export (GET /contacts/export): rows fetched per server-side cursor batch
+    CONTACT_EXPORT_BATCH_SIZE: int = 1000
+
+    # Encode responses with orjson and serialize list pages from ORM rows
+    # without re-validating them (see app/core/serialization.py)
+    FAST_JSON_RESPONSES: bool = False
+
     # CORS settings
     BACKEND_CORS_ORIGINS: List[str]
     
@@ -26,6 +60,35 @@ class Settings(BaseSettings):
     DB_PORT: str = ""  # Optional for SQLite
     DB_NAME: str
     DB_ECHO_LOG: bool = False  # Whether to log SQL queries
+
+    # Connection pool, per engine (sync, async and each replica) and per process
+    DB_POOL_SIZE: int = 5  # Connections kept open
+    DB_MAX_OVERFLOW: int = 10  # Extra connections opened under load
+    DB_POOL_TIMEOUT: float = 10  # Seconds to wait for a connection before answering 503
+    DB_POOL_PRE_PING: bool = False  # Test connections on checkout (survives database restarts)
+    DB_POOL_RECYCLE: int = -1  # Replace connections older than this many seconds; -1 never
+    DB_POOL_WAIT_WARNING_MS: int = 100  # Log checkouts that waited longer; 0 disables
+    # Production server (python -m app.server)
+    WEB_WORKERS: int = 0  # Worker processes; 0 means one per CPU
+    DB_MAX_CONNECTIONS: int = 0  # Connections of all workers and their engines together; 0: DB_POOL_* per engine
+    GRACEFUL_SHUTDOWN_SECONDS: float = 30  # On SIGTERM, wait this long for in-flight requests
+    # Worker threads for sync routes and dependencies; 0 means DB_POOL_SIZE + DB_MAX_OVERFLOW,
+    # so that threads don't queue up for a connection
+    THREADPOOL_WORKERS: int = 0
+
+    # SQLite performance profile, applied to every new connection.
+    # DB_NAME=":memory:" gives a database shared by all connections of the process (tests)
+    SQLITE_JOURNAL_MODE: str = "wal"  # wal: readers don't block on the writer; delete is SQLite's default
+    SQLITE_SYNCHRONOUS: str = "normal"  # With WAL, only a power loss can lose the last commits
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait for a lock this long before "database is locked"
+    SQLITE_CACHE_SIZE_KB: int = 8192  # Page cache of each connection: up to (pool size + overflow) x this per engine
+    SQLITE_MMAP_SIZE: int = 268435456  # Bytes of the file read through mmap; 0 disables
+
+    # Read replicas, as a JSON list of database URLs (same DB_TYPE as the
+    # primary). GET, HEAD and OPTIONS requests are served by them round-robin
+    DB_REPLICA_URLS: List[str] = []
+    DB_REPLICA_STICKY_SECONDS: int = 5  # Reads of a user (or IP) that just wrote go to the primary; 0 disables
+    DB_REPLICA_EJECT_SECONDS: int = 30  # A failing replica is skipped this long
     
     # Initial superuser settings
     INITIAL_SUPERUSER_EMAIL: EmailStr
@@ -33,7 +96,30 @@ class Settings(BaseSettings):
     
     # Optional settings
     LOG_LEVEL: str = "INFO"
-    RATE_LIMIT_PER_MINUTE: int = 100
+    RATE_LIMIT_PER_MINUTE: int = 100  # Per user (or IP when anonymous); 0 disables
+    RATE_LIMIT_LOGIN_PER_MINUTE: int = 10  # Additional per-IP budget for /users/login
+    RATE_LIMIT_REGISTER_PER_MINUTE: int = 5  # Additional per-IP budget for /users/register
+    RATE_LIMIT_BACKEND: str = "local"  # local (per process) or redis (shared by all workers)
+    RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/0"
+    RATE_LIMIT_MAX_KEYS: int = 100000  # Counters kept by the local backend
+
+    # OpenAPI schema generated ahead of time (python -m scripts.export_openapi);
+    # empty: generated on the first docs request
+    OPENAPI_SCHEMA_FILE: str = ""
+
+    # Prometheus metrics at {API_V1_PREFIX}/metrics
+    METRICS_ENABLED: bool = True
+    # Per-request query count and DB time in a Server-Timing response header
+    SERVER_TIMING_ENABLED: bool = True
+    # Log a possible N+1 when one statement runs this many times in a request; 0 disables
+    QUERY_REPEAT_WARNING_THRESHOLD: int = 10
+
+    # Audit log of user writes (l_user_audit), written in the background
+    AUDIT_ENABLED: bool = True
+    AUDIT_BATCH_SIZE: int = 500  # Rows per INSERT at most
+    AUDIT_QUEUE_SIZE: int = 10000  # Events waiting to be written
+    AUDIT_QUEUE_TIMEOUT_SECONDS: float = 1.0  # Wait for room in a full queue before dropping
+    AUDIT_SHUTDOWN_TIMEOUT_SECONDS: float = 10.0  # Wait for queued events at shutdown
 
     @validator("DB_TYPE")
     def validate_db_type(cls, v):
@@ -42,22 +128,92 @@ class Settings(BaseSettings):
             raise ValueError(f"Database type must be one of {allowed_dbs}")
         return v.lower()
 
+    @validator("SQLITE_JOURNAL_MODE")
+    def validate_sqlite_journal_mode(cls, v):
+        allowed_modes = ["wal", "delete", "truncate", "persist", "memory", "off"]
+        if v.lower() not in allowed_modes:
+            raise ValueError(f"SQLite journal mode must be one of {allowed_modes}")
+        return v.lower()
+
+    @validator("SQLITE_SYNCHRONOUS")
+    def validate_sqlite_synchronous(cls, v):
+        allowed_levels = ["off", "normal", "full", "extra"]
+        if v.lower() not in allowed_levels:
+            raise ValueError(f"SQLite synchronous level must be one of {allowed_levels}")
+        return v.lower()
+
+    @validator("PASSWORD_HASH_EXECUTOR")
+    def validate_password_hash_executor(cls, v):
+        allowed_executors = ["thread", "process"]
+        if v.lower() not in allowed_executors:
+            raise ValueError(f"Password hash executor must be one of {allowed_executors}")
+        return v.lower()
+
+    @validator("RESPONSE_CACHE_BACKEND")
+    def validate_response_cache_backend(cls, v):
+        allowed_backends = ["local", "redis", "none"]
+        if v.lower() not in allowed_backends:
+            raise ValueError(f"Response cache backend must be one of {allowed_backends}")
+        return v.lower()
+
+    @validator("RATE_LIMIT_BACKEND")
+    def validate_rate_limit_backend(cls, v):
+        allowed_backends = ["local", "redis"]
+        if v.lower() not in allowed_backends:
+            raise ValueError(f"Rate limit backend must be one of {allowed_backends}")
+        return v.lower()
+
+    @validator("CONTACT_SEARCH_BACKEND")
+    def validate_contact_search_backend(cls, v):
+        allowed_backends = ["auto", "like"]
+        if v.lower() not in allowed_backends:
+            raise ValueError(f"Contact search backend must be one of {allowed_backends}")
+        return v.lower()
+
     @validator("BACKEND_CORS_ORIGINS", pre=True)
     def assemble_cors_origins(cls, v: str | List[str]) -> List[str]:
         if isinstance(v, str):
             return [i.strip() for i in v.split(",")]
         return v
 
+    @property
+    def THREADPOOL_SIZE(self) -> int:
+        return self.THREADPOOL_WORKERS or self.DB_POOL_SIZE + self.DB_MAX_OVERFLOW
+
+    @property
+    def SQLITE_IN_MEMORY(self) -> bool:
+        return self.DB_TYPE == "sqlite" and self.DB_NAME == ":memory:"
+
+    @property
+    def SQLITE_DATABASE(self) -> str:
+        """
+        SQLite database path. The in-memory database uses the memdb VFS, which
+        (unlike shared cache) keeps regular locking, so busy_timeout applies.
+        """
+        if self.SQLITE_IN_MEMORY:
+            return "file:/fastapi-template?vfs=memdb&uri=true"
+        return self.DB_NAME
+
     @property
     def DATABASE_URL(self) -> str:
         """Construct database URL based on settings."""
         if self.DB_TYPE == "sqlite":
-            return f"sqlite:///{self.DB_NAME}"
+            return f"sqlite:///{self.SQLITE_DATABASE}"
         elif self.DB_TYPE == "mysql":
             return f"mysql+pymysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
         else:  # postgresql
             return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        """Construct the asyncio driver URL (aiosqlite, aiomysql or asyncpg)."""
+        if self.DB_TYPE == "sqlite":
+            return f"sqlite+aiosqlite:///{self.SQLITE_DATABASE}"
+        elif self.DB_TYPE == "mysql":
+            return f"mysql+aiomysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+        else:  # postgresql
+            return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
     @computed_field
     @property
     def AUTH_TOKEN_URL(self) -> str:
@@ -1,66 +1,356 @@
+import itertools
 import logging
-from sqlalchemy import create_engine
+import os
+import sqlite3
+import threading
+import time
+from fastapi import Request
+from jose import JWTError
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, Engine, make_url
+from sqlalchemy.exc import InterfaceError, OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool
-from typing import Dict
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.sql.functions import now
+from typing import Dict, List, Optional, Tuple
+from .cache import TTLCache
 from .config import settings
+from .metrics import CallbackGauge, Counter, Histogram
+from .query_counter import instrument_engine
+from .security import decode_access_token
 
 log = logging.getLogger(__name__)
 
-# Database-specific configuration
+@compiles(now, "sqlite")
+def _sqlite_now(element, compiler, **kw):
+    # CURRENT_TIMESTAMP has one-second resolution; updated_at based ETags
+    # need writes within the same second to produce different values
+    return "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+pool_wait_duration = Histogram(
+    "db_pool_wait_seconds", "Time spent getting a connection from the pool",
+    ("engine",), buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+pool_timeouts = Counter(
+    "db_pool_timeouts", "Checkouts that gave up after pool_timeout", ("engine",),
+)
+
+class _TimedCheckout:
+    """
+    Records how long checkouts wait for a connection (including opening an
+    overflow one), and logs the slow ones and the timeouts.
+    """
+    engine_label = "sync"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_timeouts.labels(self.engine_label).inc()
+            log.error(f"No {self.engine_label} database connection within {self._timeout}s: {self.status()}")
+            raise
+        finally:
+            waited = time.perf_counter() - start
+            pool_wait_duration.labels(self.engine_label).observe(waited)
+            if settings.DB_POOL_WAIT_WARNING_MS and waited * 1000 >= settings.DB_POOL_WAIT_WARNING_MS:
+                log.warning(f"Waited {waited * 1000:.0f}ms for a {self.engine_label} database connection: {self.status()}")
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    engine_label = "sync"
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    engine_label = "async"
+
+# Database-specific configuration, on top of the DB_POOL_* settings
 DB_CONFIG: Dict[str, Dict] = {
-    "sqlite": {
-        "pool_size": None,  # SQLite doesn't support pooling
-        "max_overflow": None,
-        "connect_args": {"check_same_thread": False}
-    },
-    "postgresql": {
-        "pool_size": 5,
-        "max_overflow": 10,
-        "pool_timeout": 30,
-        "connect_args": {}
-    },
-    "mysql": {
-        "pool_size": 5,
-        "max_overflow": 10,
-        "pool_timeout": 30,
-        "connect_args": {}
-    }
+    "sqlite": {"connect_args": {"check_same_thread": False}},
+    "postgresql": {"connect_args": {}},
+    "mysql": {"connect_args": {}},
 }
 
-def get_engine_config():
-    """Get database-specific engine configuration."""
+def get_engine_config(use_async: bool = False):
+    """
+    Get database-specific engine configuration.
+    Options set to None are left to the dialect defaults.
+    """
     db_type = settings.DB_TYPE.lower()
     if db_type not in DB_CONFIG:
         raise ValueError(f"Unsupported database type: {db_type}")
-    
-    config = DB_CONFIG[db_type].copy()
-    
-    # Use QueuePool for databases that support it
-    if config["pool_size"] is not None:
-        config["poolclass"] = QueuePool
-    
+
+    config = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    config.update(
+        (key, value) for key, value in DB_CONFIG[db_type].items()
+        if value is not None
+    )
+    config["connect_args"] = dict(config.get("connect_args", {}))
+
+    # aiosqlite would default to NullPool, which opens a new connection
+    # (and a new worker thread) for every session
+    config["poolclass"] = InstrumentedAsyncAdaptedQueuePool if use_async else InstrumentedQueuePool
+
     return config
 
-# Create database engine with appropriate configuration
-try:
-    engine_config = get_engine_config()
-    connect_args = engine_config.pop("connect_args", {})
-    
-    engine = create_engine(
-        settings.DATABASE_URL,
+def sqlite_pragmas() -> Dict[str, object]:
+    """PRAGMAs applied to every new SQLite connection, from the SQLITE_* settings."""
+    pragmas: Dict[str, object] = {"busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS}
+    if not settings.SQLITE_IN_MEMORY:  # An in-memory database has no journal file
+        pragmas["journal_mode"] = settings.SQLITE_JOURNAL_MODE
+    pragmas.update(
+        synchronous=settings.SQLITE_SYNCHRONOUS,
+        cache_size=-settings.SQLITE_CACHE_SIZE_KB,  # Negative: KiB rather than pages
+        mmap_size=settings.SQLITE_MMAP_SIZE,
+        temp_store="memory",
+    )
+    return pragmas
+
+def set_sqlite_pragmas(engine: Engine, pragmas: Dict[str, object]) -> None:
+    """Run `PRAGMA name = value` for each of `pragmas` on every new connection of `engine`."""
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
+
+# asyncio driver of each backend, for replica URLs given with the sync one
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg", "mysql": "aiomysql"}
+
+def async_database_url(url: str) -> URL:
+    """`url` with the asyncio driver of its backend, unless it already names one."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS or parsed.get_driver_name() == ASYNC_DRIVERS[backend]:
+        return parsed
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+def create_replica_engine(url: str) -> AsyncEngine:
+    """Async engine for a read replica, configured like the primary one."""
+    config = get_engine_config(use_async=True)
+    connect_args = config.pop("connect_args", {})
+    replica = create_async_engine(
+        async_database_url(url),
         connect_args=connect_args,
-        echo=settings.DB_ECHO_LOG,  # SQL query logging
-        **engine_config
+        echo=settings.DB_ECHO_LOG,
+        **config
     )
-    log.info(f"Database engine created successfully for {settings.DB_TYPE}")
-except Exception as e:
-    log.error(f"Error creating database engine: {str(e)}")
-    raise
+    if replica.dialect.name == "sqlite":
+        set_sqlite_pragmas(replica.sync_engine, sqlite_pragmas())
+    instrument_engine(replica.sync_engine)
+    return replica
+
+replica_ejections = Counter(
+    "db_replica_ejections", "Times a read replica was taken out of rotation", ("replica",),
+)
+replica_retries = Counter(
+    "db_replica_retries", "Reads run again on the primary after their replica failed",
+)
+session_routes = Counter(
+    "db_sessions", "Request sessions by the engine they were bound to", ("target",),
+)
+
+class ReplicaSet:
+    """
+    Read replicas, handed out round-robin. A replica that fails is ejected
+    for `eject_seconds`, then tried again; while every replica is ejected
+    `choose` returns None and reads go to the primary.
+    """
+
+    def __init__(self, engines: List[AsyncEngine], eject_seconds: float):
+        self.engines = engines
+        self.eject_seconds = eject_seconds
+        self._ejected_until = [0.0] * len(engines)
+        self._turn = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self.engines)
+
+    def choose(self) -> Optional[Tuple[int, AsyncEngine]]:
+        """Next healthy replica as (index, engine)."""
+        if not self.engines:
+            return None
+        now = time.monotonic()
+        start = next(self._turn)
+        for offset in range(len(self.engines)):
+            index = (start + offset) % len(self.engines)
+            if self._ejected_until[index] <= now:
+                return index, self.engines[index]
+        return None
+
+    def eject(self, index: int) -> None:
+        self._ejected_until[index] = time.monotonic() + self.eject_seconds
+        replica_ejections.labels(str(index)).inc()
+        log.warning(f"Read replica {index} ejected for {self.eject_seconds}s")
+
+    def healthy(self) -> int:
+        now = time.monotonic()
+        return sum(1 for until in self._ejected_until if until <= now)
+
+    async def dispose(self) -> None:
+        for replica in self.engines:
+            await replica.dispose()
+
+# Engines, replicas and session factories, created by init_engines()
+engine: Engine
+async_engine: AsyncEngine
+replicas: ReplicaSet
+SessionLocal: sessionmaker
+AsyncSessionLocal: async_sessionmaker
+ENGINE_GLOBALS = ("engine", "async_engine", "replicas", "SessionLocal", "AsyncSessionLocal")
+
+# The shared in-memory database only lives while a connection to it is open
+_sqlite_memory_keeper: Optional[sqlite3.Connection] = None
+_engines_lock = threading.Lock()
+
+def _create_engines() -> Dict[str, object]:
+    # Create database engine with appropriate configuration
+    try:
+        engine_config = get_engine_config()
+        connect_args = engine_config.pop("connect_args", {})
+
+        sync_engine = create_engine(
+            settings.DATABASE_URL,
+            connect_args=connect_args,
+            echo=settings.DB_ECHO_LOG,  # SQL query logging
+            **engine_config
+        )
+        log.info(f"Database engine created successfully for {settings.DB_TYPE}")
+    except Exception as e:
+        log.error(f"Error creating database engine: {str(e)}")
+        raise
+
+    # Create asyncio engine used by the async routes
+    try:
+        async_engine_config = get_engine_config(use_async=True)
+        async_connect_args = async_engine_config.pop("connect_args", {})
 
-# Create sessionmaker with the engine
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        asyncio_engine = create_async_engine(
+            settings.ASYNC_DATABASE_URL,
+            connect_args=async_connect_args,
+            echo=settings.DB_ECHO_LOG,
+            **async_engine_config
+        )
+        log.info(f"Async database engine created successfully for {settings.DB_TYPE}")
+    except Exception as e:
+        log.error(f"Error creating async database engine: {str(e)}")
+        raise
+
+    global _sqlite_memory_keeper
+    if settings.DB_TYPE == "sqlite":
+        set_sqlite_pragmas(sync_engine, sqlite_pragmas())
+        set_sqlite_pragmas(asyncio_engine.sync_engine, sqlite_pragmas())
+        if settings.SQLITE_IN_MEMORY and _sqlite_memory_keeper is None:
+            _sqlite_memory_keeper = sqlite3.connect(settings.SQLITE_DATABASE, uri=True, check_same_thread=False)
+
+    # Per-request query counts (Server-Timing header, query budgets in tests)
+    instrument_engine(sync_engine)
+    instrument_engine(asyncio_engine.sync_engine)
+
+    try:
+        replica_set = ReplicaSet(
+            [create_replica_engine(url) for url in settings.DB_REPLICA_URLS],
+            settings.DB_REPLICA_EJECT_SECONDS,
+        )
+        if replica_set:
+            log.info(f"{len(replica_set)} read replica engine(s) created")
+    except Exception as e:
+        log.error(f"Error creating read replica engines: {str(e)}")
+        raise
+
+    return {
+        "engine": sync_engine,
+        "async_engine": asyncio_engine,
+        "replicas": replica_set,
+        # Create sessionmaker with the engine
+        "SessionLocal": sessionmaker(autocommit=False, autoflush=False, bind=sync_engine),
+        # Async sessions keep attributes loaded after commit, since lazy loads
+        # are not possible outside of the greenlet context.
+        "AsyncSessionLocal": async_sessionmaker(
+            bind=asyncio_engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False,
+        ),
+    }
+
+def engines_ready() -> bool:
+    return "engine" in globals()
+
+def init_engines() -> None:
+    """
+    Create the engines and session factories, once. Called by the app's
+    lifespan; importing the app doesn't touch the database drivers. Any
+    earlier use of one of ENGINE_GLOBALS (scripts, tests) creates them too.
+    """
+    if engines_ready():
+        return
+    with _engines_lock:
+        if not engines_ready():
+            globals().update(_create_engines())
+
+async def dispose_engines() -> None:
+    """Close the pooled connections (the engines stay usable)."""
+    if engines_ready():
+        engine.dispose()
+        await async_engine.dispose()
+        await replicas.dispose()
+
+def _reset_pools_after_fork() -> None:
+    # A forked worker must not use the parent's pooled connections: give it
+    # empty pools, leaving the parent's connections open for the parent
+    if engines_ready():
+        engine.dispose(close=False)
+        async_engine.sync_engine.dispose(close=False)
+        for replica in replicas.engines:
+            replica.sync_engine.dispose(close=False)
+
+os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+def __getattr__(name: str):
+    # Module attributes not assigned yet: the engines before init_engines()
+    if name in ENGINE_GLOBALS:
+        init_engines()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _pool_stats():
+    if not engines_ready():
+        return
+    pools = [("sync", engine.pool), ("async", async_engine.sync_engine.pool)]
+    pools += [(f"replica{index}", replica.sync_engine.pool) for index, replica in enumerate(replicas.engines)]
+    for label, pool in pools:
+        if isinstance(pool, QueuePool):
+            yield (label, "size"), pool.size()
+            yield (label, "checked_out"), pool.checkedout()
+            yield (label, "checked_in"), pool.checkedin()
+            # Negative while the pool is still filling up to pool_size
+            yield (label, "overflow"), pool.overflow()
+
+CallbackGauge(
+    "db_pool_connections", "Connection pool usage, read at scrape time",
+    _pool_stats, ("engine", "state"),
+)
+
+def _replica_stats():
+    if engines_ready():
+        yield ("configured",), len(replicas)
+        yield ("healthy",), replicas.healthy()
+
+CallbackGauge(
+    "db_replicas", "Read replicas configured and in rotation",
+    _replica_stats, ("state",),
+)
 
 # Create base class for declarative models
 Base = declarative_base()
@@ -70,10 +360,108 @@ def get_db():
     Get database session with automatic cleanup.
     To be used as a FastAPI dependency.
     """
+    init_engines()
     db = SessionLocal()
     try:
         log.debug("Creating new database session")
         yield db
     finally:
         log.debug("Closing database session")
-        db.close()
\ No newline at end of file
+        db.close()
+
+# Requests that can be served by a read replica
+READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+# Errors that take a replica out of rotation
+REPLICA_FAILURES = (OperationalError, InterfaceError, OSError)
+
+# Users (or, without a token, client IPs) that wrote recently, whose reads
+# stay on the primary
+recent_writers = TTLCache(maxsize=100000, ttl=settings.DB_REPLICA_STICKY_SECONDS)
+
+# Scope key of a read retried on the primary after its replica failed
+PRIMARY_RETRY_SCOPE_KEY = "db_primary_retry"
+
+def _client_key(request: Request) -> str:
+    """The token's user, or else the client IP, like the rate limiter."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            sub = decode_access_token(token).get("sub")
+        except JWTError:
+            sub = None
+        if sub is not None:
+            return f"user:{sub}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+def remember_write(user_id: int) -> None:
+    """
+    Keep the reads of `user_id` on the primary for DB_REPLICA_STICKY_SECONDS,
+    for writes made before the user had a token (registration).
+    """
+    if replicas:
+        recent_writers.set(f"user:{user_id}", True)
+
+async def get_async_db(request: Request):
+    """
+    Get async database session with automatic cleanup.
+    To be used as a FastAPI dependency in `async def` routes.
+
+    With DB_REPLICA_URLS set, read-only requests get a session on a replica,
+    unless the same user wrote in the last DB_REPLICA_STICKY_SECONDS.
+    """
+    init_engines()
+    replica = None
+    key = _client_key(request) if replicas else None
+    writing = request.method not in READ_ONLY_METHODS
+    if key is not None:
+        if writing:
+            recent_writers.set(key, True)
+        elif recent_writers.get(key) is None and not request.scope.get(PRIMARY_RETRY_SCOPE_KEY):
+            replica = replicas.choose()
+    session_routes.labels("primary" if replica is None else "replica").inc()
+
+    async with AsyncSessionLocal(bind=async_engine if replica is None else replica[1]) as db:
+        log.debug("Creating new async database session")
+        try:
+            yield db
+        except REPLICA_FAILURES as e:
+            if replica is not None:
+                replicas.eject(replica[0])
+                # Lets ReplicaFailoverMiddleware run the request again on the primary
+                e.replica_failure = True
+            raise
+        finally:
+            if key is not None and writing:
+                # Counted from the end of the write, too
+                recent_writers.set(key, True)
+        log.debug("Closing async database session")
+
+class ReplicaFailoverMiddleware:
+    """
+    ASGI middleware running a read-only request once more, on the primary,
+    when its replica failed before any of the response was sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in READ_ONLY_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        started = False
+
+        async def send_wrapper(message):
+            nonlocal started
+            started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except REPLICA_FAILURES as e:
+            if started or not getattr(e, "replica_failure", False):
+                raise
+            log.warning(f"Retrying {scope['method']} {scope['path']} on the primary: {str(e)}")
+            replica_retries.inc()
+            await self.app({**scope, PRIMARY_RETRY_SCOPE_KEY: True}, receive, send)
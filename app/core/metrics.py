@@ -0,0 +1,320 @@
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+log = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds, the Prometheus client defaults
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+Sample = Tuple[str, LabelValues, float]  # (name suffix, label values, value)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+class MetricsRegistry:
+    """Metrics rendered together in the Prometheus text exposition format."""
+
+    def __init__(self):
+        self._metrics: Dict[str, "Metric"] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: "Metric") -> None:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+
+    def unregister(self, metric: "Metric") -> None:
+        with self._lock:
+            self._metrics.pop(metric.name, None)
+
+    def get(self, name: str) -> Optional["Metric"]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            try:
+                samples = list(metric.samples())
+            except Exception as e:
+                log.error(f"Error collecting metric {metric.name}: {str(e)}")
+                continue
+            lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for suffix, label_values, value in samples:
+                names = metric.labelnames + (("le",) if len(label_values) > len(metric.labelnames) else ())
+                labels = ",".join(
+                    f'{name}="{_escape(str(value))}"' for name, value in zip(names, label_values)
+                )
+                lines.append(
+                    f"{metric.name}{suffix}{{{labels}}} {_format_value(value)}" if labels
+                    else f"{metric.name}{suffix} {_format_value(value)}"
+                )
+        return "\n".join(lines) + "\n"
+
+# Process-wide registry served by the /metrics endpoint
+registry = MetricsRegistry()
+
+class Metric(ABC):
+    """
+    Base class of the metric types. Labelled children are created on first
+    use and cached, so recording a value costs a dict lookup and a lock.
+    """
+    type = "untyped"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        registry: Optional[MetricsRegistry] = registry
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, object] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def labels(self, *values: str):
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    @abstractmethod
+    def _new_child(self):
+        """Value holder of one label combination."""
+
+    @abstractmethod
+    def samples(self) -> Iterator[Sample]:
+        """Yield (name suffix, label values, value) for the exposition."""
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+    type = "counter"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def samples(self) -> Iterator[Sample]:
+        for values, child in list(self._children.items()):
+            yield "_total" if not self.name.endswith("_total") else "", values, child.value
+
+class Gauge(Metric):
+    """Value that goes up and down."""
+    type = "gauge"
+
+    def _new_child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def samples(self) -> Iterator[Sample]:
+        for values, child in list(self._children.items()):
+            yield "", values, child.value
+
+class CallbackGauge(Metric):
+    """
+    Gauge read when the metrics are scraped; `callback` returns
+    (label values, value) pairs. For state that is cheaper to look up on
+    demand than to track, like connection pool usage.
+    """
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Iterable[Tuple[LabelValues, float]]],
+        labelnames: Sequence[str] = (),
+        registry: Optional[MetricsRegistry] = registry
+    ):
+        super().__init__(name, documentation, labelnames, registry)
+        self.callback = callback
+
+    def _new_child(self):
+        raise TypeError(f"{self.name} is read from its callback and can't be set through labels()")
+
+    def samples(self) -> Iterator[Sample]:
+        for values, value in self.callback():
+            yield "", tuple(values), value
+
+class _Histogram:
+    __slots__ = ("upper_bounds", "counts", "sum", "_lock")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        self.counts = [0] * (len(upper_bounds) + 1)  # Last one is +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def time(self) -> "_Timer":
+        return _Timer(self)
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: _Histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start)
+
+class Histogram(Metric):
+    """Distribution of observed values (e.g. durations in seconds) in cumulative buckets."""
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        registry: Optional[MetricsRegistry] = registry
+    ):
+        self.upper_bounds = tuple(sorted(float(bound) for bound in buckets if not math.isinf(bound)))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self) -> _Histogram:
+        return _Histogram(self.upper_bounds)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def time(self) -> _Timer:
+        return self.labels().time()
+
+    def samples(self) -> Iterator[Sample]:
+        for values, child in list(self._children.items()):
+            with child._lock:
+                counts, total = list(child.counts), child.sum
+            cumulative = 0
+            for bound, count in zip(self.upper_bounds + (math.inf,), counts):
+                cumulative += count
+                yield "_bucket", values + (_format_value(bound),), cumulative
+            yield "_count", values, cumulative
+            yield "_sum", values, total
+
+# HTTP metrics
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+http_requests = Counter(
+    "http_requests", "Requests handled, by route template and status code",
+    ("method", "route", "status"),
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "Time until the response was fully sent",
+    ("method", "route"),
+)
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress", "Requests being handled", ("method",),
+)
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request counts, latencies and in-flight
+    requests. Routes are labelled with their path template (e.g.
+    /contacts/{contact_id}), resolved from the endpoint the router picked,
+    so label cardinality stays bounded whatever the URLs requested.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._route_paths: Optional[Dict[Callable, str]] = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        in_progress = http_requests_in_progress.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+            route = self._route_path(scope)
+            http_request_duration.labels(method, route).observe(elapsed)
+            http_requests.labels(method, route, str(status)).inc()
+
+    def _route_path(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        if self._route_paths is None:
+            app = scope.get("app")
+            routes = getattr(app, "routes", [])
+            self._route_paths = {
+                route.endpoint: route.path for route in routes if hasattr(route, "endpoint")
+            }
+        return self._route_paths.get(endpoint, UNMATCHED_ROUTE)
@@ -0,0 +1,30 @@
+import json
+import logging
+from typing import Any, Callable, Dict
+from fastapi import FastAPI
+
+log = logging.getLogger(__name__)
+
+def prebuilt_openapi(app: FastAPI, path: str) -> Callable[[], Dict[str, Any]]:
+    """
+    Replacement for `app.openapi` that loads the schema written by
+    scripts/export_openapi.py instead of generating it from the routes.
+    A missing file, or one written for another title or version, falls
+    back to generating the schema. Either way it is built once and cached.
+    """
+    def openapi() -> Dict[str, Any]:
+        if app.openapi_schema is None:
+            try:
+                with open(path) as f:
+                    schema = json.load(f)
+            except (OSError, ValueError) as e:
+                log.warning(f"Could not load the OpenAPI schema from {path}, generating it: {e}")
+                schema = None
+            info = schema.get("info", {}) if schema is not None else {}
+            if schema is not None and (info.get("title"), info.get("version")) != (app.title, app.version):
+                log.warning(f"OpenAPI schema in {path} is for another app title or version, generating it")
+                schema = None
+            app.openapi_schema = schema if schema is not None else FastAPI.openapi(app)
+        return app.openapi_schema
+
+    return openapi
@@ -0,0 +1,116 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence
+from sqlalchemy import ColumnElement, Row, Select, and_, func, or_, select
+from sqlalchemy.orm import aliased
+
+class InvalidCursorError(ValueError):
+    """Raised for malformed cursors or cursors that don't match the query."""
+
+class Page(NamedTuple):
+    items: List[Any]
+    total: Optional[int]
+    next_cursor: Optional[str]
+
+def encode_cursor(position: Dict[str, Any]) -> str:
+    """Encode a keyset position (e.g. {"id": 42}) into an opaque cursor."""
+    raw = json.dumps(position, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by encode_cursor. Raises InvalidCursorError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+    if not isinstance(position, dict):
+        raise InvalidCursorError("Invalid cursor")
+    return position
+
+def decode_id_cursor(cursor: str) -> int:
+    """Decode a cursor over an integer `id` ordering."""
+    last_id = decode_cursor(cursor).get("id")
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise InvalidCursorError("Invalid cursor")
+    return last_id
+
+def decode_ranked_cursor(cursor: str, ranked: bool) -> Dict[str, Any]:
+    """
+    Decode a cursor over an `id` or `(rank, id)` ordering. `ranked` tells
+    which one the current query uses; a cursor from the other kind of
+    listing is rejected.
+    """
+    position = {"id": decode_id_cursor(cursor)}
+    rank = decode_cursor(cursor).get("rank")
+    if ranked != (rank is not None):
+        raise InvalidCursorError("Cursor does not match the query")
+    if ranked:
+        if not isinstance(rank, (int, float)) or isinstance(rank, bool):
+            raise InvalidCursorError("Invalid cursor")
+        position["rank"] = rank
+    return position
+
+def page_query(
+    query: Select,
+    entity: Any,
+    skip: int,
+    limit: int,
+    after: Optional[Dict[str, Any]] = None,
+    rank: Optional[ColumnElement] = None,
+    with_total: bool = False
+) -> Select:
+    """
+    Turn a filtered `select(entity)` into one statement returning a page of
+    `entity` rows ordered by id, or by (rank, id) when a relevance `rank`
+    (lower is better) is given.
+
+    With `after` (a decoded cursor) the page starts right after that row
+    (keyset pagination) and `skip` is ignored. With `with_total` every row
+    also carries a `total` column holding the number of rows matching the
+    filter (count(*) OVER ()). The window runs in the subquery, before the
+    keyset/offset slice, so it counts every matching row and not only the
+    ones after the cursor. An empty page carries no total.
+    """
+    if rank is not None:
+        query = query.add_columns(rank.label("rank"))
+    if with_total:
+        query = query.add_columns(func.count().over().label("total"))
+    filtered = query.subquery()
+
+    row = aliased(entity, filtered)
+    columns = [row]
+    order = [filtered.c.id]
+    if rank is not None:
+        columns.append(filtered.c.rank)
+        order.insert(0, filtered.c.rank)
+    if with_total:
+        columns.append(filtered.c.total)
+    page = select(*columns).order_by(*order)
+
+    if after is not None:
+        if rank is not None:
+            page = page.where(or_(
+                filtered.c.rank > after["rank"],
+                and_(filtered.c.rank == after["rank"], filtered.c.id > after["id"])
+            ))
+        else:
+            page = page.where(filtered.c.id > after["id"])
+        return page.limit(limit)
+    return page.offset(skip).limit(limit)
+
+def build_page(rows: Sequence[Row], limit: int, total: Optional[int], ranked: bool = False) -> Page:
+    """
+    Build a Page from rows of `page_query` fetched with `limit + 1`; the
+    extra row only tells whether a next page exists.
+    """
+    items = [row[0] for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        position: Dict[str, Any] = {"id": items[-1].id}
+        if ranked:
+            position["rank"] = last.rank
+        next_cursor = encode_cursor(position)
+    return Page(items=items, total=total, next_cursor=next_cursor)
@@ -0,0 +1,98 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from .config import settings
+
+log = logging.getLogger(__name__)
+
+class QueryStats:
+    """Number of SQL statements run, and the time spent in them, for one request."""
+
+    __slots__ = ("count", "duration", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0  # Seconds
+        self.statements: Counter = Counter()  # SQL text -> times run
+
+    def add(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> List[str]:
+        """Statements run at least `threshold` times: the usual sign of an N+1 query."""
+        return [statement for statement, n in self.statements.items() if n >= threshold]
+
+# Stats of the request being handled. Queries run in worker threads and in
+# the async engine's greenlets see it too (the context is copied, the
+# object shared); queries outside of a request are not counted.
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None:
+        starts = conn.info.get("query_start")
+        start = starts.pop() if starts else time.perf_counter()
+        stats.add(statement, time.perf_counter() - start)
+
+def instrument_engine(engine: Engine) -> None:
+    """Count the statements run through `engine` (use `async_engine.sync_engine` for async engines)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Stats of the request being handled, or None outside of a request."""
+    return _current.get()
+
+def server_timing(stats: QueryStats, elapsed: float) -> str:
+    """Server-Timing header value for the database and total time (both in ms)."""
+    queries = "1 query" if stats.count == 1 else f"{stats.count} queries"
+    return f'db;dur={stats.duration * 1000:.1f};desc="{queries}", app;dur={elapsed * 1000:.1f}'
+
+class QueryCounterMiddleware:
+    """
+    ASGI middleware counting the SQL statements of each request. Adds a
+    Server-Timing header (when SERVER_TIMING_ENABLED) and logs a warning
+    when a statement repeats QUERY_REPEAT_WARNING_THRESHOLD times or more.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and settings.SERVER_TIMING_ENABLED:
+                value = server_timing(stats, time.perf_counter() - start)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", value.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            threshold = settings.QUERY_REPEAT_WARNING_THRESHOLD
+            if threshold > 0:
+                for statement in stats.repeated(threshold):
+                    log.warning(
+                        f"Possible N+1 query in {scope['method']} {scope['path']}: "
+                        f"ran {stats.statements[statement]} times: {statement}"
+                    )
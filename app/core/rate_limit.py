@@ -0,0 +1,221 @@
+import json
+import logging
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+from jose import JWTError
+from app.core.config import settings
+from app.core.security import decode_access_token
+
+log = logging.getLogger(__name__)
+
+WINDOW_SECONDS = 60
+
+class RateLimitStore(ABC):
+    """Counters behind the rate limiter; shared stores make limits hold across workers."""
+
+    @abstractmethod
+    def incr(self, key: str, ttl: float) -> int:
+        """Increment a counter (created with a `ttl` in seconds) and return its new value."""
+
+    @abstractmethod
+    def get(self, key: str) -> int:
+        """Return a counter's value (0 if missing or expired)."""
+
+class LocalRateLimitStore(RateLimitStore):
+    """
+    Per-process store. All counters share the same TTL, so they expire in
+    insertion order and idle ones are evicted from the front of the dict in
+    O(1); `max_keys` bounds memory under a flood of distinct clients.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._counters: "OrderedDict[str, list]" = OrderedDict()  # key -> [expires_at, count]
+        self._lock = threading.Lock()
+
+    def _evict(self, now: float) -> None:
+        while self._counters:
+            key, (expires_at, _) = next(iter(self._counters.items()))
+            if expires_at > now and len(self._counters) <= self.max_keys:
+                break
+            del self._counters[key]
+
+    def incr(self, key: str, ttl: float) -> int:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._counters.get(key)
+            if entry is None or entry[0] <= now:
+                entry = self._counters[key] = [now + ttl, 0]
+                self._counters.move_to_end(key)
+            entry[1] += 1
+            self._evict(now)
+            return entry[1]
+
+    def get(self, key: str) -> int:
+        entry = self._counters.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return 0
+        return entry[1]
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+class RedisRateLimitStore(RateLimitStore):
+    """Store shared by every worker through Redis; `client` is a redis-py compatible client."""
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisRateLimitStore":
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("The redis rate limit backend requires the 'redis' package") from e
+        return cls(redis.Redis.from_url(url))
+
+    def incr(self, key: str, ttl: float) -> int:
+        count = int(self.client.incr(key))
+        if count == 1:
+            self.client.pexpire(key, int(ttl * 1000))
+        return count
+
+    def get(self, key: str) -> int:
+        value = self.client.get(key)
+        return int(value) if value is not None else 0
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    limit: int
+    retry_after: int  # Seconds, 0 when allowed
+
+class RateLimiter:
+    """
+    Sliding window counter: the count of the current fixed window plus the
+    previous window's count weighted by how much of it still overlaps the
+    last WINDOW_SECONDS. Two counters per key, one increment and one read
+    per request, and both work as atomic operations on a shared store.
+    Rejected requests are counted too, so a client hammering the API stays
+    blocked instead of getting through every time a slot frees up.
+    """
+
+    def __init__(self, store: RateLimitStore, window: float = WINDOW_SECONDS):
+        self.store = store
+        self.window = window
+
+    def hit(self, key: str, limit: int, now: Optional[float] = None) -> RateLimitResult:
+        now = time.time() if now is None else now
+        current = int(now // self.window)
+        elapsed = now - current * self.window
+
+        count = self.store.incr(f"{key}:{current}", ttl=2 * self.window)
+        previous = self.store.get(f"{key}:{current - 1}")
+        weight = 1 - elapsed / self.window
+        if previous * weight + count <= limit:
+            return RateLimitResult(allowed=True, limit=limit, retry_after=0)
+
+        wait = self._wait(previous, count, elapsed, limit)
+        return RateLimitResult(allowed=False, limit=limit, retry_after=max(1, math.ceil(wait)))
+
+    def _wait(self, previous: int, count: int, elapsed: float, limit: int) -> float:
+        """Seconds until one more request fits under `limit`, if none is made meanwhile."""
+        if previous and count < limit:
+            # Later in this window, as the previous one slides out
+            return self.window * (1 - (limit - count - 1) / previous) - elapsed
+        # In the next window this window's count is the previous one, still
+        # weighted at about 1, so wait for enough of it to slide out too
+        until_next = self.window - elapsed
+        return until_next + max(0.0, self.window * (1 - (limit - 1) / count))
+
+def create_rate_limit_store() -> RateLimitStore:
+    """Build the store selected by RATE_LIMIT_BACKEND."""
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitStore.from_url(settings.RATE_LIMIT_REDIS_URL)
+    return LocalRateLimitStore(settings.RATE_LIMIT_MAX_KEYS)
+
+def default_route_limits() -> Dict[str, int]:
+    """Stricter per-route budgets from the settings (0 disables one)."""
+    return {
+        f"{settings.API_V1_PREFIX}/users/login": settings.RATE_LIMIT_LOGIN_PER_MINUTE,
+        f"{settings.API_V1_PREFIX}/users/register": settings.RATE_LIMIT_REGISTER_PER_MINUTE,
+    }
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware enforcing `limit` requests per minute per client, keyed
+    by the JWT `sub` of a valid bearer token or else the client IP.
+    `route_limits` maps paths to their own, additional per-IP budget.
+    Rejected requests get a 429 with Retry-After.
+    """
+
+    def __init__(
+        self,
+        app,
+        limit: int,
+        route_limits: Optional[Dict[str, int]] = None,
+        store: Optional[RateLimitStore] = None,
+    ):
+        self.app = app
+        self.limit = limit
+        self.route_limits = {path: n for path, n in (route_limits or {}).items() if n > 0}
+        self.limiter = RateLimiter(store or create_rate_limit_store())
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        result = self._check(scope)
+        if result is not None and not result.allowed:
+            await self._reject(send, result)
+            return
+        await self.app(scope, receive, send)
+
+    def _check(self, scope) -> Optional[RateLimitResult]:
+        client = scope.get("client")
+        ip_key = f"ip:{client[0] if client else 'unknown'}"
+        try:
+            route_limit = self.route_limits.get(scope["path"])
+            if route_limit:
+                result = self.limiter.hit(f"route:{scope['path']}:{ip_key}", route_limit)
+                if not result.allowed:
+                    return result
+            if self.limit > 0:
+                return self.limiter.hit(self._client_key(scope) or ip_key, self.limit)
+        except Exception as e:
+            # Never take the API down with the limiter (e.g. Redis unreachable)
+            log.error(f"Rate limiter error: {str(e)}")
+        return None
+
+    @staticmethod
+    def _client_key(scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() != "bearer" or not token:
+                    return None
+                try:
+                    sub = decode_access_token(token).get("sub")
+                except JWTError:
+                    return None
+                return f"user:{sub}" if sub is not None else None
+        return None
+
+    @staticmethod
+    async def _reject(send, result: RateLimitResult) -> None:
+        body = json.dumps({"detail": "Too many requests"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(result.retry_after).encode()),
+                (b"x-ratelimit-limit", str(result.limit).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -1,10 +1,19 @@
+import asyncio
+import hashlib
 import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
+from .cache import TTLCache
 from .config import settings
+from .metrics import CallbackGauge, Histogram
 
 log = logging.getLogger(__name__)
 
@@ -25,6 +34,156 @@ def get_password_hash(password: str) -> str:
     """Generate password hash."""
     return pwd_context.hash(password)
 
+password_hash_duration = Histogram(
+    "password_hash_duration_seconds", "bcrypt time per operation on the hashing pool",
+    ("operation",), buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0, 5.0),
+)
+password_hash_queue_wait = Histogram(
+    "password_hash_queue_seconds", "Time hashing jobs waited for a free pool worker",
+    ("operation",), buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+def _timed(func: Callable, *args):
+    """Run `func` and return (result, seconds); measured in the worker, so it works with processes too."""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+class PasswordHasherBusyError(Exception):
+    """Raised when the password hashing pool has no free slot."""
+
+class PasswordHasher:
+    """
+    Runs CryptContext operations on a dedicated, bounded worker pool.
+
+    At most `max_workers + queue_size` jobs are accepted at once; further
+    jobs are rejected immediately with PasswordHasherBusyError instead of
+    queueing up behind slow bcrypt rounds.
+    """
+
+    def __init__(self, executor_type: str = "thread", max_workers: int = 0, queue_size: int = 32):
+        self.executor_type = executor_type
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.queue_size = queue_size
+        self._slots = threading.BoundedSemaphore(self.max_workers + queue_size)
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    log.info(
+                        f"Starting password hashing {self.executor_type} pool "
+                        f"with {self.max_workers} workers"
+                    )
+                    if self.executor_type == "process":
+                        # spawn: forking a process that runs an event loop and
+                        # driver threads is not safe
+                        self._executor = ProcessPoolExecutor(
+                            max_workers=self.max_workers,
+                            mp_context=multiprocessing.get_context("spawn"),
+                        )
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers,
+                            thread_name_prefix="password-hasher",
+                        )
+        return self._executor
+
+    async def _run(self, operation: str, func: Callable, *args):
+        if not self._slots.acquire(blocking=False):
+            log.warning("Password hashing pool saturated, rejecting request")
+            raise PasswordHasherBusyError()
+        start = time.perf_counter()
+        try:
+            future = self._get_executor().submit(_timed, func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+
+        def done(future) -> None:
+            # The slot is freed when the job finishes, even if the caller is cancelled
+            self._slots.release()
+            if not future.cancelled() and future.exception() is None:
+                elapsed = future.result()[1]
+                password_hash_duration.labels(operation).observe(elapsed)
+                password_hash_queue_wait.labels(operation).observe(
+                    max(0.0, time.perf_counter() - start - elapsed)
+                )
+
+        future.add_done_callback(done)
+        result, _ = await asyncio.wrap_future(future)
+        return result
+
+    async def hash(self, password: str) -> str:
+        """Generate password hash on the worker pool."""
+        return await self._run("hash", get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a plain password against its hash on the worker pool."""
+        return await self._run("verify", verify_password, plain_password, hashed_password)
+
+    def _reset_after_fork(self) -> None:
+        # The pool's threads (or processes) stayed with the parent
+        self._executor = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.queue_size)
+
+    def shutdown(self) -> None:
+        """Stop the worker pool, waiting for running jobs."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+
+password_hasher = PasswordHasher(
+    executor_type=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
+# Workers forked by app.server start their own pool
+os.register_at_fork(after_in_child=password_hasher._reset_after_fork)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a plain password against its hash without blocking the event loop."""
+    return await password_hasher.verify(plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """Generate password hash without blocking the event loop."""
+    return await password_hasher.hash(password)
+
+# Verified token payloads keyed by the token's SHA-256 digest. Only tokens
+# that passed signature verification are stored, so invalid tokens cannot
+# fill the cache.
+token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_MAX_SIZE,
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+CallbackGauge(
+    "token_cache", "Verified token cache counters (size, maxsize, hits, misses)",
+    lambda: (((name,), value) for name, value in token_cache.stats().items() if name != "hit_rate"),
+    ("stat",),
+)
+
+def decode_access_token(token: str) -> dict:
+    """
+    Verify and decode a JWT access token.
+    Repeat tokens are served from the cache until their own `exp`.
+    Raises JWTError for invalid or expired tokens. Do not mutate the result.
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
+
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(key, payload, ttl=exp - time.time())
+    return payload
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
     to_encode = data.copy()
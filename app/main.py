@@ -1,12 +1,59 @@
 import logging
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from anyio import to_thread
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from app.core.config import settings
+from app.core.database import ReplicaFailoverMiddleware, dispose_engines, init_engines
+from app.core.metrics import MetricsMiddleware
+from app.core.query_counter import QueryCounterMiddleware
+from app.core.openapi import prebuilt_openapi
+from app.core.rate_limit import RateLimitMiddleware, default_route_limits
+from app.core.security import PasswordHasherBusyError, password_hasher
+from app.services.audit import audit_writer
 from app.api.v1.api import api_router
 
 log = logging.getLogger(__name__)
 
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusyError) -> JSONResponse:
+    """Reject requests quickly when the password hashing pool is saturated."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+async def database_busy_handler(request: Request, exc: PoolTimeoutError) -> JSONResponse:
+    """Answer 503 when no database connection freed up within DB_POOL_TIMEOUT."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log.info("Starting up FastAPI application")
+    # Print out all settings for debugging (except sensitive ones)
+    log.info(f"Project Name: {settings.PROJECT_NAME}")
+    log.info(f"API Prefix: {settings.API_V1_PREFIX}")
+    log.info(f"Auth Token URL: {settings.AUTH_TOKEN_URL}")
+    # Sync routes and dependencies run on AnyIO worker threads (40 by default);
+    # threads beyond the connection pool size would only queue up in the pool
+    to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+    log.info(f"Worker threads: {settings.THREADPOOL_SIZE}")
+    # Importing the app leaves the engines to the worker that serves it
+    init_engines()
+    yield
+    log.info("Shutting down FastAPI application")
+    password_hasher.shutdown()
+    # Write the audit events still queued, off the event loop
+    await to_thread.run_sync(audit_writer.close, settings.AUDIT_SHUTDOWN_TIMEOUT_SECONDS)
+    await dispose_engines()
+
 def create_application() -> FastAPI:
     """Create FastAPI application."""
     log.info(f"Creating FastAPI application with name: {settings.PROJECT_NAME}")
@@ -20,8 +67,22 @@ def create_application() -> FastAPI:
         openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
         docs_url=f"{settings.API_V1_PREFIX}/docs",
         redoc_url=f"{settings.API_V1_PREFIX}/redoc",
+        default_response_class=ORJSONResponse if settings.FAST_JSON_RESPONSES else JSONResponse,
+        lifespan=lifespan,
     )
 
+    # Innermost, so that a read retried on the primary is counted once
+    app.add_middleware(ReplicaFailoverMiddleware)
+
+    # Added before CORS so that 429 responses still carry the CORS headers
+    route_limits = default_route_limits()
+    if settings.RATE_LIMIT_PER_MINUTE > 0 or any(route_limits.values()):
+        app.add_middleware(
+            RateLimitMiddleware,
+            limit=settings.RATE_LIMIT_PER_MINUTE,
+            route_limits=route_limits,
+        )
+
     # Set all CORS enabled origins
     app.add_middleware(
         CORSMiddleware,
@@ -31,21 +92,22 @@ def create_application() -> FastAPI:
         allow_headers=["*"],
     )
 
+    app.add_middleware(QueryCounterMiddleware)
+
+    # Outermost, so that requests rejected by the middlewares are counted too
+    if settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+
+    app.add_exception_handler(PasswordHasherBusyError, password_hasher_busy_handler)
+    app.add_exception_handler(PoolTimeoutError, database_busy_handler)
+
     # Include API router
     app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
+    if settings.OPENAPI_SCHEMA_FILE:
+        app.openapi = prebuilt_openapi(app, settings.OPENAPI_SCHEMA_FILE)
+
     return app
 
 app = create_application()
 
-@app.on_event("startup")
-async def startup_event():
-    log.info("Starting up FastAPI application")
-    # Print out all settings for debugging (except sensitive ones)
-    log.info(f"Project Name: {settings.PROJECT_NAME}")
-    log.info(f"API Prefix: {settings.API_V1_PREFIX}")
-    log.info(f"Auth Token URL: {settings.AUTH_TOKEN_URL}")
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    log.info("Shutting down FastAPI application")
\ No newline at end of file
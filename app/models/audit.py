@@ -0,0 +1,21 @@
+from sqlalchemy import JSON, CheckConstraint, Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class UserAudit(Base):
+    """Before/after snapshots of user writes (table created by migration 001)."""
+    __tablename__ = "l_user_audit"
+    __table_args__ = (
+        CheckConstraint("cod_evento IN ('insert', 'update', 'delete')", name="valid_event_type"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    cod_evento = Column(String(10), nullable=False)  # insert, update or delete
+    old_data = Column(JSON)
+    new_data = Column(JSON)
+    data_aggiornamento = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    utente_aggiornamento = Column(String)  # Who made the change
+
+    def __repr__(self):
+        return f"<UserAudit {self.cod_evento} user={self.user_id}>"
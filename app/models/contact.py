@@ -1,10 +1,14 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import DDL, Column, Integer, String, DateTime, ForeignKey, Index, event
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 
 class Contact(Base):
     __tablename__ = "t_contact"
+    __table_args__ = (
+        # Keyset pagination: WHERE user_id = :uid AND id > :cursor ORDER BY id
+        Index("ix_t_contact_user_id_id", "user_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("t_user.id"), nullable=False)
@@ -20,3 +24,79 @@ class Contact(Base):
 
     def __repr__(self):
         return f"<Contact {self.first_name} {self.last_name}>"
+
+# Search indexes used by app/services/contact_search.py, created together
+# with the table (migration 005 creates them on existing databases).
+CONTACT_SEARCH_DDL = {
+    # Trigram GIN indexes serve the ILIKE '%term%' predicates directly
+    "postgresql": [
+        "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+        "CREATE INDEX IF NOT EXISTS ix_t_contact_first_name_trgm ON t_contact USING gin (first_name gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS ix_t_contact_last_name_trgm ON t_contact USING gin (last_name gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS ix_t_contact_email_trgm ON t_contact USING gin (email gin_trgm_ops)",
+        "CREATE INDEX IF NOT EXISTS ix_t_contact_phone_trgm ON t_contact USING gin (phone gin_trgm_ops)",
+    ],
+    # FTS5 shadow table with the trigram tokenizer (substring matching),
+    # kept in sync with t_contact by triggers
+    "sqlite": [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS t_contact_fts USING fts5(
+            first_name, last_name, email, phone,
+            content='t_contact', content_rowid='id', tokenize='trigram'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS t_contact_fts_ai AFTER INSERT ON t_contact BEGIN
+            INSERT INTO t_contact_fts (rowid, first_name, last_name, email, phone)
+            VALUES (new.id, new.first_name, new.last_name, new.email, new.phone);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS t_contact_fts_ad AFTER DELETE ON t_contact BEGIN
+            INSERT INTO t_contact_fts (t_contact_fts, rowid, first_name, last_name, email, phone)
+            VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.phone);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS t_contact_fts_au
+        AFTER UPDATE OF first_name, last_name, email, phone ON t_contact BEGIN
+            INSERT INTO t_contact_fts (t_contact_fts, rowid, first_name, last_name, email, phone)
+            VALUES ('delete', old.id, old.first_name, old.last_name, old.email, old.phone);
+            INSERT INTO t_contact_fts (rowid, first_name, last_name, email, phone)
+            VALUES (new.id, new.first_name, new.last_name, new.email, new.phone);
+        END
+        """,
+    ],
+}
+
+for _dialect, _statements in CONTACT_SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(
+            Contact.__table__,
+            "after_create",
+            DDL(_statement).execute_if(dialect=_dialect),
+        )
+
+# Reverse of CONTACT_SEARCH_DDL
+CONTACT_SEARCH_DROP_DDL = {
+    "postgresql": [
+        "DROP INDEX IF EXISTS ix_t_contact_first_name_trgm",
+        "DROP INDEX IF EXISTS ix_t_contact_last_name_trgm",
+        "DROP INDEX IF EXISTS ix_t_contact_email_trgm",
+        "DROP INDEX IF EXISTS ix_t_contact_phone_trgm",
+    ],
+    "sqlite": [
+        "DROP TRIGGER IF EXISTS t_contact_fts_au",
+        "DROP TRIGGER IF EXISTS t_contact_fts_ad",
+        "DROP TRIGGER IF EXISTS t_contact_fts_ai",
+        "DROP TABLE IF EXISTS t_contact_fts",
+    ],
+}
+
+for _dialect, _statements in CONTACT_SEARCH_DROP_DDL.items():
+    for _statement in _statements:
+        event.listen(
+            Contact.__table__,
+            "before_drop",
+            DDL(_statement).execute_if(dialect=_dialect),
+        )
@@ -1,6 +1,7 @@
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, EmailStr
+from typing import Optional, List
+from pydantic import BaseModel, EmailStr, Field, model_validator
+from app.core.serialization import PageSerializer
 
 class ContactBase(BaseModel):
     first_name: str
@@ -27,3 +28,39 @@ class ContactInDBBase(ContactBase):
 class Contact(ContactInDBBase):
     """Return model for contact data."""
     pass
+
+class PaginatedContactResponse(BaseModel):
+    total: Optional[int] = None  # Not set when called with include_total=false
+    page: Optional[int] = None  # Not set when paginating with a cursor
+    page_size: int
+    items: List[Contact]
+    next_cursor: Optional[str] = None  # Pass as `cursor` to fetch the next page
+
+# Used instead of the response_model when FAST_JSON_RESPONSES is enabled
+contact_page_serializer = PageSerializer(PaginatedContactResponse, Contact)
+
+class ContactImportError(BaseModel):
+    line: int
+    error: str
+
+class ContactImportResponse(BaseModel):
+    imported: int
+    failed: int
+    errors: List[ContactImportError]  # The first CONTACT_IMPORT_MAX_ERRORS rejected rows
+
+class ContactBulkSelection(BaseModel):
+    """Contacts targeted by a bulk operation: explicit ids or a search term."""
+    ids: Optional[List[int]] = Field(None, min_length=1, max_length=10000)
+    search: Optional[str] = Field(None, min_length=1)
+
+    @model_validator(mode="after")
+    def check_selection(self):
+        if (self.ids is None) == (self.search is None):
+            raise ValueError("Provide either ids or search")
+        return self
+
+class ContactBulkUpdate(ContactBulkSelection):
+    changes: ContactUpdate
+
+class ContactBulkResult(BaseModel):
+    affected: int
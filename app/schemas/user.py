@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel, EmailStr, Field
+from app.core.serialization import PageSerializer
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -50,7 +51,11 @@ class UserSearchParams(BaseModel):
     is_active: Optional[bool] = None
 
 class PaginatedResponse(BaseModel):
-    total: int
-    page: int
+    total: Optional[int] = None  # Not set when called with include_total=false
+    page: Optional[int] = None  # Not set when paginating with a cursor
     page_size: int
-    items: List[User]
\ No newline at end of file
+    items: List[User]
+    next_cursor: Optional[str] = None  # Pass as `cursor` to fetch the next page
+
+# Used instead of the response_model when FAST_JSON_RESPONSES is enabled
+user_page_serializer = PageSerializer(PaginatedResponse, User)
@@ -0,0 +1,203 @@
+"""
+Production server: a supervisor process forking WEB_WORKERS uvicorn
+workers that share one listening socket.
+
+    python -m app.server --host 0.0.0.0 --port 8000 --workers 4
+
+The app is imported once, before forking. Engines are created by each
+worker's lifespan (pools left over from the supervisor are replaced after
+fork, see app.core.database). With DB_MAX_CONNECTIONS set, the pools of
+every worker's engines (sync, async and one per replica) are sized so that
+together they stay within that budget; a budget too small to give each of
+them a connection is refused.
+
+SIGTERM or SIGINT drains the workers: they stop accepting connections,
+finish in-flight requests within GRACEFUL_SHUTDOWN_SECONDS and run the
+lifespan shutdown; the stragglers are killed a few seconds later. A
+worker that dies otherwise is replaced.
+"""
+import argparse
+import logging
+import os
+import signal
+import socket
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+import uvicorn
+from app.core import database
+from app.core.config import settings
+from app.core.rate_limit import default_route_limits
+from app.main import app
+
+log = logging.getLogger(__name__)
+
+# Extra time on top of GRACEFUL_SHUTDOWN_SECONDS before workers are killed
+KILL_GRACE_SECONDS = 5
+# A worker that dies sooner than this after starting is restarted with a delay
+MIN_WORKER_UPTIME_SECONDS = 1.0
+
+def engines_per_worker() -> int:
+    """Pools each worker opens: the sync and async engines, and one per replica."""
+    return 2 + len(settings.DB_REPLICA_URLS)
+
+def pool_share(total: int, workers: int, engines: int) -> Tuple[int, int]:
+    """
+    pool_size and max_overflow of each engine, so that `workers` workers
+    with `engines` engines each stay within `total` connections.
+    Raises ValueError when that leaves an engine without a connection.
+    """
+    per_engine = total // (workers * engines)
+    if per_engine < 1:
+        raise ValueError(
+            f"DB_MAX_CONNECTIONS={total} can't give {workers} workers x {engines} engines "
+            f"a connection each: raise it to at least {workers * engines} or run fewer workers"
+        )
+    pool_size = min(settings.DB_POOL_SIZE, per_engine)
+    return pool_size, per_engine - pool_size
+
+def local_state_warnings(workers: int) -> List[str]:
+    """
+    Per-process caches and limits that behave differently once there is
+    more than one worker: each worker keeps its own copy.
+    """
+    if workers <= 1:
+        return []
+    warnings = []
+    if settings.RESPONSE_CACHE_BACKEND == "local" and settings.RESPONSE_CACHE_TTL_SECONDS > 0:
+        warnings.append(
+            "RESPONSE_CACHE_BACKEND=local: a contact write is only seen by the other workers' "
+            f"listings after RESPONSE_CACHE_TTL_SECONDS ({settings.RESPONSE_CACHE_TTL_SECONDS}s); use redis"
+        )
+    if settings.USER_CACHE_MAX_SIZE > 0 and settings.USER_CACHE_TTL_SECONDS > 0:
+        warnings.append(
+            "User cache: a user update or deactivation is only seen by the other workers "
+            f"after USER_CACHE_TTL_SECONDS ({settings.USER_CACHE_TTL_SECONDS}s)"
+        )
+    if settings.TOKEN_CACHE_MAX_SIZE > 0:
+        warnings.append(
+            f"Token cache: each worker verifies and caches tokens on its own "
+            f"(up to {settings.TOKEN_CACHE_MAX_SIZE} entries per worker)"
+        )
+    if settings.RATE_LIMIT_BACKEND == "local" and (
+        settings.RATE_LIMIT_PER_MINUTE > 0 or any(default_route_limits().values())
+    ):
+        warnings.append(
+            f"RATE_LIMIT_BACKEND=local: each worker counts on its own, so clients get up to "
+            f"{workers} times the configured limits; use redis"
+        )
+    return warnings
+
+class Supervisor:
+    """Forks the workers, replaces the ones that die and drains them on SIGTERM."""
+
+    def __init__(self, sock: socket.socket, workers: int, uvicorn_options: Dict):
+        self.sock = sock
+        self.workers = workers
+        self.uvicorn_options = uvicorn_options
+        self.children: Dict[int, float] = {}  # pid -> start time
+        self.stopping = False
+
+    def spawn(self) -> None:
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                self.run_worker()
+                code = 0
+            except BaseException:
+                log.exception("Worker failed")
+            finally:
+                os._exit(code)
+        self.children[pid] = time.monotonic()
+        log.info(f"Started worker {pid}")
+
+    def run_worker(self) -> None:
+        # uvicorn installs its own handlers for these in Server.run
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGALRM):
+            signal.signal(signum, signal.SIG_DFL)
+        if settings.DB_MAX_CONNECTIONS:
+            settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW = pool_share(
+                settings.DB_MAX_CONNECTIONS, self.workers, engines_per_worker()
+            )
+        config = uvicorn.Config(
+            app,
+            lifespan="on",
+            timeout_graceful_shutdown=int(settings.GRACEFUL_SHUTDOWN_SECONDS),
+            **self.uvicorn_options
+        )
+        uvicorn.Server(config).run(sockets=[self.sock])
+
+    def stop(self, signum, frame) -> None:
+        if self.stopping:
+            return
+        self.stopping = True
+        log.info(f"Received {signal.Signals(signum).name}, draining {len(self.children)} workers")
+        self._signal_children(signal.SIGTERM)
+        signal.alarm(int(settings.GRACEFUL_SHUTDOWN_SECONDS) + KILL_GRACE_SECONDS)
+
+    def kill(self, signum, frame) -> None:
+        log.warning(f"Killing {len(self.children)} workers still running")
+        self._signal_children(signal.SIGKILL)
+
+    def _signal_children(self, signum: int) -> None:
+        for pid in list(self.children):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGALRM, self.kill)
+        for _ in range(self.workers):
+            self.spawn()
+        while self.children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            started = self.children.pop(pid, None)
+            if started is None or self.stopping:
+                continue
+            log.warning(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}, replacing it")
+            if time.monotonic() - started < MIN_WORKER_UPTIME_SECONDS:
+                time.sleep(MIN_WORKER_UPTIME_SECONDS)
+            self.spawn()
+        log.info("All workers stopped")
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Run the production server."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=settings.WEB_WORKERS or os.cpu_count() or 1)
+    parser.add_argument("--log-level", default=settings.LOG_LEVEL.lower())
+    parser.add_argument("--proxy-headers", action="store_true", help="Trust X-Forwarded-* from --forwarded-allow-ips")
+    parser.add_argument("--forwarded-allow-ips", default="127.0.0.1")
+    args = parser.parse_args(argv)
+    if settings.DB_MAX_CONNECTIONS:
+        try:
+            pool_size, max_overflow = pool_share(settings.DB_MAX_CONNECTIONS, args.workers, engines_per_worker())
+        except ValueError as e:
+            parser.error(str(e))
+        log.info(f"Connection pool per worker and engine: {pool_size} + {max_overflow} overflow")
+
+    options = {
+        "log_level": args.log_level,
+        "proxy_headers": args.proxy_headers,
+        "forwarded_allow_ips": args.forwarded_allow_ips,
+    }
+    sock = uvicorn.Config(app, host=args.host, port=args.port, **options).bind_socket()
+    if database.engines_ready():
+        log.warning("Database engines were created before forking; workers will start with empty pools")
+    for warning in local_state_warnings(args.workers):
+        log.warning(f"Per-worker state with {args.workers} workers: {warning}")
+    log.info(f"Serving on {args.host}:{args.port} with {args.workers} workers (supervisor {os.getpid()})")
+    try:
+        Supervisor(sock, args.workers, options).run()
+    finally:
+        sock.close()
+
+if __name__ == "__main__":
+    main()
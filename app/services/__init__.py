@@ -4,16 +4,54 @@ from app.services.user import (  # noqa
     create_user,
     update_user,
     authenticate_user,
-    get_users  # Added this new function
+    get_users,  # Added this new function
+    get_user_by_id_async,
+    get_cached_user_async,
+    invalidate_cached_user,
+    get_user_by_email_async,
+    create_user_async,
+    update_user_async,
+    authenticate_user_async,
+    get_users_async
+)
+
+from app.services.audit import (  # noqa
+    audit_user_event,
+    audit_user_event_async
 )
 
 from app.services.contact import (  # noqa
     get_contact,
     get_user_contacts,
+    get_user_contacts_page,
     create_contact,
     update_contact,
     delete_contact,
-    get_total_contacts
+    update_contacts,
+    delete_contacts,
+    get_total_contacts,
+    get_user_contacts_version,
+    get_contact_async,
+    get_user_contacts_async,
+    get_user_contacts_page_async,
+    create_contact_async,
+    update_contact_async,
+    delete_contact_async,
+    update_contacts_async,
+    delete_contacts_async,
+    get_total_contacts_async,
+    get_user_contacts_version_async,
+    invalidate_user_contacts
+)
+
+from app.services.contact_import import (  # noqa
+    import_contacts,
+    import_contacts_async
+)
+
+from app.services.contact_export import (  # noqa
+    export_contacts,
+    export_contacts_async
 )
 
 __all__ = [
@@ -24,12 +62,43 @@ __all__ = [
     "update_user",
     "authenticate_user",
     "get_users",
-    
+    "get_user_by_id_async",
+    "get_cached_user_async",
+    "invalidate_cached_user",
+    "get_user_by_email_async",
+    "create_user_async",
+    "update_user_async",
+    "authenticate_user_async",
+    "get_users_async",
+
+    # Audit log
+    "audit_user_event",
+    "audit_user_event_async",
+
     # Contact service functions
     "get_contact",
     "get_user_contacts",
+    "get_user_contacts_page",
     "create_contact",
     "update_contact",
     "delete_contact",
-    "get_total_contacts"
-]
\ No newline at end of file
+    "update_contacts",
+    "delete_contacts",
+    "get_total_contacts",
+    "get_user_contacts_version",
+    "get_contact_async",
+    "get_user_contacts_async",
+    "get_user_contacts_page_async",
+    "create_contact_async",
+    "update_contact_async",
+    "delete_contact_async",
+    "update_contacts_async",
+    "delete_contacts_async",
+    "get_total_contacts_async",
+    "get_user_contacts_version_async",
+    "invalidate_user_contacts",
+    "import_contacts",
+    "import_contacts_async",
+    "export_contacts",
+    "export_contacts_async"
+]
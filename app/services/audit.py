@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional
+from sqlalchemy import insert
+from app.core.config import settings
+from app.core import database
+from app.core.metrics import CallbackGauge
+from app.models.audit import UserAudit
+from app.models.user import User
+
+log = logging.getLogger(__name__)
+
+# Never copied into the audit log
+EXCLUDED_FIELDS = {"hashed_password"}
+
+class AuditEvent(NamedTuple):
+    user_id: int
+    cod_evento: str  # insert, update or delete
+    old_data: Optional[Dict[str, Any]]
+    new_data: Optional[Dict[str, Any]]
+    utente_aggiornamento: Optional[str]
+
+def user_snapshot(user: User) -> Dict[str, Any]:
+    """JSON-ready copy of a user's columns, without the password hash."""
+    snapshot = {}
+    for column in User.__table__.columns:
+        if column.key in EXCLUDED_FIELDS:
+            continue
+        value = getattr(user, column.key)
+        snapshot[column.key] = value.isoformat() if isinstance(value, datetime) else value
+    return snapshot
+
+_STOP = object()
+
+class AuditWriter:
+    """
+    Writes audit events off the request path.
+
+    `emit` only appends to a bounded in-process queue. A daemon thread
+    (started on first use) drains it and writes whatever has accumulated,
+    up to `batch_size` rows, as one multi-row INSERT, so batches grow with
+    the load. When the queue is full producers wait up to `queue_timeout`
+    seconds for room (backpressure) and the event is dropped and counted
+    after that. `close()` writes everything still queued. Batches go
+    through `session_factory`, by default the app's SessionLocal.
+    """
+
+    def __init__(self, batch_size: int, queue_size: int, queue_timeout: float, session_factory=None):
+        self.batch_size = batch_size
+        self.queue_timeout = queue_timeout
+        self.session_factory = session_factory
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self.write_seconds = 0.0
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+
+    def emit(self, event: AuditEvent) -> bool:
+        """Queue an event; blocks for at most `queue_timeout` when the queue is full."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            try:
+                self._queue.put(event, timeout=self.queue_timeout)
+            except queue.Full:
+                return self._drop(event)
+        self.enqueued += 1
+        return True
+
+    async def emit_async(self, event: AuditEvent) -> bool:
+        """Queue an event from the event loop; waits for room off the loop."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            try:
+                await asyncio.to_thread(self._queue.put, event, timeout=self.queue_timeout)
+            except queue.Full:
+                return self._drop(event)
+        self.enqueued += 1
+        return True
+
+    def _drop(self, event: AuditEvent) -> bool:
+        self.dropped += 1
+        log.error(f"Audit queue full, dropped {event.cod_evento} event for user {event.user_id}")
+        return False
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch: List[AuditEvent] = []
+            stop = item is _STOP
+            if not stop:
+                batch.append(item)
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.append(item)
+            if batch:
+                self._write(batch)
+            for _ in range(len(batch) + (1 if stop else 0)):
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: List[AuditEvent]) -> None:
+        start = time.perf_counter()
+        try:
+            with (self.session_factory or database.SessionLocal)() as db:
+                db.execute(insert(UserAudit).values([event._asdict() for event in batch]))
+                db.commit()
+            self.written += len(batch)
+            self.batches += 1
+        except Exception as e:
+            self.failed += len(batch)
+            log.error(f"Error writing {len(batch)} audit events: {str(e)}")
+        finally:
+            self.write_seconds += time.perf_counter() - start
+
+    def flush(self) -> None:
+        """Block until every queued event has been written (or has failed)."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Write the remaining events and stop the writer thread."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            log.warning(f"Audit queue still full after {timeout}s, events not written: {self.stats()}")
+            return
+        thread.join(timeout)
+        if thread.is_alive():
+            log.warning(f"Audit writer did not finish within {timeout}s: {self.stats()}")
+            return
+        log.info(f"Audit writer stopped: {self.stats()}")
+
+    def stats(self) -> Dict[str, float]:
+        """Return throughput counters."""
+        return {
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "batches": self.batches,
+            "queue_depth": self._queue.qsize(),
+            "avg_batch_size": self.written / self.batches if self.batches else 0.0,
+            "rows_per_second": self.written / self.write_seconds if self.write_seconds else 0.0,
+        }
+
+audit_writer = AuditWriter(
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    queue_size=settings.AUDIT_QUEUE_SIZE,
+    queue_timeout=settings.AUDIT_QUEUE_TIMEOUT_SECONDS,
+)
+
+CallbackGauge(
+    "audit_writer", "Audit writer counters (events enqueued, written, dropped, failed; batches; queue depth)",
+    lambda: (((name,), value) for name, value in audit_writer.stats().items()
+             if name not in ("avg_batch_size", "rows_per_second")),
+    ("stat",),
+)
+
+def audit_user_event(
+    cod_evento: str,
+    user_id: int,
+    old_data: Optional[Dict[str, Any]] = None,
+    new_data: Optional[Dict[str, Any]] = None,
+    actor: Optional[str] = None
+) -> None:
+    """Record a user write in l_user_audit (asynchronously)."""
+    if settings.AUDIT_ENABLED:
+        audit_writer.emit(AuditEvent(user_id, cod_evento, old_data, new_data, actor))
+
+async def audit_user_event_async(
+    cod_evento: str,
+    user_id: int,
+    old_data: Optional[Dict[str, Any]] = None,
+    new_data: Optional[Dict[str, Any]] = None,
+    actor: Optional[str] = None
+) -> None:
+    """Record a user write in l_user_audit without blocking the event loop."""
+    if settings.AUDIT_ENABLED:
+        await audit_writer.emit_async(AuditEvent(user_id, cod_evento, old_data, new_data, actor))
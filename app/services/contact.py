@@ -1,18 +1,116 @@
 import logging
-from typing import Optional, List
+from datetime import datetime
+from typing import Optional, List, Sequence, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import ColumnElement, Delete, Row, Select, Update, delete, func, select, update
+from app.core.cache import ResponseCache, create_cache_backend
+from app.core.config import settings
+from app.core.metrics import CallbackGauge
+from app.core.pagination import Page, build_page, decode_ranked_cursor, page_query
 from app.models.contact import Contact
 from app.schemas.contact import ContactCreate, ContactUpdate
+from app.services.contact_search import search_condition, search_contacts
 
 log = logging.getLogger(__name__)
 
-def get_contact(db: Session, user_id: int, contact_id: int) -> Optional[Contact]:
-    """Get contact by ID, ensuring it belongs to the user."""
-    return db.query(Contact).filter(
+# Rendered GET /contacts/ pages, scoped by user id. Every write made through
+# this module bumps the user's generation; with the local backend, writes
+# made by another worker become visible after RESPONSE_CACHE_TTL_SECONDS.
+contact_list_cache = ResponseCache(
+    namespace="contacts",
+    backend=create_cache_backend(),
+    ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
+
+CallbackGauge(
+    "contact_list_cache", "Contact listing cache counters (hits, misses, backend errors)",
+    lambda: (((name,), value) for name, value in contact_list_cache.stats().items() if name != "hit_rate"),
+    ("stat",),
+)
+
+def invalidate_user_contacts(user_id: int) -> None:
+    """Drop the cached contact listings of a user. Call after every contact write."""
+    contact_list_cache.invalidate(user_id)
+
+def _contacts_query(
+    user_id: int,
+    search: Optional[str] = None
+) -> Tuple[Select, Optional[ColumnElement]]:
+    """
+    Build the filtered contact query shared by the sync and async services.
+    Returns the query and, when searching, its relevance expression.
+    """
+    query = select(Contact).where(Contact.user_id == user_id)
+
+    if search:
+        return search_contacts(query, search)
+
+    return query, None
+
+def _page_total(rows: Sequence[Row], include_total: bool, skip: int, after: Optional[dict]) -> Tuple[Optional[int], bool]:
+    """
+    Read the window count off a page. Returns (total, needs_count): past the
+    last page no row carries the total and it must be counted separately.
+    """
+    if not include_total:
+        return None, False
+    if rows:
+        return rows[0].total, False
+    if skip or after is not None:
+        return None, True
+    return 0, False
+
+def _contact_query(user_id: int, contact_id: int) -> Select:
+    return select(Contact).where(
         Contact.id == contact_id,
         Contact.user_id == user_id
-    ).first()
+    )
+
+def _bulk_condition(user_id: int, ids: Optional[List[int]], search: Optional[str]) -> ColumnElement:
+    """WHERE clause of a bulk statement: the user's contacts among `ids` or matching `search`."""
+    condition = Contact.user_id == user_id
+    if ids is not None:
+        return condition & Contact.id.in_(ids)
+    if search:
+        return condition & search_condition(search)
+    return condition
+
+def _bulk_update_query(
+    user_id: int,
+    contact_in: ContactUpdate,
+    ids: Optional[List[int]],
+    search: Optional[str]
+) -> Update:
+    return (
+        update(Contact)
+        .where(_bulk_condition(user_id, ids, search))
+        .values(**contact_in.model_dump(exclude_unset=True))
+        # Nothing is loaded: don't try to reconcile objects in the session
+        .execution_options(synchronize_session=False)
+    )
+
+def _bulk_delete_query(user_id: int, ids: Optional[List[int]], search: Optional[str]) -> Delete:
+    return (
+        delete(Contact)
+        .where(_bulk_condition(user_id, ids, search))
+        .execution_options(synchronize_session=False)
+    )
+
+def _version_query(user_id: int, search: Optional[str]) -> Select:
+    # Inserts raise max(id), updates raise max(updated_at), deletes lower the count
+    query, _ = _contacts_query(user_id, search)
+    return query.with_only_columns(
+        func.count(), func.max(Contact.updated_at), func.max(Contact.id)
+    ).order_by(None)
+
+def _count_query(query: Select) -> Select:
+    """Wrap a query into a SELECT count(*)."""
+    return select(func.count()).select_from(query.order_by(None).subquery())
+
+def get_contact(db: Session, user_id: int, contact_id: int) -> Optional[Contact]:
+    """Get contact by ID, ensuring it belongs to the user."""
+    return db.scalars(_contact_query(user_id, contact_id)).first()
 
 def get_user_contacts(
     db: Session,
@@ -21,21 +119,39 @@ def get_user_contacts(
     limit: int = 100,
     search: Optional[str] = None
 ) -> List[Contact]:
-    """Get all contacts for a user with optional search."""
-    query = db.query(Contact).filter(Contact.user_id == user_id)
-    
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Contact.first_name.ilike(search_term),
-                Contact.last_name.ilike(search_term),
-                Contact.email.ilike(search_term),
-                Contact.phone.ilike(search_term)
-            )
-        )
-    
-    return query.offset(skip).limit(limit).all()
+    """
+    Get all contacts for a user with optional search.
+    Ordered by id, or best matches first when searching.
+    """
+    query, rank = _contacts_query(user_id, search)
+    return list(db.scalars(page_query(query, Contact, skip, limit, rank=rank)).all())
+
+def get_user_contacts_page(
+    db: Session,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = True
+) -> Page:
+    """
+    Get a page of contacts, the total matching count and the cursor of the
+    next page in one statement. `cursor` (a previous next_cursor) switches
+    to keyset pagination and overrides `skip`. With include_total=False
+    nothing is counted and the total is None.
+    Raises InvalidCursorError for malformed or mismatched cursors.
+    """
+    query, rank = _contacts_query(user_id, search)
+    after = decode_ranked_cursor(cursor, rank is not None) if cursor is not None else None
+
+    # Fetch one extra row to know whether there is a next page
+    statement = page_query(query, Contact, skip, limit + 1, after, rank, include_total)
+    rows = db.execute(statement).all()
+    total, needs_count = _page_total(rows, include_total, skip, after)
+    if needs_count:
+        total = db.scalar(_count_query(query))
+    return build_page(rows, limit, total, ranked=rank is not None)
 
 def create_contact(
     db: Session,
@@ -50,6 +166,7 @@ def create_contact(
     db.add(db_contact)
     try:
         db.commit()
+        invalidate_user_contacts(user_id)
         db.refresh(db_contact)
         log.info(f"Created contact {db_contact.id} for user {user_id}")
         return db_contact
@@ -65,12 +182,13 @@ def update_contact(
 ) -> Contact:
     """Update contact details."""
     update_data = contact_in.model_dump(exclude_unset=True)
-    
+
     for field, value in update_data.items():
         setattr(contact, field, value)
 
     try:
         db.commit()
+        invalidate_user_contacts(contact.user_id)
         db.refresh(contact)
         log.info(f"Updated contact {contact.id}")
         return contact
@@ -81,9 +199,11 @@ def update_contact(
 
 def delete_contact(db: Session, contact: Contact) -> bool:
     """Delete contact."""
+    user_id = contact.user_id
     try:
         db.delete(contact)
         db.commit()
+        invalidate_user_contacts(user_id)
         log.info(f"Deleted contact {contact.id}")
         return True
     except Exception as e:
@@ -91,19 +211,231 @@ def delete_contact(db: Session, contact: Contact) -> bool:
         db.rollback()
         raise
 
+def update_contacts(
+    db: Session,
+    user_id: int,
+    contact_in: ContactUpdate,
+    ids: Optional[List[int]] = None,
+    search: Optional[str] = None
+) -> int:
+    """
+    Apply the same changes to the user's contacts among `ids` (or matching
+    `search`) with a single UPDATE. Returns the number of updated contacts.
+    """
+    try:
+        result = db.execute(_bulk_update_query(user_id, contact_in, ids, search))
+        db.commit()
+        invalidate_user_contacts(user_id)
+        log.info(f"Updated {result.rowcount} contacts for user {user_id}")
+        return result.rowcount
+    except Exception as e:
+        log.error(f"Error updating contacts: {str(e)}")
+        db.rollback()
+        raise
+
+def delete_contacts(
+    db: Session,
+    user_id: int,
+    ids: Optional[List[int]] = None,
+    search: Optional[str] = None
+) -> int:
+    """
+    Delete the user's contacts among `ids` (or matching `search`) with a
+    single DELETE. Returns the number of deleted contacts.
+    """
+    try:
+        result = db.execute(_bulk_delete_query(user_id, ids, search))
+        db.commit()
+        invalidate_user_contacts(user_id)
+        log.info(f"Deleted {result.rowcount} contacts for user {user_id}")
+        return result.rowcount
+    except Exception as e:
+        log.error(f"Error deleting contacts: {str(e)}")
+        db.rollback()
+        raise
+
 def get_total_contacts(db: Session, user_id: int, search: Optional[str] = None) -> int:
     """Get total number of contacts for a user with optional search."""
-    query = db.query(Contact).filter(Contact.user_id == user_id)
-    
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Contact.first_name.ilike(search_term),
-                Contact.last_name.ilike(search_term),
-                Contact.email.ilike(search_term),
-                Contact.phone.ilike(search_term)
-            )
-        )
-    
-    return query.count()
+    query, _ = _contacts_query(user_id, search)
+    return db.scalar(_count_query(query))
+
+def get_user_contacts_version(
+    db: Session,
+    user_id: int,
+    search: Optional[str] = None
+) -> Tuple[int, Optional[datetime], Optional[int]]:
+    """
+    Cheap probe of a contact listing's state: (count, max(updated_at),
+    max(id)). Any insert, update or delete changes it; used as the list ETag.
+    """
+    return tuple(db.execute(_version_query(user_id, search)).one())
+
+# Async variants, used by the `async def` routes
+
+async def get_contact_async(db: AsyncSession, user_id: int, contact_id: int) -> Optional[Contact]:
+    """Get contact by ID, ensuring it belongs to the user."""
+    result = await db.scalars(_contact_query(user_id, contact_id))
+    return result.first()
+
+async def get_user_contacts_async(
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    search: Optional[str] = None
+) -> List[Contact]:
+    """
+    Get all contacts for a user with optional search.
+    Ordered by id, or best matches first when searching.
+    """
+    query, rank = _contacts_query(user_id, search)
+    result = await db.scalars(page_query(query, Contact, skip, limit, rank=rank))
+    return list(result.all())
+
+async def get_user_contacts_page_async(
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    search: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = True
+) -> Page:
+    """
+    Get a page of contacts, the total matching count and the cursor of the
+    next page in one statement. `cursor` (a previous next_cursor) switches
+    to keyset pagination and overrides `skip`. With include_total=False
+    nothing is counted and the total is None.
+    Raises InvalidCursorError for malformed or mismatched cursors.
+    """
+    query, rank = _contacts_query(user_id, search)
+    after = decode_ranked_cursor(cursor, rank is not None) if cursor is not None else None
+
+    # Fetch one extra row to know whether there is a next page
+    statement = page_query(query, Contact, skip, limit + 1, after, rank, include_total)
+    rows = (await db.execute(statement)).all()
+    total, needs_count = _page_total(rows, include_total, skip, after)
+    if needs_count:
+        total = await db.scalar(_count_query(query))
+    return build_page(rows, limit, total, ranked=rank is not None)
+
+async def create_contact_async(
+    db: AsyncSession,
+    user_id: int,
+    contact_in: ContactCreate
+) -> Contact:
+    """Create new contact."""
+    db_contact = Contact(
+        user_id=user_id,
+        **contact_in.model_dump()
+    )
+    db.add(db_contact)
+    try:
+        await db.commit()
+        invalidate_user_contacts(user_id)
+        await db.refresh(db_contact)
+        log.info(f"Created contact {db_contact.id} for user {user_id}")
+        return db_contact
+    except Exception as e:
+        log.error(f"Error creating contact: {str(e)}")
+        await db.rollback()
+        raise
+
+async def update_contact_async(
+    db: AsyncSession,
+    contact: Contact,
+    contact_in: ContactUpdate
+) -> Contact:
+    """Update contact details."""
+    update_data = contact_in.model_dump(exclude_unset=True)
+
+    for field, value in update_data.items():
+        setattr(contact, field, value)
+
+    try:
+        await db.commit()
+        invalidate_user_contacts(contact.user_id)
+        await db.refresh(contact)
+        log.info(f"Updated contact {contact.id}")
+        return contact
+    except Exception as e:
+        log.error(f"Error updating contact: {str(e)}")
+        await db.rollback()
+        raise
+
+async def delete_contact_async(db: AsyncSession, contact: Contact) -> bool:
+    """Delete contact."""
+    user_id = contact.user_id
+    try:
+        await db.delete(contact)
+        await db.commit()
+        invalidate_user_contacts(user_id)
+        log.info(f"Deleted contact {contact.id}")
+        return True
+    except Exception as e:
+        log.error(f"Error deleting contact: {str(e)}")
+        await db.rollback()
+        raise
+
+async def update_contacts_async(
+    db: AsyncSession,
+    user_id: int,
+    contact_in: ContactUpdate,
+    ids: Optional[List[int]] = None,
+    search: Optional[str] = None
+) -> int:
+    """
+    Apply the same changes to the user's contacts among `ids` (or matching
+    `search`) with a single UPDATE. Returns the number of updated contacts.
+    """
+    try:
+        result = await db.execute(_bulk_update_query(user_id, contact_in, ids, search))
+        await db.commit()
+        invalidate_user_contacts(user_id)
+        log.info(f"Updated {result.rowcount} contacts for user {user_id}")
+        return result.rowcount
+    except Exception as e:
+        log.error(f"Error updating contacts: {str(e)}")
+        await db.rollback()
+        raise
+
+async def delete_contacts_async(
+    db: AsyncSession,
+    user_id: int,
+    ids: Optional[List[int]] = None,
+    search: Optional[str] = None
+) -> int:
+    """
+    Delete the user's contacts among `ids` (or matching `search`) with a
+    single DELETE. Returns the number of deleted contacts.
+    """
+    try:
+        result = await db.execute(_bulk_delete_query(user_id, ids, search))
+        await db.commit()
+        invalidate_user_contacts(user_id)
+        log.info(f"Deleted {result.rowcount} contacts for user {user_id}")
+        return result.rowcount
+    except Exception as e:
+        log.error(f"Error deleting contacts: {str(e)}")
+        await db.rollback()
+        raise
+
+async def get_user_contacts_version_async(
+    db: AsyncSession,
+    user_id: int,
+    search: Optional[str] = None
+) -> Tuple[int, Optional[datetime], Optional[int]]:
+    """
+    Cheap probe of a contact listing's state: (count, max(updated_at),
+    max(id)). Any insert, update or delete changes it; used as the list ETag.
+    """
+    return tuple((await db.execute(_version_query(user_id, search))).one())
+
+async def get_total_contacts_async(
+    db: AsyncSession,
+    user_id: int,
+    search: Optional[str] = None
+) -> int:
+    """Get total number of contacts for a user with optional search."""
+    query, _ = _contacts_query(user_id, search)
+    return await db.scalar(_count_query(query))
@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+import logging
+from typing import Any, AsyncIterator, Iterable, Iterator, Optional, Sequence
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.contact import Contact
+from app.services.contact import _contacts_query
+
+log = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("csv", "ndjson")
+EXPORT_FIELDS = ("id", "first_name", "last_name", "email", "phone", "created_at", "updated_at")
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+def _export_query(user_id: int, search: Optional[str]) -> Select:
+    # Plain column tuples: no identity map or ORM state per row
+    query, _ = _contacts_query(user_id, search)
+    columns = [getattr(Contact, field) for field in EXPORT_FIELDS]
+    return (
+        query.with_only_columns(*columns)
+        .order_by(Contact.id)
+        .execution_options(yield_per=settings.CONTACT_EXPORT_BATCH_SIZE)
+    )
+
+def _value(value: Any) -> Any:
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+def _header(fmt: str) -> str:
+    if fmt == "csv":
+        return ",".join(EXPORT_FIELDS) + "\r\n"
+    return ""
+
+def _format_rows(rows: Iterable[Sequence[Any]], fmt: str) -> str:
+    """Render a batch of rows as one chunk of the response body."""
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows([_value(value) for value in row] for row in rows)
+        return buffer.getvalue()
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, map(_value, row)))) + "\n" for row in rows
+    )
+
+def export_contacts(
+    db: Session,
+    user_id: int,
+    fmt: str,
+    search: Optional[str] = None
+) -> Iterator[str]:
+    """
+    Stream a user's contacts (optionally filtered by `search`) as CSV or
+    NDJSON, ordered by id. Rows are read through a server-side cursor
+    CONTACT_EXPORT_BATCH_SIZE at a time and each batch is yielded as one
+    chunk, so memory does not depend on the number of contacts.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    yield _header(fmt)
+    result = db.execute(_export_query(user_id, search))
+    for rows in result.partitions():
+        yield _format_rows(rows, fmt)
+
+async def export_contacts_async(
+    db: AsyncSession,
+    user_id: int,
+    fmt: str,
+    search: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    Stream a user's contacts (optionally filtered by `search`) as CSV or
+    NDJSON, ordered by id. Rows are read through a server-side cursor
+    CONTACT_EXPORT_BATCH_SIZE at a time and each batch is yielded as one
+    chunk, so memory does not depend on the number of contacts.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    yield _header(fmt)
+    result = await db.stream(_export_query(user_id, search))
+    async for rows in result.partitions():
+        yield _format_rows(rows, fmt)
@@ -0,0 +1,269 @@
+import codecs
+import csv
+import json
+import logging
+from typing import (
+    Any, AsyncIterable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+)
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.models.contact import Contact
+from app.schemas.contact import ContactCreate
+from app.services.contact import invalidate_user_contacts
+
+log = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "ndjson")
+IMPORT_COLUMNS = ("user_id", "first_name", "last_name", "email", "phone")
+
+# Longest record (in characters) buffered while looking for its end; keeps
+# memory bounded on input without newlines or with an unterminated quote
+MAX_RECORD_LENGTH = 64 * 1024
+
+class ContactImportFormatError(ValueError):
+    """Raised when the uploaded body can't be read as CSV / NDJSON at all."""
+
+class ImportReport(NamedTuple):
+    imported: int
+    failed: int
+    errors: List[Dict[str, Any]]  # {"line": ..., "error": ...}, capped at max_errors
+
+# (line number, parsed fields) or (line number, error message)
+Record = Tuple[int, Union[Dict[str, Any], str]]
+
+class ContactRecordParser:
+    """
+    Push parser turning chunks of an uploaded body into records. Only the
+    current (incomplete) record is buffered, so memory does not grow with
+    the size of the upload. Line numbers are 1-based; in CSV the header is
+    line 1 and a record spanning lines (quoted newlines) reports its first.
+    """
+
+    def __init__(self, fmt: str):
+        if fmt not in IMPORT_FORMATS:
+            raise ContactImportFormatError(f"Unsupported import format: {fmt}")
+        self.fmt = fmt
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buffer = ""
+        self._line = 0
+        self._header: Optional[List[str]] = None
+        # Lines of a CSV record whose quoted field continues on the next line
+        self._pending: List[str] = []
+        self._pending_line = 0
+
+    def feed(self, chunk: bytes) -> Iterator[Record]:
+        try:
+            self._buffer += self._decoder.decode(chunk)
+        except UnicodeDecodeError as e:
+            raise ContactImportFormatError("Body is not valid UTF-8") from e
+        *lines, self._buffer = self._buffer.split("\n")
+        for line in lines:
+            yield from self._parse_line(line)
+        if len(self._buffer) > MAX_RECORD_LENGTH:
+            raise ContactImportFormatError(f"Line {self._line + 1} is too long")
+
+    def close(self) -> Iterator[Record]:
+        try:
+            self._buffer += self._decoder.decode(b"", final=True)
+        except UnicodeDecodeError as e:
+            raise ContactImportFormatError("Body is not valid UTF-8") from e
+        if self._buffer:
+            yield from self._parse_line(self._buffer)
+            self._buffer = ""
+        if self._pending:
+            yield self._pending_line, "Unterminated quoted field"
+            self._pending = []
+        if self.fmt == "csv" and self._header is None:
+            raise ContactImportFormatError("Missing CSV header")
+
+    def _parse_line(self, line: str) -> Iterator[Record]:
+        self._line += 1
+        line = line.rstrip("\r")
+        if self.fmt == "ndjson":
+            if line.strip():
+                yield self._parse_json(line)
+            return
+
+        if not self._pending:
+            self._pending_line = self._line
+        self._pending.append(line)
+        record = "\n".join(self._pending)
+        # An odd number of quotes means a quoted field continues on the next line
+        if record.count('"') % 2:
+            if len(record) > MAX_RECORD_LENGTH:
+                raise ContactImportFormatError(f"Record at line {self._pending_line} is too long")
+            return
+        self._pending = []
+        if record.strip():
+            yield from self._parse_csv(record)
+
+    def _parse_json(self, line: str) -> Record:
+        try:
+            data = json.loads(line)
+        except ValueError:
+            return self._line, "Invalid JSON"
+        if not isinstance(data, dict):
+            return self._line, "Expected a JSON object"
+        return self._line, data
+
+    def _parse_csv(self, record: str) -> Iterator[Record]:
+        try:
+            fields = next(csv.reader([record]))
+        except csv.Error as e:
+            yield self._pending_line, f"Invalid CSV: {e}"
+            return
+
+        if self._header is None:
+            self._header = [name.strip().lower() for name in fields]
+            missing = [name for name in ("first_name", "last_name") if name not in self._header]
+            if missing:
+                raise ContactImportFormatError(f"CSV header is missing: {', '.join(missing)}")
+            return
+
+        if len(fields) > len(self._header):
+            yield self._pending_line, f"Expected {len(self._header)} fields, got {len(fields)}"
+            return
+        # Empty cells are missing values, not empty strings
+        yield self._pending_line, {
+            name: value for name, value in zip(self._header, fields) if value != ""
+        }
+
+def _validate(data: Union[Dict[str, Any], str]) -> Union[ContactCreate, str]:
+    if isinstance(data, str):
+        return data
+    try:
+        return ContactCreate.model_validate(data)
+    except ValidationError as e:
+        return "; ".join(
+            f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+            for error in e.errors()
+        )
+
+class _ImportBatches:
+    """Collects valid rows into batches and tallies the outcome of an import."""
+
+    def __init__(self, user_id: int, batch_size: Optional[int], max_errors: Optional[int]):
+        self.user_id = user_id
+        self.batch_size = batch_size or settings.CONTACT_IMPORT_BATCH_SIZE
+        self.max_errors = settings.CONTACT_IMPORT_MAX_ERRORS if max_errors is None else max_errors
+        self.rows: List[Dict[str, Any]] = []
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def add(self, record: Record) -> bool:
+        """Add a parsed record; returns True once a batch is ready to insert."""
+        line, data = record
+        contact_in = _validate(data)
+        if isinstance(contact_in, str):
+            self.failed += 1
+            if len(self.errors) < self.max_errors:
+                self.errors.append({"line": line, "error": contact_in})
+            return False
+        self.rows.append({"user_id": self.user_id, **contact_in.model_dump()})
+        return len(self.rows) >= self.batch_size
+
+    def take(self) -> List[Dict[str, Any]]:
+        rows, self.rows = self.rows, []
+        self.imported += len(rows)
+        return rows
+
+    def report(self) -> ImportReport:
+        return ImportReport(imported=self.imported, failed=self.failed, errors=self.errors)
+
+def import_contacts(
+    db: Session,
+    user_id: int,
+    chunks: Iterable[bytes],
+    fmt: str,
+    batch_size: Optional[int] = None,
+    max_errors: Optional[int] = None
+) -> ImportReport:
+    """
+    Import contacts from CSV (with a header row) or NDJSON, read in chunks.
+    Valid rows are inserted with one executemany and one commit per batch;
+    invalid rows are skipped and reported (up to `max_errors` of them).
+    Raises ContactImportFormatError when the body can't be parsed at all;
+    batches committed before that point stay imported.
+    """
+    parser = ContactRecordParser(fmt)
+    batches = _ImportBatches(user_id, batch_size, max_errors)
+
+    def flush() -> None:
+        rows = batches.take()
+        if rows:
+            db.execute(insert(Contact), rows)
+            db.commit()
+            invalidate_user_contacts(user_id)
+
+    try:
+        for chunk in chunks:
+            for record in parser.feed(chunk):
+                if batches.add(record):
+                    flush()
+        for record in parser.close():
+            batches.add(record)
+        flush()
+    except Exception:
+        db.rollback()
+        raise
+    report = batches.report()
+    log.info(f"Imported {report.imported} contacts for user {user_id} ({report.failed} rejected)")
+    return report
+
+async def _insert_rows_async(db: AsyncSession, rows: List[Dict[str, Any]]) -> None:
+    if settings.DB_TYPE == "postgresql":
+        # COPY through asyncpg: one round-trip and no per-row statement overhead
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            Contact.__tablename__,
+            records=[tuple(row[column] for column in IMPORT_COLUMNS) for row in rows],
+            columns=IMPORT_COLUMNS
+        )
+    else:
+        await db.execute(insert(Contact), rows)
+
+async def import_contacts_async(
+    db: AsyncSession,
+    user_id: int,
+    chunks: AsyncIterable[bytes],
+    fmt: str,
+    batch_size: Optional[int] = None,
+    max_errors: Optional[int] = None
+) -> ImportReport:
+    """
+    Import contacts from CSV (with a header row) or NDJSON, read in chunks.
+    Valid rows are inserted one batch at a time (COPY on PostgreSQL,
+    executemany elsewhere) with a commit per batch; invalid rows are
+    skipped and reported (up to `max_errors` of them).
+    Raises ContactImportFormatError when the body can't be parsed at all;
+    batches committed before that point stay imported.
+    """
+    parser = ContactRecordParser(fmt)
+    batches = _ImportBatches(user_id, batch_size, max_errors)
+
+    async def flush() -> None:
+        rows = batches.take()
+        if rows:
+            await _insert_rows_async(db, rows)
+            await db.commit()
+            invalidate_user_contacts(user_id)
+
+    try:
+        async for chunk in chunks:
+            for record in parser.feed(chunk):
+                if batches.add(record):
+                    await flush()
+        for record in parser.close():
+            batches.add(record)
+        await flush()
+    except Exception:
+        await db.rollback()
+        raise
+    report = batches.report()
+    log.info(f"Imported {report.imported} contacts for user {user_id} ({report.failed} rejected)")
+    return report
@@ -0,0 +1,68 @@
+import logging
+from typing import Optional, Tuple
+from sqlalchemy import ColumnElement, Select, column, func, or_, select, table, text
+from app.core.config import settings
+from app.models.contact import Contact
+
+log = logging.getLogger(__name__)
+
+# Trigram indexes can't serve shorter terms; those fall back to ILIKE
+MIN_INDEXED_TERM_LENGTH = 3
+
+SEARCH_COLUMNS = (Contact.first_name, Contact.last_name, Contact.email, Contact.phone)
+
+# FTS5 shadow table created with t_contact on SQLite (see app/models/contact.py)
+contact_fts = table("t_contact_fts", column("rowid"), column("rank"))
+
+def _backend(term: str) -> str:
+    """Pick the search backend for a term: "sqlite", "postgresql" or "like"."""
+    if settings.CONTACT_SEARCH_BACKEND == "like" or len(term) < MIN_INDEXED_TERM_LENGTH:
+        return "like"
+    if settings.DB_TYPE in ("sqlite", "postgresql"):
+        return settings.DB_TYPE
+    return "like"
+
+def _like_condition(term: str) -> ColumnElement:
+    search_term = f"%{term}%"
+    return or_(*(col.ilike(search_term) for col in SEARCH_COLUMNS))
+
+def _fts_match(term: str) -> ColumnElement:
+    # A quoted FTS5 string matches the term as a substring with the trigram tokenizer
+    phrase = '"' + term.replace('"', '""') + '"'
+    return text("t_contact_fts MATCH :contact_search").bindparams(contact_search=phrase)
+
+def _fts_matches(term: str) -> Select:
+    # MATCH alone, so it runs once: with t_contact joined in here the planner
+    # walks the user's rows instead (the caller filters on user_id)
+    return select(contact_fts.c.rowid.label("id"), contact_fts.c.rank).where(_fts_match(term))
+
+def search_contacts(query: Select, term: str) -> Tuple[Select, Optional[ColumnElement]]:
+    """
+    Restrict a `select(Contact)` to contacts whose name, email or phone
+    contains `term` (case-insensitive).
+
+    Returns the filtered query and a relevance expression (lower is better)
+    to order by, or None when the backend has no relevance (plain ILIKE).
+    """
+    backend = _backend(term)
+    if backend == "sqlite":
+        # Materialized so MATCH runs once: joined directly, the planner walks the
+        # user's contacts and re-evaluates the full-text query for every row
+        matches = _fts_matches(term).cte("contact_matches").prefix_with("MATERIALIZED")
+        return query.join(matches, matches.c.id == Contact.id), matches.c.rank  # bm25
+    if backend == "postgresql":
+        # The trigram GIN indexes serve the ILIKE predicates
+        similarity = func.greatest(*(
+            func.coalesce(func.word_similarity(term, col), 0) for col in SEARCH_COLUMNS
+        ))
+        return query.where(_like_condition(term)), -similarity
+    return query.where(_like_condition(term)), None
+
+def search_condition(term: str) -> ColumnElement:
+    """
+    WHERE clause matching the same contacts as `search_contacts`, for
+    statements that can't join (bulk UPDATE / DELETE).
+    """
+    if _backend(term) == "sqlite":
+        return Contact.id.in_(_fts_matches(term).with_only_columns(contact_fts.c.rowid))
+    return _like_condition(term)
@@ -1,89 +1,158 @@
 import logging
 from typing import Optional, List, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from app.core.security import get_password_hash, verify_password
+from sqlalchemy import Select, func, select
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import CallbackGauge
+from app.core.pagination import page_query
+from app.core.security import (
+    get_password_hash, get_password_hash_async, verify_password, verify_password_async
+)
 from app.models.user import User
+from app.schemas.user import User as UserSchema
 from app.schemas.user import UserCreate, UserCreateInternal, UserUpdate, UserSearchParams
+from app.services.audit import audit_user_event, audit_user_event_async, user_snapshot
 
 log = logging.getLogger(__name__)
 
+# Snapshots of authenticated users, keyed by user id. Entries are dropped
+# on every update made through this module; changes made elsewhere (or in
+# another worker) become visible after USER_CACHE_TTL_SECONDS at most.
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
+CallbackGauge(
+    "user_cache", "Current user cache counters (size, maxsize, hits, misses)",
+    lambda: (((name,), value) for name, value in user_cache.stats().items() if name != "hit_rate"),
+    ("stat",),
+)
+
+def invalidate_cached_user(user_id: int) -> None:
+    """Drop the cached snapshot of a user. Call on every update, deactivation or deletion."""
+    user_cache.invalidate(user_id)
+
+def _users_query(search_params: Optional[UserSearchParams] = None) -> Select:
+    """Build the filtered user query shared by the sync and async services."""
+    query = select(User)
+
+    if search_params:
+        if search_params.email:
+            query = query.where(User.email.ilike(f"%{search_params.email}%"))
+        if search_params.full_name:
+            query = query.where(User.full_name.ilike(f"%{search_params.full_name}%"))
+        if search_params.is_active is not None:
+            query = query.where(User.is_active == search_params.is_active)
+
+    return query
+
+def _count_query(query: Select) -> Select:
+    """Wrap a query into a SELECT count(*)."""
+    return select(func.count()).select_from(query.order_by(None).subquery())
+
 def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
     """Get user by ID."""
     log.debug(f"Fetching user with ID: {user_id}")
-    return db.query(User).filter(User.id == user_id).first()
+    return db.scalars(select(User).where(User.id == user_id)).first()
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     """Get user by email."""
     log.debug(f"Fetching user with email: {email}")
-    return db.query(User).filter(User.email == email).first()
+    return db.scalars(select(User).where(User.email == email)).first()
 
 def get_users(
     db: Session,
     skip: int = 0,
     limit: int = 100,
-    search_params: Optional[UserSearchParams] = None
-) -> Tuple[List[User], int]:
+    search_params: Optional[UserSearchParams] = None,
+    after_id: Optional[int] = None,
+    include_total: bool = True
+) -> Tuple[List[User], Optional[int]]:
     """
-    Get users with optional search parameters.
-    Returns tuple of (users, total_count)
+    Get users with optional search parameters, ordered by id.
+    Pass `after_id` (the last id of the previous page) for keyset pagination.
+    Returns tuple of (users, total_count); the page and the count come from
+    a single statement. With include_total=False total_count is None.
     """
-    query = db.query(User)
-    
-    if search_params:
-        if search_params.email:
-            query = query.filter(User.email.ilike(f"%{search_params.email}%"))
-        if search_params.full_name:
-            query = query.filter(User.full_name.ilike(f"%{search_params.full_name}%"))
-        if search_params.is_active is not None:
-            query = query.filter(User.is_active == search_params.is_active)
-    
-    total = query.count()
-    users = query.offset(skip).limit(limit).all()
-    
-    return users, total
-
-def create_user(db: Session, user_in: UserCreate | UserCreateInternal) -> User:
-    """Create new user."""
+    query = _users_query(search_params)
+    after = {"id": after_id} if after_id is not None else None
+
+    rows = db.execute(page_query(query, User, skip, limit, after, with_total=include_total)).all()
+    users = [row[0] for row in rows]
+    if not include_total:
+        return users, None
+    if rows:
+        return users, rows[0].total
+    if skip or after is not None:
+        # Past the last page: no row to carry the total, count separately
+        return users, db.scalar(_count_query(query))
+    return users, 0
+
+def create_user(
+    db: Session,
+    user_in: UserCreate | UserCreateInternal,
+    actor: Optional[str] = None
+) -> User:
+    """Create new user. `actor` (who made the change) is recorded in the audit log."""
     log.info(f"Creating new user with email: {user_in.email}")
     data = user_in.model_dump()
     if 'password' in data:
         data['hashed_password'] = get_password_hash(data.pop('password'))
-    
+
     db_user = User(**data)
     db.add(db_user)
     try:
         db.commit()
         db.refresh(db_user)
         log.info(f"Successfully created user with ID: {db_user.id}")
-        return db_user
     except Exception as e:
         log.error(f"Error creating user: {str(e)}")
         db.rollback()
         raise
+    try:
+        audit_user_event("insert", db_user.id, new_data=user_snapshot(db_user), actor=actor)
+    except Exception as e:
+        # The user is committed: a lost audit event must not fail the request
+        log.error(f"Error auditing creation of user {db_user.id}: {str(e)}")
+    return db_user
 
-def update_user(db: Session, user: User, user_in: UserUpdate) -> User:
-    """Update user details."""
+def update_user(
+    db: Session,
+    user: User,
+    user_in: UserUpdate,
+    actor: Optional[str] = None
+) -> User:
+    """Update user details. `actor` (who made the change) is recorded in the audit log."""
     log.info(f"Updating user with ID: {user.id}")
     update_data = user_in.model_dump(exclude_unset=True)
-    
+
     if update_data.get("password"):
         hashed_password = get_password_hash(update_data["password"])
         del update_data["password"]
         update_data["hashed_password"] = hashed_password
 
+    old_data = user_snapshot(user)
     for field, value in update_data.items():
         setattr(user, field, value)
 
     try:
         db.commit()
+        invalidate_cached_user(user.id)
         db.refresh(user)
         log.info(f"Successfully updated user with ID: {user.id}")
-        return user
     except Exception as e:
         log.error(f"Error updating user: {str(e)}")
         db.rollback()
         raise
+    try:
+        audit_user_event("update", user.id, old_data, user_snapshot(user), actor=actor)
+    except Exception as e:
+        # The update is committed: a lost audit event must not fail the request
+        log.error(f"Error auditing update of user {user.id}: {str(e)}")
+    return user
 
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     """Authenticate user by email and password."""
@@ -94,4 +163,138 @@ def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     if not verify_password(password, user.hashed_password):
         log.warning(f"Authentication failed: Invalid password for user {email}")
         return None
-    return user
\ No newline at end of file
+    return user
+
+# Async variants, used by the `async def` routes
+
+async def get_user_by_id_async(db: AsyncSession, user_id: int) -> Optional[User]:
+    """Get user by ID."""
+    log.debug(f"Fetching user with ID: {user_id}")
+    result = await db.scalars(select(User).where(User.id == user_id))
+    return result.first()
+
+async def get_user_by_email_async(db: AsyncSession, email: str) -> Optional[User]:
+    """Get user by email."""
+    log.debug(f"Fetching user with email: {email}")
+    result = await db.scalars(select(User).where(User.email == email))
+    return result.first()
+
+async def get_cached_user_async(db: AsyncSession, user_id: int) -> Optional[UserSchema]:
+    """
+    Get a snapshot of a user, served from the in-process cache when possible.
+    Only existing users are cached.
+    """
+    snapshot = user_cache.get(user_id)
+    if snapshot is not None:
+        return snapshot
+
+    generation = user_cache.generation
+    user = await get_user_by_id_async(db, user_id)
+    if user is None:
+        return None
+    snapshot = UserSchema.model_validate(user)
+    user_cache.set(user_id, snapshot, generation=generation)
+    return snapshot
+
+async def get_users_async(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    search_params: Optional[UserSearchParams] = None,
+    after_id: Optional[int] = None,
+    include_total: bool = True
+) -> Tuple[List[User], Optional[int]]:
+    """
+    Get users with optional search parameters, ordered by id.
+    Pass `after_id` (the last id of the previous page) for keyset pagination.
+    Returns tuple of (users, total_count); the page and the count come from
+    a single statement. With include_total=False total_count is None.
+    """
+    query = _users_query(search_params)
+    after = {"id": after_id} if after_id is not None else None
+
+    statement = page_query(query, User, skip, limit, after, with_total=include_total)
+    rows = (await db.execute(statement)).all()
+    users = [row[0] for row in rows]
+    if not include_total:
+        return users, None
+    if rows:
+        return users, rows[0].total
+    if skip or after is not None:
+        # Past the last page: no row to carry the total, count separately
+        return users, await db.scalar(_count_query(query))
+    return users, 0
+
+async def create_user_async(
+    db: AsyncSession,
+    user_in: UserCreate | UserCreateInternal,
+    actor: Optional[str] = None
+) -> User:
+    """Create new user. `actor` (who made the change) is recorded in the audit log."""
+    log.info(f"Creating new user with email: {user_in.email}")
+    data = user_in.model_dump()
+    if 'password' in data:
+        data['hashed_password'] = await get_password_hash_async(data.pop('password'))
+
+    db_user = User(**data)
+    db.add(db_user)
+    try:
+        await db.commit()
+        await db.refresh(db_user)
+        log.info(f"Successfully created user with ID: {db_user.id}")
+    except Exception as e:
+        log.error(f"Error creating user: {str(e)}")
+        await db.rollback()
+        raise
+    try:
+        await audit_user_event_async("insert", db_user.id, new_data=user_snapshot(db_user), actor=actor)
+    except Exception as e:
+        # The user is committed: a lost audit event must not fail the request
+        log.error(f"Error auditing creation of user {db_user.id}: {str(e)}")
+    return db_user
+
+async def update_user_async(
+    db: AsyncSession,
+    user: User,
+    user_in: UserUpdate,
+    actor: Optional[str] = None
+) -> User:
+    """Update user details. `actor` (who made the change) is recorded in the audit log."""
+    log.info(f"Updating user with ID: {user.id}")
+    update_data = user_in.model_dump(exclude_unset=True)
+
+    if update_data.get("password"):
+        hashed_password = await get_password_hash_async(update_data["password"])
+        del update_data["password"]
+        update_data["hashed_password"] = hashed_password
+
+    old_data = user_snapshot(user)
+    for field, value in update_data.items():
+        setattr(user, field, value)
+
+    try:
+        await db.commit()
+        invalidate_cached_user(user.id)
+        await db.refresh(user)
+        log.info(f"Successfully updated user with ID: {user.id}")
+    except Exception as e:
+        log.error(f"Error updating user: {str(e)}")
+        await db.rollback()
+        raise
+    try:
+        await audit_user_event_async("update", user.id, old_data, user_snapshot(user), actor=actor)
+    except Exception as e:
+        # The update is committed: a lost audit event must not fail the request
+        log.error(f"Error auditing update of user {user.id}: {str(e)}")
+    return user
+
+async def authenticate_user_async(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    """Authenticate user by email and password."""
+    user = await get_user_by_email_async(db, email)
+    if not user:
+        log.warning(f"Authentication failed: User with email {email} not found")
+        return None
+    if not await verify_password_async(password, user.hashed_password):
+        log.warning(f"Authentication failed: Invalid password for user {email}")
+        return None
+    return user
@@ -0,0 +1,129 @@
+"""
+Concurrent throughput of the async database path versus the old blocking one.
+
+The "blocking" variant overrides `get_current_user` with the previous
+implementation (synchronous `SessionLocal` inside an `async def`), the
+"async" variant uses the application as shipped. Both serve `GET /users/me`
+through an in-process ASGI transport.
+
+A simulated network round-trip (--db-latency-ms) is added inside the SQLite
+driver call, i.e. on whichever thread actually executes the statement, which
+is what a remote PostgreSQL server looks like to the event loop.
+
+    python -m benchmarks.async_db --requests 400 --concurrency 1 10 50
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.common import Timer, configure_environment, create_schema, summarize
+
+configure_environment()
+
+import httpx  # noqa: E402
+from fastapi import Depends, HTTPException  # noqa: E402
+from jose import jwt  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.api.v1.endpoints.users import get_current_user  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.core.database import SessionLocal, async_engine, engine  # noqa: E402
+from app.core.security import create_access_token, oauth2_scheme  # noqa: E402
+from app.main import create_application  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services import get_user_by_id  # noqa: E402
+
+
+async def blocking_get_current_user(token: str = Depends(oauth2_scheme)):
+    """The pre-async implementation: a sync session used on the event loop."""
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    db = SessionLocal()
+    try:
+        user = get_user_by_id(db, int(payload["sub"]))
+    finally:
+        db.close()
+    if user is None:
+        raise HTTPException(status_code=401)
+    return user
+
+
+def install_latency(latency_ms: float) -> None:
+    """Sleep inside every statement execution to emulate a remote database."""
+    if latency_ms <= 0:
+        return
+    delay = latency_ms / 1000
+
+    def trace(_statement):
+        time.sleep(delay)
+
+    @event.listens_for(engine, "connect")
+    def _sync_connect(dbapi_connection, _record):
+        dbapi_connection.set_trace_callback(trace)
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def _async_connect(dbapi_connection, _record):
+        # aiosqlite runs the sqlite3 connection on its own worker thread
+        dbapi_connection._connection._conn.set_trace_callback(trace)
+
+
+def seed_user() -> str:
+    with SessionLocal() as db:
+        user = User(email="bench@example.com", full_name="Bench", hashed_password="x")
+        db.add(user)
+        db.commit()
+        return create_access_token({"sub": str(user.id)})
+
+
+async def run(app, token: str, requests: int, concurrency: int) -> dict:
+    headers = {"Authorization": f"Bearer {token}"}
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get(f"{settings.API_V1_PREFIX}/users/me", headers=headers)
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        await one()  # warm up pools
+        latencies.clear()
+        with Timer() as timer:
+            await asyncio.gather(*(one() for _ in range(requests)))
+    return summarize(latencies, timer.elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--db-latency-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    install_latency(args.db_latency_ms)
+    create_schema()
+    token = seed_user()
+
+    blocking_app = create_application()
+    blocking_app.dependency_overrides[get_current_user] = blocking_get_current_user
+    async_app = create_application()
+
+    async def run_all():
+        # A single event loop: the async pool is bound to the loop it runs on
+        results = []
+        for concurrency in args.concurrency:
+            for name, app in (("blocking", blocking_app), ("async", async_app)):
+                stats = await run(app, token, args.requests, concurrency)
+                results.append({"variant": name, "concurrency": concurrency, **stats})
+        await async_engine.dispose()
+        return results
+
+    results = asyncio.run(run_all())
+    print(json.dumps({"db_latency_ms": args.db_latency_ms, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks run against a throwaway SQLite database unless DB_TYPE/DB_NAME
+(and the other database settings) are already set in the environment.
+"""
+import os
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+
+def configure_environment(db_name: str | None = None) -> None:
+    """Set the settings needed to import the app. Must run before importing `app`."""
+    if db_name is None and "DB_NAME" not in os.environ:
+        db_name = os.path.join(tempfile.mkdtemp(prefix="fastapi-template-bench-"), "bench.db")
+    if db_name is not None:
+        os.environ["DB_NAME"] = db_name
+    os.environ.setdefault("DB_TYPE", "sqlite")
+    os.environ.setdefault("PROJECT_NAME", "FastAPI Template Benchmarks")
+    os.environ.setdefault("API_V1_PREFIX", "/api/v1")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-at-least-32-characters")
+    os.environ.setdefault("ALGORITHM", "HS256")
+    os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "60")
+    os.environ.setdefault("BACKEND_CORS_ORIGINS", '["http://localhost:3000"]')
+    os.environ.setdefault("INITIAL_SUPERUSER_EMAIL", "admin@example.com")
+    os.environ.setdefault("INITIAL_SUPERUSER_PASSWORD", "adminpassword")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    # Benchmarks measure the API, not the rate limiter
+    os.environ.setdefault("RATE_LIMIT_PER_MINUTE", "0")
+    os.environ.setdefault("RATE_LIMIT_LOGIN_PER_MINUTE", "0")
+    os.environ.setdefault("RATE_LIMIT_REGISTER_PER_MINUTE", "0")
+
+
+def create_schema() -> None:
+    """Create all tables on the configured database."""
+    from app.core.database import Base, engine
+    import app.models.audit  # noqa: F401
+    import app.models.contact  # noqa: F401
+    import app.models.user  # noqa: F401
+
+    Base.metadata.create_all(bind=engine)
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """Summarize per-request latencies (seconds) into throughput and percentiles (ms)."""
+    ordered = sorted(latencies)
+    if not ordered:
+        return {"requests": 0, "elapsed_s": round(elapsed, 4), "throughput_rps": 0.0}
+
+    def percentile(p: float) -> float:
+        index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+        return round(ordered[index] * 1000, 3)
+
+    return {
+        "requests": len(ordered),
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(len(ordered) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": percentile(50),
+        "p95_ms": percentile(95),
+        "p99_ms": percentile(99),
+    }
+
+
+class Timer:
+    """Context manager measuring wall-clock time with perf_counter."""
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
+        return False
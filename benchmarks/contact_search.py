@@ -0,0 +1,93 @@
+"""
+Contact search latency: the indexed backend versus plain ILIKE.
+
+Seeds one user with --contacts contacts, then runs the same searches through
+`get_user_contacts_page` with CONTACT_SEARCH_BACKEND="like" (four
+leading-wildcard ILIKE predicates, a scan of every contact the user owns) and
+"auto" (FTS5 trigram table on SQLite, pg_trgm indexes on PostgreSQL).
+
+    python -m benchmarks.contact_search --contacts 100000 --repeat 20
+"""
+import argparse
+import json
+import random
+import time
+
+from benchmarks.common import Timer, configure_environment, create_schema, summarize
+
+configure_environment()
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import SessionLocal  # noqa: E402
+from app.models.contact import Contact  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services import get_user_contacts_page  # noqa: E402
+
+FIRST_NAMES = ["Ada", "Grace", "Alan", "Edsger", "Barbara", "Donald", "Margaret", "Ken", "Linus", "Radia"]
+LAST_NAMES = ["Lovelace", "Hopper", "Turing", "Dijkstra", "Liskov", "Knuth", "Hamilton", "Thompson", "Torvalds", "Perlman"]
+DOMAINS = ["example.com", "example.org", "mail.test", "corp.invalid"]
+
+# Common, rare and absent terms; "ha" is below the trigram length and always uses ILIKE
+TERMS = ["lovelace", "knuth42", "example.org", "555-0123", "zzzz", "ha"]
+
+
+def seed(contacts: int, batch_size: int = 5000) -> int:
+    rng = random.Random(42)
+    with SessionLocal() as db:
+        user = User(email="bench@example.com", full_name="Bench", hashed_password="x")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+        for start in range(0, contacts, batch_size):
+            rows = []
+            for i in range(start, min(start + batch_size, contacts)):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                rows.append({
+                    "user_id": user_id,
+                    "first_name": first,
+                    "last_name": last,
+                    "email": f"{first.lower()}.{last.lower()}{i}@{rng.choice(DOMAINS)}",
+                    "phone": f"555-{rng.randrange(10000):04d}",
+                })
+            db.execute(insert(Contact), rows)
+            db.commit()
+    return user_id
+
+
+def run(user_id: int, backend: str, term: str, repeat: int, limit: int) -> dict:
+    settings.CONTACT_SEARCH_BACKEND = backend
+    latencies = []
+    with SessionLocal() as db:
+        page = get_user_contacts_page(db, user_id, limit=limit, search=term)  # warm up
+        with Timer() as timer:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                get_user_contacts_page(db, user_id, limit=limit, search=term)
+                latencies.append(time.perf_counter() - start)
+    return {"matches": page.total, **summarize(latencies, timer.elapsed)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contacts", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--terms", nargs="+", default=TERMS)
+    args = parser.parse_args()
+
+    create_schema()
+    user_id = seed(args.contacts)
+
+    results = []
+    for term in args.terms:
+        for backend in ("like", "auto"):
+            stats = run(user_id, backend, term, args.repeat, args.limit)
+            results.append({"term": term, "backend": backend, **stats})
+    print(json.dumps({"db_type": settings.DB_TYPE, "contacts": args.contacts, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
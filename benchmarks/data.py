@@ -0,0 +1,86 @@
+"""
+Deterministic synthetic data for the benchmarks.
+
+Row i always has the same content, so a database can be grown from one
+scale to the next by appending the missing rows. A dataset of `scale`
+rows holds `scale // 10` users and `scale` contacts. Contact j belongs to
+user j // 10 + 1, except every tenth contact, which goes to user 1, the
+"heavy" user owning about 10% of all contacts.
+"""
+from typing import Dict, Iterator, List
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.contact import Contact
+from app.models.user import User
+
+FIRST_NAMES = ["Ada", "Grace", "Alan", "Edsger", "Barbara", "Donald", "Margaret", "Ken", "Linus", "Radia",
+               "John", "Frances", "Niklaus", "Leslie", "Tim", "Sophie", "Dennis", "Hedy", "Guido", "Anita"]
+LAST_NAMES = ["Lovelace", "Hopper", "Turing", "Dijkstra", "Liskov", "Knuth", "Hamilton", "Thompson", "Torvalds",
+              "Perlman", "Backus", "Allen", "Wirth", "Lamport", "Berners-Lee", "Wilson", "Ritchie", "Lamarr",
+              "van Rossum", "Borg"]
+DOMAINS = ["example.com", "example.org", "mail.test", "corp.invalid"]
+
+HEAVY_USER_ID = 1
+USERS_PER_ROW = 10  # One user per 10 rows of scale
+BATCH_SIZE = 10_000
+
+
+def _mix(i: int) -> int:
+    """Cheap deterministic hash of a row index (Knuth's multiplicative hash)."""
+    return (i * 2654435761) & 0xFFFFFFFF
+
+
+def user_row(i: int) -> Dict:
+    """User with id i + 1."""
+    h = _mix(i)
+    first, last = FIRST_NAMES[h % 20], LAST_NAMES[(h >> 8) % 20]
+    return {
+        "id": i + 1,
+        "email": f"user{i}@{DOMAINS[(h >> 16) % 4]}",
+        "full_name": f"{first} {last}",
+        "hashed_password": "x",  # Nobody logs in
+        "is_active": h % 7 != 0,
+        "is_superuser": False,
+    }
+
+
+def contact_owner(j: int) -> int:
+    return HEAVY_USER_ID if j % 10 == 0 else j // USERS_PER_ROW + 1
+
+
+def contact_row(j: int) -> Dict:
+    """Contact with id j + 1."""
+    h = _mix(j + 0x9E3779B9)
+    first, last = FIRST_NAMES[h % 20], LAST_NAMES[(h >> 8) % 20]
+    return {
+        "id": j + 1,
+        "user_id": contact_owner(j),
+        "first_name": first,
+        "last_name": last,
+        "email": f"{first.lower()}.{last.lower().replace(' ', '')}{j}@{DOMAINS[(h >> 16) % 4]}",
+        "phone": f"555-{(h >> 4) % 10000:04d}" if h % 5 else None,
+    }
+
+
+def _batches(make_row, start: int, stop: int) -> Iterator[List[Dict]]:
+    for batch_start in range(start, stop, BATCH_SIZE):
+        yield [make_row(i) for i in range(batch_start, min(batch_start + BATCH_SIZE, stop))]
+
+
+def populate(db: Session, scale: int) -> Dict[str, int]:
+    """
+    Grow the dataset to `scale` rows with bulk (executemany) inserts,
+    one commit per batch. Returns the number of users and contacts.
+    """
+    users = max(1, scale // USERS_PER_ROW)
+    existing_users = db.scalar(select(func.count()).select_from(User)) or 0
+    existing_contacts = db.scalar(select(func.count()).select_from(Contact)) or 0
+    for rows in _batches(user_row, existing_users, users):
+        db.execute(insert(User), rows)
+        db.commit()
+    for rows in _batches(contact_row, existing_contacts, scale):
+        db.execute(insert(Contact), rows)
+        db.commit()
+    return {"users": users, "contacts": scale}
@@ -0,0 +1,280 @@
+"""
+HTTP load test of the whole API under a realistic request mix.
+
+Seeds --users users (each with --contacts contacts), then runs --duration
+seconds of traffic per concurrency level. Every virtual user logs in once,
+then picks its next request from the mix until time runs out:
+
+    login    POST /users/login (bcrypt verify)
+    me       GET  /users/me
+    list     GET  /contacts/?limit=20
+    search   GET  /contacts/?search=<term>
+    create   POST /contacts/
+
+Requests go through an in-process ASGI transport by default, or to a real
+uvicorn server (--transport uvicorn, --workers N) started on the same
+database. Results (throughput, p50/p95/p99 overall and per operation,
+errors) are printed as JSON and written to --output to compare runs.
+
+    python -m benchmarks.load --concurrency 1 10 50 --duration 10 --mix read
+    python -m benchmarks.load --transport uvicorn --workers 2 --mix login=1,me=10
+"""
+import argparse
+import asyncio
+import json
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from benchmarks.common import Timer, configure_environment, create_schema, summarize
+
+configure_environment()
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import SessionLocal, async_engine  # noqa: E402
+from app.core.security import get_password_hash  # noqa: E402
+from app.main import create_application  # noqa: E402
+from app.models.contact import Contact  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+API = settings.API_V1_PREFIX
+PASSWORD = "benchpassword"
+
+# Relative weights of the operations
+MIXES: Dict[str, Dict[str, int]] = {
+    "read": {"login": 2, "me": 40, "list": 30, "search": 20, "create": 8},
+    "write": {"login": 5, "me": 15, "list": 20, "search": 10, "create": 50},
+    "login": {"login": 1},
+}
+
+FIRST_NAMES = ["Ada", "Grace", "Alan", "Edsger", "Barbara", "Donald", "Margaret", "Ken", "Linus", "Radia"]
+LAST_NAMES = ["Lovelace", "Hopper", "Turing", "Dijkstra", "Liskov", "Knuth", "Hamilton", "Thompson", "Torvalds", "Perlman"]
+SEARCH_TERMS = ["lovelace", "hopper", "knuth", "example.org", "555-01", "zzzz"]
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """A named mix or weights like "login=1,me=10"."""
+    if value in MIXES:
+        return MIXES[value]
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in MIXES["read"]:
+            raise argparse.ArgumentTypeError(f"Unknown operation: {name}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def seed(users: int, contacts: int) -> List[str]:
+    """Create the users (all with PASSWORD) and their contacts; returns the emails."""
+    rng = random.Random(42)
+    hashed_password = get_password_hash(PASSWORD)
+    emails = [f"load{i}@example.com" for i in range(users)]
+    with SessionLocal() as db:
+        user_ids = db.scalars(
+            insert(User).returning(User.id),
+            [{"email": email, "full_name": f"Load {i}", "hashed_password": hashed_password,
+              "is_active": True, "is_superuser": False} for i, email in enumerate(emails)]
+        ).all()
+        for user_id in user_ids:
+            rows = []
+            for i in range(contacts):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                rows.append({
+                    "user_id": user_id,
+                    "first_name": first,
+                    "last_name": last,
+                    "email": f"{first.lower()}.{last.lower()}{i}@example.{rng.choice(['com', 'org'])}",
+                    "phone": f"555-{rng.randrange(10000):04d}",
+                })
+            if rows:
+                db.execute(insert(Contact), rows)
+        db.commit()
+    return emails
+
+
+async def login(client: httpx.AsyncClient, email: str) -> httpx.Response:
+    return await client.post(f"{API}/users/login", data={"username": email, "password": PASSWORD})
+
+
+class VirtualUser:
+    """One simulated client: its own credentials and random stream of requests."""
+
+    def __init__(self, client: httpx.AsyncClient, email: str, seed: int):
+        self.client = client
+        self.email = email
+        self.rng = random.Random(seed)
+        self.headers: Dict[str, str] = {}
+
+    async def start(self) -> None:
+        response = await login(self.client, self.email)
+        response.raise_for_status()
+        self.headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def request(self, operation: str) -> httpx.Response:
+        if operation == "login":
+            return await login(self.client, self.email)
+        if operation == "me":
+            return await self.client.get(f"{API}/users/me", headers=self.headers)
+        if operation == "list":
+            return await self.client.get(f"{API}/contacts/", params={"limit": 20}, headers=self.headers)
+        if operation == "search":
+            term = self.rng.choice(SEARCH_TERMS)
+            return await self.client.get(f"{API}/contacts/", params={"search": term, "limit": 20}, headers=self.headers)
+        if operation == "create":
+            contact = {
+                "first_name": self.rng.choice(FIRST_NAMES),
+                "last_name": self.rng.choice(LAST_NAMES),
+                "phone": f"555-{self.rng.randrange(10000):04d}",
+            }
+            return await self.client.post(f"{API}/contacts/", json=contact, headers=self.headers)
+        raise ValueError(f"Unknown operation: {operation}")
+
+
+async def run_level(
+    client: httpx.AsyncClient, emails: List[str], mix: Dict[str, int], concurrency: int, duration: float
+) -> dict:
+    operations, weights = list(mix), list(mix.values())
+    vusers = [VirtualUser(client, emails[i % len(emails)], seed=i) for i in range(concurrency)]
+    await asyncio.gather(*(vuser.start() for vuser in vusers))
+
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    deadline = time.perf_counter() + duration
+
+    async def loop(vuser: VirtualUser) -> None:
+        while time.perf_counter() < deadline:
+            operation = vuser.rng.choices(operations, weights)[0]
+            start = time.perf_counter()
+            try:
+                response = await vuser.request(operation)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies[operation].append(time.perf_counter() - start)
+            if failed:
+                errors[operation] += 1
+
+    with Timer() as timer:
+        await asyncio.gather(*(loop(vuser) for vuser in vusers))
+
+    every = [latency for values in latencies.values() for latency in values]
+    return {
+        "concurrency": concurrency,
+        **summarize(every, timer.elapsed),
+        "errors": sum(errors.values()),
+        "operations": {
+            name: {**summarize(values, timer.elapsed), "errors": errors[name]}
+            for name, values in sorted(latencies.items())
+        },
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    """Run uvicorn on the benchmark database (the environment is inherited)."""
+    server = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+    ])
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {server.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}{API}/openapi.json").status_code == 200:
+                return server
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("uvicorn did not start within 30s")
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--contacts", type=int, default=200, help="Contacts per user")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per concurrency level")
+    parser.add_argument("--mix", type=parse_mix, default="read", help=f"{', '.join(MIXES)} or op=weight,...")
+    parser.add_argument("--transport", choices=["asgi", "uvicorn"], default="asgi")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    create_schema()
+    emails = seed(args.users, args.contacts)
+
+    server = None
+    if args.transport == "uvicorn":
+        port = free_port()
+        server = start_server(port, args.workers)
+        client_options = {"base_url": f"http://127.0.0.1:{port}"}
+    else:
+        client_options = {"transport": httpx.ASGITransport(app=create_application()), "base_url": "http://bench"}
+
+    async def run_all() -> List[dict]:
+        # A single event loop: the async pool is bound to the loop it runs on
+        limits = httpx.Limits(max_connections=max(args.concurrency))
+        async with httpx.AsyncClient(limits=limits, timeout=60, **client_options) as client:
+            results = [
+                await run_level(client, emails, args.mix, concurrency, args.duration)
+                for concurrency in args.concurrency
+            ]
+        await async_engine.dispose()
+        return results
+
+    try:
+        results = asyncio.run(run_all())
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = {
+        "benchmark": "load",
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "db_type": settings.DB_TYPE,
+        "transport": args.transport,
+        "workers": args.workers if args.transport == "uvicorn" else None,
+        "users": args.users,
+        "contacts_per_user": args.contacts,
+        "duration_s": args.duration,
+        "mix": args.mix,
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
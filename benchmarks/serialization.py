@@ -0,0 +1,86 @@
+"""
+Cost of serializing one list page: FastAPI's response_model path versus the
+FAST_JSON_RESPONSES path.
+
+"response_model" runs what FastAPI does for `list_contacts` / `read_users`:
+validate the dict of ORM rows against the response model (from_attributes,
+EmailStr included), dump it, then encode it with JSONResponse (stdlib json).
+"fast" renders the same page with the precompiled PageSerializer.
+
+    python -m benchmarks.serialization --items 100 --repeat 200
+"""
+import argparse
+import asyncio
+import json
+import timeit
+from datetime import datetime
+
+from benchmarks.common import configure_environment
+
+configure_environment()
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from app.models.contact import Contact  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.contact import PaginatedContactResponse, contact_page_serializer  # noqa: E402
+from app.schemas.user import PaginatedResponse, user_page_serializer  # noqa: E402
+
+
+def contact_rows(n: int) -> list:
+    now = datetime.now()
+    return [
+        Contact(id=i, user_id=1, first_name=f"Ada{i}", last_name="Lovelace",
+                email=f"ada{i}@example.com", phone="555-0100", created_at=now, updated_at=now)
+        for i in range(1, n + 1)
+    ]
+
+
+def user_rows(n: int) -> list:
+    now = datetime.now()
+    return [
+        User(id=i, email=f"user{i}@example.com", full_name=f"User {i}", hashed_password="x",
+             is_active=True, is_superuser=False, created_at=now, updated_at=now)
+        for i in range(1, n + 1)
+    ]
+
+
+def measure(name: str, page_schema, serializer, items: list, repeat: int) -> dict:
+    page = {"items": items, "total": 10 * len(items), "page": 1, "page_size": len(items), "next_cursor": "eyJpZCI6MTAwfQ"}
+    field = create_response_field(name=f"Response_{name}", type_=page_schema, mode="serialization")
+    loop = asyncio.new_event_loop()
+
+    def response_model() -> bytes:
+        content = loop.run_until_complete(serialize_response(field=field, response_content=page))
+        return JSONResponse(content).body
+
+    def fast() -> bytes:
+        return serializer.response(page).body
+
+    assert json.loads(response_model()) == json.loads(fast())
+    results = {}
+    for variant, fn in (("response_model", response_model), ("fast", fast)):
+        best = min(timeit.repeat(fn, number=repeat, repeat=5)) / repeat
+        results[f"{variant}_us"] = round(best * 1e6, 1)
+    loop.close()
+    results["speedup"] = round(results["response_model_us"] / results["fast_us"], 1)
+    return {"page": name, "items": len(items), **results}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    results = [
+        measure("contacts", PaginatedContactResponse, contact_page_serializer, contact_rows(args.items), args.repeat),
+        measure("users", PaginatedResponse, user_page_serializer, user_rows(args.items), args.repeat),
+    ]
+    print(json.dumps({"results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Service-layer microbenchmarks at growing data scales.
+
+For each --scales value the database is grown (see benchmarks/data.py) to
+that many contacts and scale / 10 users, then each case below runs
+--repeat times (after one warm-up call) on a sync session:
+
+    get_users            every combination of the UserSearchParams filters
+    get_user_contacts    the heavy user (10% of contacts) and a typical one,
+                         with and without search
+    get_total_contacts   with and without search
+    create_contact       one insert + commit (rows are removed afterwards)
+
+Results are compared with the --baseline file: each case gets the
+percentage change of its median, and changes beyond --threshold are
+listed as regressions. --save-baseline replaces the baseline with this
+run.
+
+    python -m benchmarks.services --scales 1000 100000 1000000 --repeat 20
+    python -m benchmarks.services --scales 1000 --save-baseline
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from benchmarks.common import Timer, configure_environment, create_schema, summarize
+
+configure_environment()
+
+from sqlalchemy import delete  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.database import SessionLocal  # noqa: E402
+from app.models.contact import Contact  # noqa: E402
+from app.schemas.contact import ContactCreate  # noqa: E402
+from app.schemas.user import UserSearchParams  # noqa: E402
+from app.services import (  # noqa: E402
+    create_contact, get_total_contacts, get_user_contacts, get_users
+)
+from benchmarks.data import HEAVY_USER_ID, populate  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "services.json")
+
+# Filters matching a fraction of the generated users
+USER_FILTERS = {"email": "example.org", "full_name": "lovelace", "is_active": True}
+SEARCH_TERM = "hopper"
+
+
+def user_search_cases() -> Iterator[Tuple[str, UserSearchParams]]:
+    for size in range(len(USER_FILTERS) + 1):
+        for names in itertools.combinations(USER_FILTERS, size):
+            label = "+".join(names) or "no filter"
+            yield label, UserSearchParams(**{name: USER_FILTERS[name] for name in names})
+
+
+def cases(db, users: int) -> Iterator[Tuple[str, Callable[[], object]]]:
+    typical_user = users // 2 + 1
+    for label, params in user_search_cases():
+        yield f"get_users[{label}]", lambda params=params: get_users(db, limit=100, search_params=params)
+    for owner, user_id in (("heavy", HEAVY_USER_ID), ("typical", typical_user)):
+        yield f"get_user_contacts[{owner}]", lambda user_id=user_id: get_user_contacts(db, user_id)
+        yield f"get_user_contacts[{owner}, search]", lambda user_id=user_id: get_user_contacts(
+            db, user_id, search=SEARCH_TERM
+        )
+    yield "get_total_contacts[heavy]", lambda: get_total_contacts(db, HEAVY_USER_ID)
+    yield "get_total_contacts[heavy, search]", lambda: get_total_contacts(db, HEAVY_USER_ID, search=SEARCH_TERM)
+
+
+def measure(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    func()  # Warm up
+    latencies = []
+    with Timer() as timer:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            latencies.append(time.perf_counter() - start)
+    return summarize(latencies, timer.elapsed)
+
+
+def measure_create_contact(db, repeat: int) -> Dict[str, float]:
+    contact_in = ContactCreate(first_name="Bench", last_name="Mark", email="bench@example.com", phone="555-0000")
+    created: List[int] = []
+    stats = measure(lambda: created.append(create_contact(db, HEAVY_USER_ID, contact_in).id), repeat)
+    # Keep the dataset exactly as generated, for the next scale
+    db.execute(delete(Contact).where(Contact.id.in_(created)))
+    db.commit()
+    return stats
+
+
+def run_scale(scale: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    with SessionLocal() as db:
+        with Timer() as timer:
+            counts = populate(db, scale)
+        print(f"scale {scale}: {counts['users']} users, {counts['contacts']} contacts "
+              f"(generated in {timer.elapsed:.1f}s)", flush=True)
+        results = {name: measure(func, repeat) for name, func in cases(db, counts["users"])}
+        results["create_contact"] = measure_create_contact(db, repeat)
+    return results
+
+
+def compare(results: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> Tuple[Dict, List[str]]:
+    """Percentage change of each median (p50) from the baseline, and the regressions beyond `threshold`."""
+    deltas: Dict[str, Dict[str, float]] = {}
+    regressions = []
+    for scale, cases_ in results.items():
+        for name, stats in cases_.items():
+            before = baseline.get(scale, {}).get(name)
+            if not before or not before.get("p50_ms"):
+                continue
+            delta = round((stats["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100, 1)
+            deltas.setdefault(scale, {})[name] = delta
+            if delta > threshold:
+                regressions.append(f"{name} at {scale} rows: {before['p50_ms']}ms -> {stats['p50_ms']}ms (+{delta}%)")
+    return deltas, regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run to --baseline")
+    parser.add_argument("--threshold", type=float, default=20.0, help="Regression threshold in percent")
+    args = parser.parse_args()
+
+    create_schema()
+    results = {str(scale): run_scale(scale, args.repeat) for scale in sorted(args.scales)}
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get("results", {})
+    deltas, regressions = compare(results, baseline, args.threshold)
+
+    report = {
+        "db_type": settings.DB_TYPE,
+        "search_backend": settings.CONTACT_SEARCH_BACKEND,
+        "repeat": args.repeat,
+        "results": results,
+        "p50_delta_pct": deltas,
+        "regressions": regressions,
+    }
+    print(json.dumps(report, indent=2))
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        # Merge, so that a run at some scales keeps the baseline of the others
+        with open(args.baseline, "w") as f:
+            json.dump({
+                "db_type": settings.DB_TYPE,
+                "repeat": args.repeat,
+                "results": {**baseline, **results},
+            }, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
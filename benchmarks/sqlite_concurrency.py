@@ -0,0 +1,135 @@
+"""
+Concurrent read/write throughput of SQLite: the tuned profile versus the
+previous defaults.
+
+"default" is what the app used before: rollback journal, synchronous=FULL
+and no other PRAGMAs. "tuned" applies sqlite_pragmas() from
+app/core/database.py (WAL, synchronous=NORMAL, busy_timeout, cache_size,
+mmap_size). Each profile gets its own database file seeded with
+--contacts contacts, then --readers threads page through contacts while
+--writers threads insert and commit one contact at a time, for --duration
+seconds.
+
+    python -m benchmarks.sqlite_concurrency --readers 8 --writers 2 --duration 10
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+from benchmarks.common import configure_environment, summarize
+
+configure_environment()
+
+from sqlalchemy import create_engine, insert, select, text  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+
+from app.core.database import Base, set_sqlite_pragmas, sqlite_pragmas  # noqa: E402
+from app.models.contact import Contact  # noqa: E402
+from app.models.user import User  # noqa: E402
+
+PROFILES = ("default", "tuned")
+USERS = 100
+
+
+def make_engine(profile: str, path: str) -> Engine:
+    if profile == "default":
+        return create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+    engine = create_engine(
+        f"sqlite:///{path}", pool_size=5, max_overflow=10, connect_args={"check_same_thread": False}
+    )
+    set_sqlite_pragmas(engine, sqlite_pragmas())
+    return engine
+
+
+def seed(engine: Engine, contacts: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(insert(User), [
+            {"id": i, "email": f"user{i}@example.com", "hashed_password": "x"} for i in range(1, USERS + 1)
+        ])
+        connection.execute(insert(Contact), [
+            {"user_id": i % USERS + 1, "first_name": f"First{i}", "last_name": "Last", "phone": f"555-{i:04d}"}
+            for i in range(contacts)
+        ])
+
+
+def run(engine: Engine, readers: int, writers: int, duration: float) -> Dict:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    deadline = time.perf_counter() + duration
+    page = select(Contact).order_by(Contact.id).limit(20)
+
+    def reader(n: int) -> None:
+        user_id = n
+        while time.perf_counter() < deadline:
+            user_id = user_id % USERS + 1
+            start = time.perf_counter()
+            try:
+                with engine.connect() as connection:
+                    connection.execute(page.where(Contact.user_id == user_id)).all()
+            except OperationalError:
+                errors["read"] += 1
+            latencies["read"].append(time.perf_counter() - start)
+
+    def writer(n: int) -> None:
+        i = 0
+        while time.perf_counter() < deadline:
+            i += 1
+            start = time.perf_counter()
+            try:
+                with engine.begin() as connection:
+                    connection.execute(insert(Contact).values(
+                        user_id=(n * 7919 + i) % USERS + 1, first_name=f"New{i}", last_name="Writer"
+                    ))
+            except OperationalError:  # database is locked
+                errors["write"] += 1
+            latencies["write"].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=reader, args=(n,)) for n in range(readers)]
+    threads += [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return {
+        kind: {**summarize(latencies[kind], elapsed), "errors": errors[kind]}
+        for kind in ("read", "write")
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--contacts", type=int, default=50_000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="fastapi-template-sqlite-bench-")
+    results = {}
+    for profile in PROFILES:
+        engine = make_engine(profile, os.path.join(directory, f"{profile}.db"))
+        seed(engine, args.contacts)
+        with engine.connect() as connection:
+            journal_mode = connection.execute(text("PRAGMA journal_mode")).scalar()
+        results[profile] = {
+            "journal_mode": journal_mode,
+            **run(engine, args.readers, args.writers, args.duration),
+        }
+        engine.dispose()
+    print(json.dumps({
+        "contacts": args.contacts, "readers": args.readers, "writers": args.writers,
+        "duration_s": args.duration, "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
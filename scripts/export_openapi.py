@@ -0,0 +1,29 @@
+"""
+Write the OpenAPI schema of the app to a file, to be served through
+OPENAPI_SCHEMA_FILE instead of being generated by every worker.
+
+    python -m scripts.export_openapi build/openapi.json
+
+Run it with the same settings as the deployment (API_V1_PREFIX and
+PROJECT_NAME appear in the schema).
+"""
+import argparse
+import json
+from typing import Optional, Sequence
+from fastapi import FastAPI
+from app.main import app
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Export the OpenAPI schema."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output", help="File to write the schema to")
+    args = parser.parse_args(argv)
+
+    # Generated from the routes even when OPENAPI_SCHEMA_FILE is set
+    schema = FastAPI.openapi(app)
+    with open(args.output, "w") as f:
+        json.dump(schema, f, separators=(",", ":"))
+    print(f"Wrote the OpenAPI schema ({len(schema['paths'])} paths) to {args.output}")
+
+if __name__ == "__main__":
+    main()
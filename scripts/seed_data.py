@@ -0,0 +1,226 @@
+"""
+Seed the configured database with realistic users and contacts.
+
+Rows are generated in parallel worker processes, in blocks of users along
+with their contacts, and written by this process in large batches inside a
+single transaction: COPY on PostgreSQL, multi-row INSERT statements on
+SQLite and MySQL (on SQLite the contact search index is rebuilt once at
+the end). Every user gets the same password, hashed once.
+
+    python -m scripts.seed_data --users 1000000 --contacts-per-user 10 --workers 4
+
+The schema must exist (alembic upgrade head). Users are added after the
+existing ones; the output is deterministic for a given --seed.
+"""
+import argparse
+import csv
+import io
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Deque, List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy import func, select
+from app.core.database import engine
+from app.core.security import get_password_hash
+from app.models.contact import Contact
+from app.models.user import User
+
+FIRST_NAMES = ["Ada", "Grace", "Alan", "Edsger", "Barbara", "Donald", "Margaret", "Ken", "Linus", "Radia",
+               "John", "Frances", "Niklaus", "Leslie", "Tim", "Sophie", "Dennis", "Hedy", "Guido", "Anita",
+               "Marco", "Giulia", "Luca", "Chiara", "Paolo", "Elena", "Andrea", "Sara", "Matteo", "Laura"]
+LAST_NAMES = ["Lovelace", "Hopper", "Turing", "Dijkstra", "Liskov", "Knuth", "Hamilton", "Thompson", "Torvalds",
+              "Perlman", "Backus", "Allen", "Wirth", "Lamport", "Berners-Lee", "Wilson", "Ritchie", "Lamarr",
+              "van Rossum", "Borg", "Rossi", "Russo", "Ferrari", "Esposito", "Bianchi", "Romano", "Colombo",
+              "Ricci", "Marino", "Greco"]
+DOMAINS = ["example.com", "example.org", "example.net", "mail.test", "corp.invalid"]
+
+USER_COLUMNS = ("id", "email", "full_name", "hashed_password", "is_active", "is_superuser")
+CONTACT_COLUMNS = ("user_id", "first_name", "last_name", "email", "phone")
+USER_TABLE = User.__tablename__
+CONTACT_TABLE = Contact.__tablename__
+
+# Bind parameters per multi-row INSERT (SQLite allows 32766, MySQL 65535)
+MAX_PARAMETERS = 30000
+
+class Block(NamedTuple):
+    """Rows generated for one block of users."""
+    users: List[tuple]
+    contacts: List[tuple]
+
+def generate_block(
+    seed: int, first_id: int, count: int, contacts_per_user: int, hashed_password: str
+) -> Block:
+    """Users first_id .. first_id + count - 1 and their contacts (0 to 2x the average each)."""
+    rng = random.Random(seed * 1_000_003 + first_id)
+    users, contacts = [], []
+    for user_id in range(first_id, first_id + count):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        local = f"{first}.{last}".lower().replace(" ", "")
+        users.append((
+            user_id, f"{local}{user_id}@{rng.choice(DOMAINS)}", f"{first} {last}",
+            hashed_password, rng.random() < 0.95, False,
+        ))
+        for n in range(rng.randint(0, 2 * contacts_per_user)):
+            c_first, c_last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            contacts.append((
+                user_id, c_first, c_last,
+                f"{c_first}.{c_last}".lower().replace(" ", "") + f"{user_id}x{n}@{rng.choice(DOMAINS)}"
+                if rng.random() < 0.8 else None,
+                f"+39 3{rng.randrange(10**8, 10**9)}" if rng.random() < 0.7 else None,
+            ))
+    return Block(users, contacts)
+
+class PostgresWriter:
+    """Streams rows with COPY ... FROM STDIN (psycopg2)."""
+
+    def __init__(self, dbapi_connection):
+        self.cursor = dbapi_connection.cursor()
+
+    def write(self, table: str, columns: Sequence[str], rows: List[tuple]) -> None:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            # An unquoted empty field is NULL in COPY's CSV format
+            writer.writerow(["" if value is None else value for value in row])
+        buffer.seek(0)
+        self.cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+    def finish(self) -> None:
+        # Explicit ids were inserted; move the sequence past them
+        self.cursor.execute("SELECT setval(pg_get_serial_sequence('t_user', 'id'), (SELECT max(id) FROM t_user))")
+
+class MultiRowInsertWriter:
+    """INSERT ... VALUES (...), (...), ... with as many rows as the parameter limit allows."""
+
+    def __init__(self, dbapi_connection, paramstyle: str):
+        self.cursor = dbapi_connection.cursor()
+        self.placeholder = "?" if paramstyle == "qmark" else "%s"
+
+    def write(self, table: str, columns: Sequence[str], rows: List[tuple]) -> None:
+        per_statement = MAX_PARAMETERS // len(columns)
+        row_sql = "(" + ", ".join([self.placeholder] * len(columns)) + ")"
+        for start in range(0, len(rows), per_statement):
+            chunk = rows[start:start + per_statement]
+            self.cursor.execute(
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES " + ", ".join([row_sql] * len(chunk)),
+                [value for row in chunk for value in row],
+            )
+
+    def finish(self) -> None:
+        pass
+
+class SQLiteWriter(MultiRowInsertWriter):
+    """
+    Multi-row INSERTs. With `rebuild_index`, the contact search index (see
+    app/models/contact.py) is rebuilt once at the end instead of row by row
+    through its insert trigger: much faster when most rows are new.
+    """
+
+    FTS_TRIGGER = "t_contact_fts_ai"
+
+    def __init__(self, dbapi_connection, rebuild_index: bool):
+        super().__init__(dbapi_connection, "qmark")
+        # Explicit transaction, so that dropping the trigger is rolled back on failure too
+        self.cursor.execute("BEGIN")
+        row = self.cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (self.FTS_TRIGGER,)
+        ).fetchone()
+        self.trigger_sql = row[0] if row and rebuild_index else None
+        if self.trigger_sql:
+            self.cursor.execute(f"DROP TRIGGER {self.FTS_TRIGGER}")
+
+    def finish(self) -> None:
+        if self.trigger_sql:
+            self.cursor.execute("INSERT INTO t_contact_fts (t_contact_fts) VALUES ('rebuild')")
+            self.cursor.execute(self.trigger_sql)
+
+def seed(
+    users: int,
+    contacts_per_user: int,
+    password: str,
+    workers: int,
+    block_size: int,
+    seed: int,
+    report_every: float = 5.0,
+) -> Tuple[int, int, float]:
+    """Generate and write the rows; returns (users, contacts, seconds)."""
+    hashed_password = get_password_hash(password)
+    with engine.connect() as connection:
+        first_id = (connection.scalar(select(func.max(User.id))) or 0) + 1
+        existing_contacts = connection.scalar(select(func.count()).select_from(Contact))
+
+    start = time.perf_counter()
+    last_report = start
+    written_users = written_contacts = 0
+    raw = engine.raw_connection()
+    try:
+        if engine.dialect.name == "postgresql":
+            writer = PostgresWriter(raw.driver_connection)
+        elif engine.dialect.name == "sqlite":
+            rebuild_index = users * contacts_per_user >= existing_contacts
+            writer = SQLiteWriter(raw.driver_connection, rebuild_index)
+        else:
+            writer = MultiRowInsertWriter(raw.driver_connection, engine.dialect.paramstyle)
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending: Deque[Future] = deque()
+            offsets = iter(range(0, users, block_size))
+
+            def submit() -> None:
+                offset = next(offsets, None)
+                if offset is not None:
+                    count = min(block_size, users - offset)
+                    pending.append(pool.submit(
+                        generate_block, seed, first_id + offset, count, contacts_per_user, hashed_password
+                    ))
+
+            # A bounded window of blocks in flight keeps memory flat
+            for _ in range(2 * workers):
+                submit()
+            while pending:
+                block = pending.popleft().result()
+                submit()
+                writer.write(USER_TABLE, USER_COLUMNS, block.users)
+                writer.write(CONTACT_TABLE, CONTACT_COLUMNS, block.contacts)
+                written_users += len(block.users)
+                written_contacts += len(block.contacts)
+
+                now = time.perf_counter()
+                if now - last_report >= report_every:
+                    last_report = now
+                    rows = written_users + written_contacts
+                    print(f"  {written_users} users, {written_contacts} contacts "
+                          f"({rows / (now - start):,.0f} rows/s)", flush=True)
+
+        writer.finish()
+        raw.commit()
+    except BaseException:
+        raw.rollback()
+        raise
+    finally:
+        raw.close()
+    return written_users, written_contacts, time.perf_counter() - start
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Seed users and contacts."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--contacts-per-user", type=int, default=10, help="Average; each user gets 0 to twice as many")
+    parser.add_argument("--password", default="password123", help="Password of every seeded user")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Generator processes")
+    parser.add_argument("--block-size", type=int, default=5000, help="Users per generated block")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    print(f"Seeding {args.users} users with ~{args.contacts_per_user} contacts each...")
+    users, contacts, elapsed = seed(
+        args.users, args.contacts_per_user, args.password, args.workers, args.block_size, args.seed
+    )
+    rows = users + contacts
+    print(f"Seeded {users} users and {contacts} contacts in {elapsed:.1f}s "
+          f"({rows / elapsed:,.0f} rows/s)")
+
+if __name__ == "__main__":
+    main()
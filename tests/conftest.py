@@ -0,0 +1,170 @@
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+# Settings are read at import time, so the test environment has to be in
+# place before anything from the app package is imported.
+_TEST_DIR = tempfile.mkdtemp(prefix="fastapi-template-tests-")
+os.environ["DB_TYPE"] = "sqlite"
+# TEST_DB_NAME=:memory: runs the suite on an in-memory database instead
+os.environ["DB_NAME"] = os.environ.get("TEST_DB_NAME") or os.path.join(_TEST_DIR, "test.db")
+os.environ.setdefault("PROJECT_NAME", "FastAPI Template Tests")
+os.environ.setdefault("API_V1_PREFIX", "/api/v1")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-at-least-32-characters")
+os.environ.setdefault("ALGORITHM", "HS256")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+os.environ.setdefault("BACKEND_CORS_ORIGINS", '["http://localhost:3000"]')
+os.environ.setdefault("INITIAL_SUPERUSER_EMAIL", "admin@example.com")
+os.environ.setdefault("INITIAL_SUPERUSER_PASSWORD", "adminpassword")
+# The suite logs in far more often than any rate limit allows
+os.environ.setdefault("RATE_LIMIT_PER_MINUTE", "0")
+os.environ.setdefault("RATE_LIMIT_LOGIN_PER_MINUTE", "0")
+os.environ.setdefault("RATE_LIMIT_REGISTER_PER_MINUTE", "0")
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import delete, event, select  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.core.query_counter import QueryStats, current_query_stats  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.audit import UserAudit  # noqa: E402
+from app.models.contact import Contact  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.user import UserCreate, UserCreateInternal  # noqa: E402
+from app.services import create_user  # noqa: E402
+from app.services.audit import audit_writer  # noqa: E402
+from app.services.contact import invalidate_user_contacts  # noqa: E402
+from app.services.user import user_cache  # noqa: E402
+
+API = os.environ["API_V1_PREFIX"]
+
+Base.metadata.create_all(bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def _clean_tables():
+    yield
+    audit_writer.flush()
+    with SessionLocal() as db:
+        user_ids = db.scalars(select(User.id)).all()
+        db.execute(delete(UserAudit))
+        db.execute(delete(Contact))
+        db.execute(delete(User))
+        db.commit()
+    # SQLite reuses the ids of deleted rows
+    user_cache.clear()
+    for user_id in user_ids:
+        invalidate_user_contacts(user_id)
+
+
+@pytest.fixture
+def db():
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def user(db):
+    return create_user(db, UserCreate(
+        email="test@example.com",
+        full_name="Test User",
+        password="testpassword",
+    ))
+
+
+@pytest.fixture
+def superuser(db):
+    return create_user(db, UserCreateInternal(
+        email="admin@example.com",
+        full_name="System Admin",
+        password="adminpassword",
+        is_superuser=True,
+    ))
+
+
+def login(client: TestClient, email: str, password: str) -> dict:
+    response = client.post(
+        f"{API}/users/login",
+        data={"username": email, "password": password},
+    )
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def auth_headers(client, user):
+    return login(client, "test@example.com", "testpassword")
+
+
+@pytest.fixture
+def superuser_headers(client, superuser):
+    return login(client, "admin@example.com", "adminpassword")
+
+
+@pytest.fixture
+def assert_max_queries():
+    """
+    Query budget: `with assert_max_queries(3): client.get(...)` fails when
+    the block (requests included) runs more than 3 SQL statements.
+    """
+    @contextmanager
+    def check(n: int):
+        stats = QueryStats()
+
+        # Statements of any request, including those handled on a TestClient's
+        # event loop thread; background work such as the audit writer is left out
+        def count(conn, cursor, statement, parameters, context, executemany):
+            if current_query_stats() is not None:
+                stats.add(statement, 0.0)
+
+        event.listen(Engine, "after_cursor_execute", count)
+        try:
+            yield stats
+        finally:
+            event.remove(Engine, "after_cursor_execute", count)
+        statements = "\n".join(f"{count}x {sql}" for sql, count in stats.statements.items())
+        assert stats.count <= n, f"Expected at most {n} queries, got {stats.count}:\n{statements}"
+
+    return check
+
+
+class FakeRedis:
+    """In-memory stand-in for a Redis server, with redis-py's bytes semantics."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def set(self, key, value, px=None):
+        expires_at = time.monotonic() + px / 1000 if px else None
+        self.data[key] = (value if isinstance(value, bytes) else str(value).encode(), expires_at)
+
+    def incr(self, key):
+        value = int(self.get(key) or 0) + 1
+        expires_at = self.data.get(key, (None, None))[1]
+        self.data[key] = (str(value).encode(), expires_at)
+        return value
+
+    def pexpire(self, key, milliseconds):
+        if key in self.data:
+            self.data[key] = (self.data[key][0], time.monotonic() + milliseconds / 1000)
+
+
+@pytest.fixture
+def fake_redis():
+    return FakeRedis()
@@ -0,0 +1,86 @@
+import threading
+
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.main import app
+from app.models.audit import UserAudit
+from app.services.audit import AuditEvent, AuditWriter, audit_writer
+
+client = TestClient(app)
+
+
+def _audit_rows(db):
+    return db.scalars(select(UserAudit).order_by(UserAudit.id)).all()
+
+
+def test_user_writes_are_audited(db):
+    response = client.post("/api/v1/users/register", json={
+        "email": "audited@example.com", "full_name": "Before", "password": "secretpassword"
+    })
+    assert response.status_code == 201
+    user_id = response.json()["id"]
+    login = client.post("/api/v1/users/login", data={
+        "username": "audited@example.com", "password": "secretpassword"
+    })
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    client.put("/api/v1/users/me", json={"full_name": "After"}, headers=headers)
+
+    audit_writer.flush()
+    insert, update = _audit_rows(db)
+    assert (insert.user_id, insert.cod_evento, insert.old_data) == (user_id, "insert", None)
+    assert insert.new_data["email"] == "audited@example.com"
+    assert "hashed_password" not in insert.new_data
+    assert insert.utente_aggiornamento == "audited@example.com"
+    assert update.cod_evento == "update"
+    assert (update.old_data["full_name"], update.new_data["full_name"]) == ("Before", "After")
+    assert insert.data_aggiornamento is not None
+
+
+def test_writer_batches_inserts(db):
+    writer = AuditWriter(batch_size=10, queue_size=100, queue_timeout=1)
+    for i in range(25):
+        assert writer.emit(AuditEvent(i, "insert", None, {"n": i}, None))
+    writer.close()
+
+    stats = writer.stats()
+    assert stats["written"] == 25
+    assert 3 <= stats["batches"] <= 25
+    assert stats["queue_depth"] == 0
+    assert [row.new_data["n"] for row in _audit_rows(db)] == list(range(25))
+
+
+def test_writer_backpressure_drops_when_full(db):
+    entered, release = threading.Event(), threading.Event()
+
+    def slow_session():
+        entered.set()
+        release.wait()
+        return SessionLocal()
+
+    writer = AuditWriter(batch_size=10, queue_size=1, queue_timeout=0.01, session_factory=slow_session)
+    assert writer.emit(AuditEvent(1, "insert", None, None, None))
+    entered.wait(timeout=5)  # The writer is now stuck on the first batch
+    assert writer.emit(AuditEvent(2, "insert", None, None, None))
+    assert not writer.emit(AuditEvent(3, "insert", None, None, None))
+    release.set()
+    writer.close()
+
+    assert writer.stats()["dropped"] == 1
+    assert [row.user_id for row in _audit_rows(db)] == [1, 2]
+
+
+def test_audit_failure_does_not_fail_committed_write(db, monkeypatch):
+    async def broken_emit(event):
+        raise RuntimeError("audit queue unavailable")
+
+    monkeypatch.setattr(audit_writer, "emit_async", broken_emit)
+    response = client.post("/api/v1/users/register", json={
+        "email": "unaudited@example.com", "full_name": "Kept", "password": "secretpassword"
+    })
+    assert response.status_code == 201
+    login = client.post("/api/v1/users/login", data={
+        "username": "unaudited@example.com", "password": "secretpassword"
+    })
+    assert login.status_code == 200
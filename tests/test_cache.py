@@ -0,0 +1,134 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.cache import (
+    CachedResponse, LocalCacheBackend, RedisCacheBackend, ResponseCache, TTLCache
+)
+from app.main import app
+from app.schemas.contact import ContactCreate
+from app.schemas.user import UserUpdate
+from app.services import create_contact, update_user
+from app.services.contact import contact_list_cache
+from app.services.user import user_cache
+
+client = TestClient(app)
+
+
+def test_ttl_cache_lru_eviction_and_counters():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts "b", the least recently used
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_expiry_and_generation():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+    generation = cache.generation
+    cache.invalidate("other")
+    assert not cache.set("a", 1, generation=generation)
+    assert cache.get("a") is None
+
+
+def test_current_user_is_cached_and_invalidated(db, user, auth_headers):
+    user_cache.clear()
+    client.get("/api/v1/users/me", headers=auth_headers)
+    misses = user_cache.misses
+    response = client.get("/api/v1/users/me", headers=auth_headers)
+    assert response.json()["full_name"] == "Test User"
+    assert user_cache.misses == misses
+    assert user_cache.get(user.id) is not None
+
+    update_user(db, user, UserUpdate(full_name="Changed"))
+    assert user_cache.get(user.id) is None
+    response = client.get("/api/v1/users/me", headers=auth_headers)
+    assert response.json()["full_name"] == "Changed"
+
+
+@pytest.mark.parametrize("backend_name", ["local", "redis"])
+def test_response_cache_generations(backend_name, fake_redis):
+    if backend_name == "local":
+        backend = LocalCacheBackend(100, 60)
+    else:
+        backend = RedisCacheBackend(fake_redis)
+    cache = ResponseCache("test", backend, ttl=60)
+    params = {"limit": 10, "search": None}
+
+    assert cache.get(1, params) == (None, 0)
+    cache.set(1, params, 0, CachedResponse(body=b'{"items":[]}', etag='W/"a"'))
+    assert cache.get(1, params) == (CachedResponse(body=b'{"items":[]}', etag='W/"a"'), 0)
+    assert cache.get(1, {"search": None, "limit": 10})[0] is not None  # key order doesn't matter
+    assert cache.get(2, params) == (None, 0)  # scoped per user
+
+    # A response loaded before an invalidation is never served after it
+    _, generation = cache.get(1, {"limit": 20})
+    cache.invalidate(1)
+    cache.set(1, {"limit": 20}, generation, CachedResponse(body=b"stale", etag='W/"b"'))
+    assert cache.get(1, {"limit": 20}) == (None, 1)
+    assert cache.get(1, params) == (None, 1)
+    assert cache.stats()["hits"] == 2
+
+
+def test_local_backend_counters_are_bounded():
+    backend = LocalCacheBackend(2, 60)
+    cache = ResponseCache("test", backend, ttl=60)
+    cache.invalidate(1)
+    cache.set(1, {}, 1, CachedResponse(body=b"old", etag='W/"a"'))
+    cache.invalidate(2)
+    cache.invalidate(3)  # evicts the counter of scope 1
+    assert len(backend._counters) == 2
+    # Scope 1 comes back past its old generation, not at 0 or 1
+    response, generation = cache.get(1, {})
+    assert response is None and generation > 1
+
+
+def test_response_cache_survives_backend_errors(fake_redis, monkeypatch):
+    def down(key):
+        raise ConnectionError("down")
+
+    monkeypatch.setattr(fake_redis, "get", down)
+    cache = ResponseCache("test", RedisCacheBackend(fake_redis), ttl=60)
+    assert cache.get(1, {}) == (None, None)
+    cache.set(1, {}, None, CachedResponse(body=b"", etag=""))
+    assert cache.stats()["errors"] == 1
+
+
+def test_contact_listing_cache_invalidated_on_writes(db, user, auth_headers):
+    url = "/api/v1/contacts/"
+    create_contact(db, user.id, ContactCreate(first_name="Ada", last_name="Lovelace"))
+    first = client.get(url, params={"search": "Ada"}, headers=auth_headers)
+    hits = contact_list_cache.hits
+
+    # Same normalized query: served from the cache
+    again = client.get(url, params={"search": "ADA"}, headers=auth_headers)
+    assert contact_list_cache.hits == hits + 1
+    assert again.content == first.content
+    assert again.headers["etag"] == first.headers["etag"]
+    assert client.get(url, params={"search": "ada"},
+                      headers={**auth_headers, "If-None-Match": first.headers["etag"]}).status_code == 304
+
+    contact_id = first.json()["items"][0]["id"]
+    writes = [
+        lambda: create_contact(db, user.id, ContactCreate(first_name="Adam", last_name="Smith")),
+        lambda: client.put(f"{url}{contact_id}", json={"phone": "555"}, headers=auth_headers),
+        lambda: client.patch(f"{url}bulk", json={"search": "ada", "changes": {"phone": "556"}}, headers=auth_headers),
+        lambda: client.post(f"{url}import", content=b"first_name,last_name\nAdaline,X\n",
+                            headers={**auth_headers, "Content-Type": "text/csv"}),
+        lambda: client.delete(f"{url}{contact_id}", headers=auth_headers),
+    ]
+    previous = first.json()
+    for write in writes:
+        write()
+        body = client.get(url, params={"search": "ada"}, headers=auth_headers).json()
+        assert body != previous
+        previous = body
@@ -0,0 +1,110 @@
+"""
+Cold start: a fresh interpreter importing the app and running its startup,
+like a new worker. The structural checks always run; the wall-clock
+budgets only with COLD_START_BUDGETS=1 (on a quiet machine), and can be
+raised with COLD_START_*_BUDGET_MS.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from fastapi import FastAPI
+
+from app.core.openapi import prebuilt_openapi
+from app.main import create_application
+from scripts.export_openapi import main as export_openapi
+
+IMPORT_BUDGET_MS = float(os.environ.get("COLD_START_IMPORT_BUDGET_MS", 3000))
+# Time spent in the app's own modules, dependencies excluded: the part we control
+APP_IMPORT_BUDGET_MS = float(os.environ.get("COLD_START_APP_IMPORT_BUDGET_MS", 600))
+STARTUP_BUDGET_MS = float(os.environ.get("COLD_START_STARTUP_BUDGET_MS", 500))
+
+SCRIPT = """
+import json, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+from app.core import database
+engines_at_import = database.engines_ready()
+import fastapi.applications
+generated = []
+get_openapi = fastapi.applications.get_openapi
+fastapi.applications.get_openapi = lambda **kwargs: generated.append(1) or get_openapi(**kwargs)
+from fastapi.testclient import TestClient
+client = TestClient(app.main.app)
+before_startup = time.perf_counter()
+with client:
+    started = time.perf_counter()
+    openapi = client.get(app.main.app.openapi_url).status_code
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "startup_ms": (started - before_startup) * 1000,
+    "engines_at_import": engines_at_import,
+    "openapi": openapi,
+    "openapi_generated": bool(generated),
+}))
+"""
+
+
+def _cold_start(env=None) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", SCRIPT],
+        capture_output=True, text=True, env={**os.environ, "LOG_LEVEL": "WARNING", **(env or {})}, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    # "import time: self [us] | cumulative | imported package" on stderr
+    report["app_import_ms"] = sum(
+        int(line.split("|")[0].split(":")[1]) / 1000
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:") and line.split("|")[2].strip().split(".")[0] == "app"
+    )
+    return report
+
+
+def test_cold_start_is_lazy_and_serves_prebuilt_schema(tmp_path):
+    path = tmp_path / "openapi.json"
+    export_openapi([str(path)])
+    report = _cold_start({"OPENAPI_SCHEMA_FILE": str(path)})
+
+    assert not report["engines_at_import"], "Importing the app must not create the database engines"
+    assert report["openapi"] == 200
+    assert not report["openapi_generated"], "The OpenAPI schema must be served from the exported file"
+
+
+@pytest.mark.skipif(os.environ.get("COLD_START_BUDGETS") != "1", reason="Timing budgets need COLD_START_BUDGETS=1")
+def test_cold_start_within_budget():
+    # Best of two runs, to ride out a busy machine
+    runs = [_cold_start() for _ in range(2)]
+    report = {key: min(run[key] for run in runs) for key in ("import_ms", "app_import_ms", "startup_ms")}
+
+    assert report["import_ms"] <= IMPORT_BUDGET_MS, report
+    assert report["app_import_ms"] <= APP_IMPORT_BUDGET_MS, report
+    assert report["startup_ms"] <= STARTUP_BUDGET_MS, report
+
+
+def test_prebuilt_openapi_schema(tmp_path):
+    path = tmp_path / "openapi.json"
+    export_openapi([str(path)])
+    schema = json.loads(path.read_text())
+    assert schema == FastAPI.openapi(create_application())
+
+    # Served from the file, not regenerated
+    schema["info"]["description"] = "Prebuilt"
+    path.write_text(json.dumps(schema))
+    app = create_application()
+    app.openapi = prebuilt_openapi(app, str(path))
+    assert app.openapi()["info"]["description"] == "Prebuilt"
+
+
+def test_prebuilt_openapi_schema_falls_back_to_generating(tmp_path):
+    old_version, other_title = tmp_path / "old.json", tmp_path / "other.json"
+    old_version.write_text(json.dumps({"openapi": "3.1.0", "info": {"title": "Old", "version": "0.1.0"}, "paths": {}}))
+    info = {"title": "Another API", "version": create_application().version}
+    other_title.write_text(json.dumps({"openapi": "3.1.0", "info": info, "paths": {}}))
+    for source in (old_version, other_title, tmp_path / "missing.json"):
+        app = create_application()
+        app.openapi = prebuilt_openapi(app, str(source))
+        assert app.openapi()["paths"]
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+
+client = TestClient(app)
+
+CONTACTS = "/api/v1/contacts/"
+
+
+def _create(headers, **fields):
+    response = client.post(CONTACTS, json={"first_name": "Ada", "last_name": "Lovelace", **fields}, headers=headers)
+    assert response.status_code == 201
+    return response.json()
+
+
+def _revalidate(url, headers, etag, **params):
+    return client.get(url, params=params, headers={**headers, "If-None-Match": etag})
+
+
+def test_contact_etag_and_last_modified(auth_headers):
+    contact = _create(auth_headers)
+    url = f"{CONTACTS}{contact['id']}"
+
+    response = client.get(url, headers=auth_headers)
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+    assert response.headers["cache-control"] == "private, no-cache"
+
+    response = _revalidate(url, auth_headers, etag)
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+    future = format_datetime(datetime.now(timezone.utc) + timedelta(minutes=1), usegmt=True)
+    assert client.get(url, headers={**auth_headers, "If-Modified-Since": future}).status_code == 304
+    past = format_datetime(datetime.now(timezone.utc) - timedelta(days=1), usegmt=True)
+    assert client.get(url, headers={**auth_headers, "If-Modified-Since": past}).status_code == 200
+
+    # A write made right away still produces a new ETag
+    client.put(url, json={"phone": "555-0100"}, headers=auth_headers)
+    response = _revalidate(url, auth_headers, etag)
+    assert response.status_code == 200
+    assert response.json()["phone"] == "555-0100"
+    assert response.headers["etag"] != etag
+
+
+def test_contact_list_etag_follows_every_change(auth_headers, monkeypatch):
+    first = _create(auth_headers)
+    etag = client.get(CONTACTS, headers=auth_headers).headers["etag"]
+    assert _revalidate(CONTACTS, auth_headers, etag).status_code == 304
+    # The ETag depends on the query
+    assert _revalidate(CONTACTS, auth_headers, etag, limit=1).status_code == 200
+
+    def changed(action):
+        nonlocal etag
+        action()
+        response = _revalidate(CONTACTS, auth_headers, etag)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+
+    second = _create(auth_headers, first_name="Grace")
+    changed(lambda: None)
+    changed(lambda: client.put(f"{CONTACTS}{first['id']}", json={"last_name": "Byron"}, headers=auth_headers))
+    changed(lambda: client.delete(f"{CONTACTS}{second['id']}", headers=auth_headers))
+
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+    assert client.get(CONTACTS, headers=auth_headers).headers["etag"] == etag
+    assert _revalidate(CONTACTS, auth_headers, etag).status_code == 304
+
+
+def test_users_me_conditional_get(auth_headers):
+    response = client.get("/api/v1/users/me", headers=auth_headers)
+    etag = response.headers["etag"]
+    assert response.headers["last-modified"]
+    assert _revalidate("/api/v1/users/me", auth_headers, f'"other", {etag}').status_code == 304
+
+    client.put("/api/v1/users/me", json={"full_name": "Renamed"}, headers=auth_headers)
+    response = _revalidate("/api/v1/users/me", auth_headers, etag)
+    assert response.status_code == 200
+    assert response.json()["full_name"] == "Renamed"
@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.schemas.contact import ContactCreate
+from app.services import contact as contact_service
+from app.services.contact_export import export_contacts
+
+client = TestClient(app)
+
+EXPORT = "/api/v1/contacts/export"
+
+
+@pytest.fixture
+def contacts(db, user):
+    return [
+        contact_service.create_contact(db, user.id, ContactCreate(
+            first_name=f"Contact{i}", last_name="Exported, \"quoted\"",
+            email=f"contact{i}@example.com" if i % 2 else None
+        ))
+        for i in range(5)
+    ]
+
+
+def test_export_csv(contacts, auth_headers):
+    response = client.get(EXPORT, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="contacts.csv"' in response.headers["content-disposition"]
+
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(row["id"]) for row in rows] == [c.id for c in contacts]
+    assert rows[0]["last_name"] == 'Exported, "quoted"'
+    assert rows[0]["email"] == ""
+    assert rows[1]["email"] == "contact1@example.com"
+
+
+def test_export_ndjson_with_search(contacts, auth_headers):
+    response = client.get(EXPORT, params={"format": "ndjson", "search": "contact3@"}, headers=auth_headers)
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [contacts[3].id]
+    assert rows[0]["created_at"]
+
+
+def test_export_streams_in_batches(db, user, contacts, monkeypatch):
+    monkeypatch.setattr(settings, "CONTACT_EXPORT_BATCH_SIZE", 2)
+    chunks = list(export_contacts(db, user.id, "ndjson"))
+    # Header chunk (empty for NDJSON) then one chunk per batch
+    assert [chunk.count("\n") for chunk in chunks] == [0, 2, 2, 1]
+
+
+def test_export_only_own_contacts(contacts, superuser_headers):
+    response = client.get(EXPORT, headers=superuser_headers)
+    assert response.text.splitlines() == ["id,first_name,last_name,email,phone,created_at,updated_at"]
@@ -0,0 +1,86 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.services import contact as contact_service
+from app.services.contact_import import ContactRecordParser, import_contacts
+
+client = TestClient(app)
+
+IMPORT = "/api/v1/contacts/import"
+
+CSV_BODY = (
+    '﻿First_Name,last_name,email,phone\r\n'
+    'Ada,Lovelace,ada@example.com,555-0100\r\n'
+    '"Grace","Hopper ""Amazing""",,\r\n'
+    'Alan,"Turing\nthe second",not-an-email,\r\n'
+    ',Nameless,,\r\n'
+    'Edsger,Dijkstra,,,extra\r\n'
+    '\r\n'
+    'Barbara,Liskov,,555-0199'
+).encode()
+
+
+def _post(body, headers, content_type="text/csv", **params):
+    return client.post(IMPORT, content=body, params=params,
+                       headers={**headers, "Content-Type": content_type})
+
+
+def test_import_csv_reports_rejected_rows(auth_headers, db, user):
+    response = _post(CSV_BODY, auth_headers)
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["imported"] == 3
+    assert body["failed"] == 3
+    assert [e["line"] for e in body["errors"]] == [4, 6, 7]
+    assert body["errors"][0]["error"].startswith("email:")
+    assert body["errors"][1]["error"].startswith("first_name:")
+    assert "Expected 4 fields" in body["errors"][2]["error"]
+
+    contacts = contact_service.get_user_contacts(db, user.id)
+    assert [(c.first_name, c.last_name) for c in contacts] == [
+        ("Ada", "Lovelace"), ("Grace", 'Hopper "Amazing"'), ("Barbara", "Liskov")
+    ]
+    assert contacts[1].email is None
+
+
+def test_import_ndjson_in_batches(auth_headers, db, user, monkeypatch):
+    monkeypatch.setattr(settings, "CONTACT_IMPORT_BATCH_SIZE", 2)
+    monkeypatch.setattr(settings, "CONTACT_IMPORT_MAX_ERRORS", 1)
+    lines = [json.dumps({"first_name": f"Contact{i}", "last_name": "Bulk"}) for i in range(5)]
+    lines[1:1] = ["[1, 2]", "{broken", ""]
+    response = _post("\n".join(lines).encode(), auth_headers, content_type="application/x-ndjson")
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert body["imported"] == 5
+    assert body["failed"] == 2
+    assert body["errors"] == [{"line": 2, "error": "Expected a JSON object"}]
+    assert contact_service.get_total_contacts(db, user.id) == 5
+
+
+def test_parser_is_independent_of_chunk_boundaries():
+    whole = ContactRecordParser("csv")
+    expected = list(whole.feed(CSV_BODY)) + list(whole.close())
+
+    byte_by_byte = ContactRecordParser("csv")
+    records = []
+    for i in range(len(CSV_BODY)):
+        records.extend(byte_by_byte.feed(CSV_BODY[i:i + 1]))
+    records.extend(byte_by_byte.close())
+    assert records == expected
+
+
+def test_sync_import(db, user):
+    chunks = [b"first_name,last_name\n", b"Ada,Love", b"lace\n"]
+    report = import_contacts(db, user.id, chunks, "csv")
+    assert (report.imported, report.failed) == (1, 0)
+    assert contact_service.get_user_contacts(db, user.id)[0].last_name == "Lovelace"
+
+
+def test_import_rejects_unreadable_bodies(auth_headers):
+    assert _post(b"{}", auth_headers, content_type="application/json").status_code == 415
+    assert _post(b"name,phone\nAda,1\n", auth_headers).status_code == 400
+    assert _post(b"\xff\xfe", auth_headers, format="csv").status_code == 400
+    assert _post(b'first_name,last_name\nAda,"' + b"x" * 70000, auth_headers).status_code == 400
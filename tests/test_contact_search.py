@@ -0,0 +1,102 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.main import app
+from app.models.contact import Contact
+from app.schemas.contact import ContactCreate, ContactUpdate
+from app.services import contact as contact_service
+
+client = TestClient(app)
+
+CONTACTS = "/api/v1/contacts/"
+
+
+@pytest.fixture
+def contacts(db, user):
+    rows = [
+        ("Ada", "Lovelace", "ada@example.com", "555-0100"),
+        ("Grace", "Hopper", "grace@navy.mil", "555-0199"),
+        ("Alan", "Turing", "alan@example.org", None),
+        ("Adele", "Goldberg", None, "555-0142"),
+    ]
+    return [
+        contact_service.create_contact(db, user.id, ContactCreate(
+            first_name=first, last_name=last, email=email, phone=phone
+        ))
+        for first, last, email, phone in rows
+    ]
+
+
+@pytest.mark.parametrize("backend", ["auto", "like"])
+@pytest.mark.parametrize("term, expected", [
+    ("example", {"Ada", "Alan"}),
+    ("EXAMPLE.ORG", {"Alan"}),
+    ("555-01", {"Ada", "Grace", "Adele"}),
+    ("ad", {"Ada", "Adele"}),  # shorter than a trigram: ILIKE fallback
+    ("nobody", set()),
+])
+def test_search_matches_substrings_on_every_backend(db, user, contacts, monkeypatch, backend, term, expected):
+    monkeypatch.setattr(settings, "CONTACT_SEARCH_BACKEND", backend)
+    found = contact_service.get_user_contacts(db, user.id, search=term)
+    assert {c.first_name for c in found} == expected
+    assert contact_service.get_total_contacts(db, user.id, search=term) == len(expected)
+
+
+def test_search_index_follows_updates_and_deletes(db, user, contacts):
+    ada = contacts[0]
+    contact_service.update_contact(db, ada, ContactUpdate(last_name="Byron"))
+    assert contact_service.get_user_contacts(db, user.id, search="lovelace") == []
+    assert [c.id for c in contact_service.get_user_contacts(db, user.id, search="byron")] == [ada.id]
+
+    contact_service.delete_contact(db, ada)
+    assert contact_service.get_user_contacts(db, user.id, search="byron") == []
+
+
+def test_search_only_matches_the_users_contacts(db, user, superuser, contacts):
+    contact_service.create_contact(db, superuser.id, ContactCreate(first_name="Ada", last_name="Byron"))
+    assert [c.last_name for c in contact_service.get_user_contacts(db, user.id, search="ada")] == ["Lovelace"]
+    assert contact_service.update_contacts(db, user.id, ContactUpdate(phone="555-0000"), search="ada") == 1
+    assert contact_service.delete_contacts(db, superuser.id, search="ada") == 1
+
+
+def _query_plan(db, statement):
+    compiled = statement.compile(db.get_bind())
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).all()
+    details = {row[0]: row[3] for row in rows}
+    return [(details.get(row[1], ""), row[3]) for row in rows]  # (parent, step)
+
+
+@pytest.mark.skipif(settings.DB_TYPE != "sqlite", reason="SQLite FTS5 only")
+def test_full_text_match_runs_once(db, user, contacts):
+    listing, _ = contact_service._contacts_query(user.id, "lovelace")
+    bulk = select(Contact.id).where(contact_service._bulk_condition(user.id, None, "lovelace"))
+    for statement in (listing, bulk):
+        plan = _query_plan(db, statement)
+        fts_parents = {parent for parent, step in plan if "t_contact_fts VIRTUAL TABLE" in step}
+        assert fts_parents, plan
+        for fts_parent in fts_parents:
+            # Nested loops are listed outermost first: MATCH must drive its
+            # subquery, not run once for each of the user's contacts
+            first_step = next(step for parent, step in plan if parent == fts_parent)
+            assert "t_contact_fts VIRTUAL TABLE" in first_step, plan
+
+
+def test_search_cursor_pagination_is_stable(contacts, auth_headers):
+    seen = []
+    params = {"search": "555", "limit": 1}
+    while True:
+        body = client.get(CONTACTS, params=params, headers=auth_headers).json()
+        assert body["total"] == 3
+        seen.extend(item["id"] for item in body["items"])
+        if body["next_cursor"] is None:
+            break
+        params = {**params, "cursor": body["next_cursor"]}
+    assert sorted(seen) == sorted(c.id for c in contacts if c.phone)
+
+    # A cursor from a ranked search doesn't apply to a plain listing
+    first = client.get(CONTACTS, params={"search": "555", "limit": 1}, headers=auth_headers).json()
+    response = client.get(CONTACTS, params={"cursor": first["next_cursor"]}, headers=auth_headers)
+    assert response.status_code == 400
@@ -0,0 +1,141 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.database import AsyncSessionLocal
+from app.main import app
+from app.schemas.contact import ContactCreate
+from app.services import contact as contact_service
+
+client = TestClient(app)
+
+CONTACTS = "/api/v1/contacts/"
+
+
+def _create(headers, **fields):
+    payload = {"first_name": "Ada", "last_name": "Lovelace", **fields}
+    response = client.post(CONTACTS, json=payload, headers=headers)
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_contact_crud(auth_headers):
+    contact = _create(auth_headers, email="ada@example.com")
+
+    response = client.get(f"{CONTACTS}{contact['id']}", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["email"] == "ada@example.com"
+
+    response = client.put(f"{CONTACTS}{contact['id']}", json={"phone": "555-0100"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["phone"] == "555-0100"
+    assert response.json()["first_name"] == "Ada"
+
+    response = client.delete(f"{CONTACTS}{contact['id']}", headers=auth_headers)
+    assert response.status_code == 204
+    response = client.get(f"{CONTACTS}{contact['id']}", headers=auth_headers)
+    assert response.status_code == 404
+
+
+def test_list_contacts_with_search(auth_headers):
+    _create(auth_headers, first_name="Grace", last_name="Hopper")
+    _create(auth_headers, first_name="Alan", last_name="Turing")
+
+    response = client.get(CONTACTS, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["total"] == 2
+
+    response = client.get(CONTACTS, params={"search": "hop"}, headers=auth_headers)
+    body = response.json()
+    assert body["total"] == 1
+    assert body["items"][0]["last_name"] == "Hopper"
+
+
+def test_contacts_require_authentication():
+    assert client.get(CONTACTS).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_async_contact_services(user):
+    async with AsyncSessionLocal() as db:
+        contact = await contact_service.create_contact_async(
+            db, user.id, ContactCreate(first_name="Ada", last_name="Lovelace")
+        )
+        contacts = await contact_service.get_user_contacts_async(db, user.id, search="love")
+        assert [c.id for c in contacts] == [contact.id]
+        assert await contact_service.get_total_contacts_async(db, user.id) == 1
+
+
+def test_list_contacts_cursor_pagination(auth_headers):
+    created = [_create(auth_headers, first_name=f"Contact{i}")["id"] for i in range(5)]
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        body = client.get(CONTACTS, params=params, headers=auth_headers).json()
+        seen.extend(item["id"] for item in body["items"])
+        assert body["total"] == 5
+        if body["next_cursor"] is None:
+            break
+        params = {"limit": 2, "cursor": body["next_cursor"]}
+    assert seen == sorted(created)
+
+
+def test_list_contacts_invalid_cursor(auth_headers):
+    response = client.get(CONTACTS, params={"cursor": "not-a-cursor"}, headers=auth_headers)
+    assert response.status_code == 400
+
+
+def test_list_contacts_total_in_single_statement(auth_headers):
+    for i in range(3):
+        _create(auth_headers, first_name=f"Contact{i}")
+
+    body = client.get(CONTACTS, params={"limit": 2, "skip": 2}, headers=auth_headers).json()
+    assert body["total"] == 3
+    assert len(body["items"]) == 1
+
+    # Past the end: no row carries the window count
+    body = client.get(CONTACTS, params={"skip": 10}, headers=auth_headers).json()
+    assert body["total"] == 3
+    assert body["items"] == []
+
+    body = client.get(CONTACTS, params={"include_total": "false"}, headers=auth_headers).json()
+    assert body["total"] is None
+    assert len(body["items"]) == 3
+
+
+def test_bulk_update_by_ids(auth_headers, superuser_headers):
+    mine = [_create(auth_headers, first_name=f"Contact{i}")["id"] for i in range(3)]
+    theirs = _create(superuser_headers)["id"]
+
+    response = client.patch(f"{CONTACTS}bulk", json={
+        "ids": mine[:2] + [theirs], "changes": {"phone": "555-0100"}
+    }, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert response.json() == {"affected": 2}
+
+    phones = {c["id"]: c["phone"] for c in client.get(CONTACTS, headers=auth_headers).json()["items"]}
+    assert phones == {mine[0]: "555-0100", mine[1]: "555-0100", mine[2]: None}
+    assert client.get(f"{CONTACTS}{theirs}", headers=superuser_headers).json()["phone"] is None
+
+
+def test_bulk_delete_by_search(auth_headers, superuser_headers):
+    _create(auth_headers, first_name="Grace", last_name="Hopper")
+    keep = _create(auth_headers, first_name="Alan", last_name="Turing")
+    _create(auth_headers, first_name="Ada", last_name="Hopperton")
+    _create(superuser_headers, first_name="Grace", last_name="Hopper")
+
+    response = client.post(f"{CONTACTS}bulk-delete", json={"search": "hopper"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert response.json() == {"affected": 2}
+    assert [c["id"] for c in client.get(CONTACTS, headers=auth_headers).json()["items"]] == [keep["id"]]
+    assert client.get(CONTACTS, headers=superuser_headers).json()["total"] == 1
+
+
+def test_bulk_operations_validate_selection(auth_headers):
+    contact = _create(auth_headers)
+    bulk_delete = f"{CONTACTS}bulk-delete"
+    assert client.post(bulk_delete, json={}, headers=auth_headers).status_code == 422
+    assert client.post(bulk_delete, json={"ids": [1], "search": "x"}, headers=auth_headers).status_code == 422
+    assert client.post(bulk_delete, json={"ids": []}, headers=auth_headers).status_code == 422
+    response = client.patch(f"{CONTACTS}bulk", json={"ids": [contact["id"]], "changes": {}}, headers=auth_headers)
+    assert response.status_code == 400
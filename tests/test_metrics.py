@@ -0,0 +1,79 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.metrics import Counter, Histogram, Metric, MetricsRegistry
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_exposition_format():
+    registry = MetricsRegistry()
+    requests = Counter("jobs", "Jobs run", ("queue",), registry=registry)
+    latency = Histogram("job_seconds", "Job time", buckets=(0.1, 1), registry=registry)
+    requests.labels('say "hi"\n').inc()
+    requests.labels("default").inc(2)
+    for value in (0.05, 0.5, 0.5, 3):
+        latency.observe(value)
+
+    assert registry.render().splitlines() == [
+        "# HELP jobs Jobs run",
+        "# TYPE jobs counter",
+        'jobs_total{queue="say \\"hi\\"\\n"} 1',
+        'jobs_total{queue="default"} 2',
+        "# HELP job_seconds Job time",
+        "# TYPE job_seconds histogram",
+        'job_seconds_bucket{le="0.1"} 1',
+        'job_seconds_bucket{le="1.0"} 3',
+        'job_seconds_bucket{le="+Inf"} 4',
+        "job_seconds_count 4",
+        "job_seconds_sum 4.05",
+    ]
+
+
+
+def test_incomplete_metric_type_fails_on_creation():
+    class NoSamples(Metric):
+        def _new_child(self):
+            return 0
+
+    with pytest.raises(TypeError):
+        NoSamples("broken", "Never rendered", registry=MetricsRegistry())
+
+def _scrape() -> str:
+    response = client.get("/api/v1/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return response.text
+
+
+def _value(text: str, sample: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(sample + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+def test_metrics_endpoint(auth_headers):
+    requests = 'http_requests_total{method="GET",route="/api/v1/contacts/{contact_id}",status="404"}'
+    before = _value(_scrape(), requests)
+    for contact_id in (123456, 654321):
+        assert client.get(f"/api/v1/contacts/{contact_id}", headers=auth_headers).status_code == 404
+    client.get("/api/v1/no-such-page")
+
+    text = _scrape()
+    # Labelled with the route template, not the requested path
+    assert _value(text, requests) == before + 2
+    assert _value(
+        text, 'http_request_duration_seconds_count{method="GET",route="/api/v1/contacts/{contact_id}"}'
+    ) >= 2
+    assert 'route="<unmatched>",status="404"' in text
+    assert _value(text, 'http_requests_in_progress{method="GET"}') == 1  # The scrape itself
+    assert _value(text, 'db_pool_connections{engine="async",state="checked_out"}') >= 0
+    assert 'db_pool_wait_seconds_count{engine="async"}' in text
+    # auth_headers logged in, which verified a password on the hashing pool
+    assert _value(text, 'password_hash_duration_seconds_count{operation="verify"}') >= 1
+    assert 'audit_writer{stat="written"}' in text
+    assert _value(text, 'token_cache{stat="size"}') >= 1
+    assert 'user_cache{stat="hits"}' in text
+    assert 'contact_list_cache{stat="misses"}' in text
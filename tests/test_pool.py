@@ -0,0 +1,90 @@
+import asyncio
+import logging
+
+import httpx
+from anyio import to_thread
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core import database
+from app.core.config import settings
+from app.core.database import InstrumentedAsyncAdaptedQueuePool, get_engine_config, pool_timeouts
+from app.main import app
+
+
+def test_engine_config_follows_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 20)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    monkeypatch.setattr(settings, "DB_POOL_TIMEOUT", 2.5)
+    monkeypatch.setattr(settings, "DB_POOL_PRE_PING", True)
+    monkeypatch.setattr(settings, "DB_POOL_RECYCLE", 1800)
+    config = get_engine_config(use_async=True)
+    assert config["pool_size"] == 20
+    assert config["max_overflow"] == 0
+    assert config["pool_timeout"] == 2.5
+    assert config["pool_pre_ping"] is True
+    assert config["pool_recycle"] == 1800
+    assert config["poolclass"] is InstrumentedAsyncAdaptedQueuePool
+
+
+def test_thread_limiter_matches_pool(client):
+    tokens = client.portal.call(lambda: to_thread.current_default_thread_limiter().total_tokens)
+    assert tokens == settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+
+
+def _small_engine():
+    return create_async_engine(
+        settings.ASYNC_DATABASE_URL,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+
+
+def test_pool_timeout_answers_503(monkeypatch, caplog, user):
+    small_engine = _small_engine()
+    monkeypatch.setattr(database, "async_engine", small_engine)
+    monkeypatch.setattr(settings, "DB_POOL_WAIT_WARNING_MS", 10)
+    timeouts = pool_timeouts.labels("async")
+    before = timeouts.value
+
+    async def request_while_pool_is_busy():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            # The only connection is taken, so the request can't get one
+            async with small_engine.connect():
+                response = await http.post(
+                    "/api/v1/users/login", data={"username": "test@example.com", "password": "testpassword"}
+                )
+        await small_engine.dispose()
+        return response
+
+    with caplog.at_level(logging.WARNING, logger="app.core.database"):
+        response = asyncio.run(request_while_pool_is_busy())
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert timeouts.value == before + 1
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(message.startswith("No async database connection within 0.05s") for message in messages)
+    assert any(message.startswith("Waited") for message in messages)
+
+
+def test_pool_timeout_on_write_answers_503(monkeypatch, client, auth_headers):
+    # The current user is cached, so the insert is the first statement to need a connection
+    assert client.get("/api/v1/users/me", headers=auth_headers).status_code == 200
+    small_engine = _small_engine()
+    monkeypatch.setattr(database, "async_engine", small_engine)
+
+    async def create_while_pool_is_busy():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as http:
+            async with small_engine.connect():
+                response = await http.post(
+                    "/api/v1/contacts/", json={"first_name": "Ada", "last_name": "Lovelace"}, headers=auth_headers
+                )
+        await small_engine.dispose()
+        return response
+
+    response = asyncio.run(create_while_pool_is_busy())
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
@@ -0,0 +1,105 @@
+"""
+Query budgets for every endpoint, measured on a cold cache (user and
+listing caches empty). Raise a budget only together with the change that
+needs the extra query.
+"""
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+
+client = TestClient(app)
+
+USERS = "/api/v1/users"
+CONTACTS = "/api/v1/contacts"
+
+
+@pytest.fixture
+def contact(auth_headers):
+    response = client.post(f"{CONTACTS}/", json={"first_name": "Ada", "last_name": "Lovelace"}, headers=auth_headers)
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_user_endpoints(assert_max_queries, user, superuser_headers):
+    with assert_max_queries(3):  # Email check, insert, refresh
+        response = client.post(f"{USERS}/register", json={
+            "email": "budget@example.com", "full_name": "Budget", "password": "secretpassword"
+        })
+    assert response.status_code == 201
+    with assert_max_queries(1):
+        response = client.post(f"{USERS}/login", data={"username": "test@example.com", "password": "testpassword"})
+    assert response.status_code == 200
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    with assert_max_queries(1):  # Current user, then cached
+        assert client.get(f"{USERS}/me", headers=headers).status_code == 200
+    with assert_max_queries(0):
+        assert client.get(f"{USERS}/me", headers=headers).status_code == 200
+    with assert_max_queries(3):  # Load, update, refresh
+        assert client.put(f"{USERS}/me", json={"full_name": "Renamed"}, headers=headers).status_code == 200
+    with assert_max_queries(2):  # Current user, page with total
+        assert client.get(f"{USERS}/", headers=superuser_headers).status_code == 200
+
+
+def test_contact_read_endpoints(assert_max_queries, auth_headers, contact):
+    with assert_max_queries(3):  # Current user, version, page with total
+        assert client.get(f"{CONTACTS}/", headers=auth_headers).status_code == 200
+    with assert_max_queries(0):  # Served from the listing cache
+        assert client.get(f"{CONTACTS}/", headers=auth_headers).status_code == 200
+    with assert_max_queries(2):
+        assert client.get(f"{CONTACTS}/", params={"search": "ada"}, headers=auth_headers).status_code == 200
+    with assert_max_queries(1):
+        assert client.get(f"{CONTACTS}/{contact['id']}", headers=auth_headers).status_code == 200
+    with assert_max_queries(1):
+        assert client.get(f"{CONTACTS}/export", headers=auth_headers).status_code == 200
+
+
+def test_contact_write_endpoints(assert_max_queries, auth_headers, contact):
+    with assert_max_queries(3):  # Current user, insert, refresh
+        response = client.post(f"{CONTACTS}/", json={"first_name": "Grace", "last_name": "Hopper"}, headers=auth_headers)
+    assert response.status_code == 201
+    grace = response.json()
+    with assert_max_queries(3):  # Load, update, refresh
+        response = client.put(f"{CONTACTS}/{contact['id']}", json={"phone": "555-0100"}, headers=auth_headers)
+    assert response.status_code == 200
+    with assert_max_queries(1):  # One insert per batch
+        response = client.post(
+            f"{CONTACTS}/import", content=b"first_name,last_name\na,b\nc,d\n",
+            headers={**auth_headers, "Content-Type": "text/csv"}
+        )
+    assert response.status_code == 200
+    assert response.json()["imported"] == 2
+    with assert_max_queries(1):
+        response = client.patch(
+            f"{CONTACTS}/bulk", json={"search": "ada", "changes": {"phone": "555-0101"}}, headers=auth_headers
+        )
+    assert response.status_code == 200
+    assert response.json()["affected"] == 1
+    with assert_max_queries(1):
+        response = client.post(f"{CONTACTS}/bulk-delete", json={"ids": [contact["id"]]}, headers=auth_headers)
+    assert response.status_code == 200
+    with assert_max_queries(2):  # Load, delete
+        response = client.delete(f"{CONTACTS}/{grace['id']}", headers=auth_headers)
+    assert response.status_code == 204
+
+
+def test_budget_exceeded_reports_statements(assert_max_queries, auth_headers):
+    with pytest.raises(AssertionError, match=r"at most 0 queries, got 1:\s+1x SELECT"):
+        with assert_max_queries(0):
+            assert client.get(f"{USERS}/me", headers=auth_headers).status_code == 200
+
+
+def test_server_timing_and_repeated_statements(auth_headers, contact, monkeypatch, caplog):
+    response = client.get(f"{CONTACTS}/{contact['id']}", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith('db;dur=')
+    assert 'desc="1 query", app;dur=' in response.headers["server-timing"]
+
+    monkeypatch.setattr(settings, "QUERY_REPEAT_WARNING_THRESHOLD", 2)
+    with caplog.at_level(logging.WARNING, logger="app.core.query_counter"):
+        assert client.put(f"{USERS}/me", json={"full_name": "Renamed"}, headers=auth_headers).status_code == 200
+    assert "Possible N+1 query in PUT /api/v1/users/me: ran 2 times" in caplog.text
@@ -0,0 +1,101 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.rate_limit import LocalRateLimitStore, RateLimiter, RedisRateLimitStore
+from app.core.security import create_access_token
+from app.main import create_application
+
+API = settings.API_V1_PREFIX
+
+
+@pytest.mark.parametrize("store_name", ["local", "redis"])
+def test_sliding_window(store_name, fake_redis):
+    store = LocalRateLimitStore(100) if store_name == "local" else RedisRateLimitStore(fake_redis)
+    limiter = RateLimiter(store, window=60)
+    start = 6000.0  # Start of a window
+
+    assert all(limiter.hit("k", 3, now=start + i).allowed for i in range(3))
+    rejected = limiter.hit("k", 3, now=start + 10)
+    assert not rejected.allowed
+    # The 4 hits of this window still count ~4 early in the next one: 3 * (1 - t/60) + 1 <= 3 from t = 30
+    assert rejected.retry_after == 80
+    assert limiter.hit("other", 3, now=start + 10).allowed
+
+    # 15s into the next window, 3 * 0.75 of the previous window still counts
+    assert not limiter.hit("k", 3, now=start + 75).allowed
+    assert limiter.hit("k", 3, now=start + 119).allowed
+
+
+# `previous` hits in the last window, then `hits` spread over the first
+# `spread` seconds of this one, the last of them rejected (limit 3)
+@pytest.mark.parametrize("previous, hits, spread", [(0, 4, 10), (0, 5, 50), (6, 1, 0), (6, 2, 5), (3, 2, 30)])
+def test_retry_after_is_enough(previous, hits, spread):
+    start = 6000.0
+    last = start + spread * (hits - 1) / hits
+
+    def rejected_then_retried(wait=None):
+        limiter = RateLimiter(LocalRateLimitStore(100), window=60)
+        for i in range(previous):
+            limiter.hit("k", 3, now=start - 60 + i)
+        for i in range(hits):
+            result = limiter.hit("k", 3, now=start + spread * i / hits)
+        assert not result.allowed
+        retried = limiter.hit("k", 3, now=last + (result.retry_after if wait is None else wait))
+        return result.retry_after, retried.allowed
+
+    retry_after, allowed = rejected_then_retried()
+    assert allowed
+    # And not longer than needed, to the second
+    assert not rejected_then_retried(retry_after - 1)[1]
+
+
+def test_local_store_evicts_idle_and_excess_keys():
+    store = LocalRateLimitStore(max_keys=2)
+    store.incr("idle", ttl=0.01)
+    time.sleep(0.02)
+    store.incr("a", ttl=60)
+    assert store.get("idle") == 0
+    assert len(store) == 1
+
+    store.incr("b", ttl=60)
+    store.incr("c", ttl=60)
+    assert len(store) == 2
+    assert store.get("a") == 0
+    assert store.get("c") == 1
+
+
+@pytest.fixture
+def limited_client(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_PER_MINUTE", 3)
+    monkeypatch.setattr(settings, "RATE_LIMIT_LOGIN_PER_MINUTE", 2)
+    monkeypatch.setattr(settings, "RATE_LIMIT_REGISTER_PER_MINUTE", 0)
+    return TestClient(create_application())
+
+
+def test_middleware_limits_per_user_and_ip(limited_client):
+    alice = {"Authorization": f"Bearer {create_access_token({'sub': '1001'})}"}
+    bob = {"Authorization": f"Bearer {create_access_token({'sub': '1002'})}"}
+    url = f"{API}/contacts/"
+
+    statuses = [limited_client.get(url, headers=alice).status_code for _ in range(4)]
+    assert statuses[:3] == [401, 401, 401]  # Passed through to the app
+    assert statuses[3] == 429
+    response = limited_client.get(url, headers=alice)
+    assert response.json() == {"detail": "Too many requests"}
+    assert 0 < int(response.headers["retry-after"]) <= 60
+
+    # Other users and anonymous clients have their own budget
+    assert limited_client.get(url, headers=bob).status_code == 401
+    assert limited_client.get(url).status_code == 401
+    assert limited_client.options(url, headers={
+        **alice, "Origin": "http://localhost:3000", "Access-Control-Request-Method": "GET"
+    }).status_code == 200
+
+
+def test_middleware_login_budget(limited_client):
+    login = f"{API}/users/login"
+    form = {"username": "nobody@example.com", "password": "wrong"}
+    assert [limited_client.post(login, data=form).status_code for _ in range(3)] == [401, 401, 429]
@@ -0,0 +1,134 @@
+import asyncio
+import os
+import tempfile
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert, select
+
+from app.core import database
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import Base, ReplicaSet, async_database_url, create_replica_engine
+from app.core.security import create_access_token
+from app.main import app
+from app.models.contact import Contact
+from app.models.user import User
+
+pytestmark = pytest.mark.skipif(settings.DB_TYPE != "sqlite", reason="SQLite files stand in for the replicas")
+
+client = TestClient(app)
+
+CONTACTS = "/api/v1/contacts/"
+
+
+@pytest.fixture
+def replicas(monkeypatch, db, user):
+    """
+    Two SQLite "replicas" holding a copy of `user` and of contact 1, named
+    after the replica, so responses tell which database served them.
+    The third URL can't be opened.
+    """
+    directory = tempfile.mkdtemp(prefix="fastapi-template-replicas-")
+    urls = [f"sqlite:///{os.path.join(directory, f'replica{i}.db')}" for i in range(2)]
+    for name, url in zip(("replica0", "replica1"), urls):
+        sync_engine = create_engine(url)
+        Base.metadata.create_all(bind=sync_engine)
+        with sync_engine.begin() as connection:
+            connection.execute(insert(User).values(
+                id=user.id, email=user.email, hashed_password=user.hashed_password, is_active=True
+            ))
+            connection.execute(insert(Contact).values(id=1, user_id=user.id, first_name=name, last_name="Replica"))
+        sync_engine.dispose()
+    urls.append(f"sqlite:///{os.path.join(directory, 'missing', 'replica2.db')}")
+
+    replica_set = ReplicaSet([create_replica_engine(url) for url in urls], eject_seconds=60)
+    monkeypatch.setattr(database, "replicas", replica_set)
+    monkeypatch.setattr(database, "recent_writers", TTLCache(maxsize=100, ttl=0))
+    db.add(Contact(id=1, user_id=user.id, first_name="primary", last_name="Primary"))
+    db.commit()
+    yield replica_set
+    asyncio.run(replica_set.dispose())
+
+
+def _served_by(headers):
+    response = client.get(f"{CONTACTS}1", headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["first_name"]
+
+
+def test_async_database_url():
+    assert str(async_database_url("sqlite:///replica.db")) == "sqlite+aiosqlite:///replica.db"
+    assert async_database_url("postgresql://u:p@replica:5432/db").drivername == "postgresql+asyncpg"
+    assert async_database_url("mysql+pymysql://u:p@replica/db").drivername == "mysql+aiomysql"
+    assert async_database_url("postgresql+asyncpg://u:p@replica/db").drivername == "postgresql+asyncpg"
+
+
+def test_replica_set_skips_ejected_replicas():
+    replica_set = ReplicaSet(["a", "b", "c"], eject_seconds=60)
+    assert [replica_set.choose()[1] for _ in range(4)] == ["a", "b", "c", "a"]
+    replica_set.eject(1)
+    assert {replica_set.choose()[1] for _ in range(4)} == {"a", "c"}
+    replica_set.eject(0)
+    replica_set.eject(2)
+    assert replica_set.healthy() == 0
+    assert replica_set.choose() is None
+    assert ReplicaSet([], eject_seconds=60).choose() is None
+
+
+def test_reads_go_round_robin_to_replicas(replicas, auth_headers):
+    replicas.eject(2)
+    assert {_served_by(auth_headers) for _ in range(4)} == {"replica0", "replica1"}
+
+
+def test_writes_go_to_primary(replicas, auth_headers, db):
+    replicas.eject(2)
+    response = client.put(f"{CONTACTS}1", json={"last_name": "Updated"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["first_name"] == "primary"
+    assert db.scalar(select(Contact.last_name).where(Contact.id == 1)) == "Updated"
+
+
+def test_reads_after_a_write_stay_on_primary(replicas, auth_headers, monkeypatch):
+    replicas.eject(2)
+    monkeypatch.setattr(database, "recent_writers", TTLCache(maxsize=100, ttl=60))
+    assert _served_by(auth_headers).startswith("replica")
+    client.put(f"{CONTACTS}1", json={"last_name": "Updated"}, headers=auth_headers)
+    assert {_served_by(auth_headers) for _ in range(4)} == {"primary"}
+
+
+def test_failing_replica_is_ejected_and_read_retried_on_primary(replicas, auth_headers):
+    served = sorted(_served_by(auth_headers) for _ in range(3))
+    assert served == ["primary", "replica0", "replica1"]
+    assert replicas.healthy() == 2
+    assert {_served_by(auth_headers) for _ in range(4)} == {"replica0", "replica1"}
+
+
+def test_reads_fall_back_to_primary_without_healthy_replicas(replicas, auth_headers):
+    for index in range(3):
+        replicas.eject(index)
+    assert _served_by(auth_headers) == "primary"
+
+
+def test_registration_keeps_the_new_users_reads_on_primary(replicas, monkeypatch):
+    replicas.eject(2)
+    monkeypatch.setattr(database, "recent_writers", TTLCache(maxsize=100, ttl=60))
+    response = client.post("/api/v1/users/register", json={
+        "email": "fresh@example.com", "full_name": "Fresh", "password": "secretpassword"
+    })
+    assert response.status_code == 201
+    login = client.post("/api/v1/users/login", data={"username": "fresh@example.com", "password": "secretpassword"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    # The replicas don't have the new user yet
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+
+
+def test_stickiness_follows_the_user_not_the_token(replicas, user, auth_headers, monkeypatch):
+    replicas.eject(2)
+    monkeypatch.setattr(database, "recent_writers", TTLCache(maxsize=100, ttl=60))
+    client.put(f"{CONTACTS}1", json={"last_name": "Updated"}, headers=auth_headers)
+    token = create_access_token({"sub": str(user.id)}, expires_delta=timedelta(minutes=5))
+    other_token = {"Authorization": f"Bearer {token}"}
+    assert other_token != auth_headers
+    assert _served_by(other_token) == "primary"
@@ -0,0 +1,74 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from jose import JWTError
+
+from app.core import security
+from app.core.security import (
+    PasswordHasher, PasswordHasherBusyError, create_access_token, decode_access_token,
+    get_password_hash, token_cache
+)
+from app.main import app
+
+client = TestClient(app)
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_round_trip():
+    hasher = PasswordHasher(max_workers=1, queue_size=1)
+    try:
+        hashed = await hasher.hash("s3cret-password")
+        assert await hasher.verify("s3cret-password", hashed)
+        assert not await hasher.verify("wrong-password", hashed)
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hasher_rejects_when_saturated():
+    hasher = PasswordHasher(max_workers=1, queue_size=0)
+    hashed = get_password_hash("s3cret-password")
+    try:
+        running = asyncio.ensure_future(hasher.verify("s3cret-password", hashed))
+        await asyncio.sleep(0)
+        with pytest.raises(PasswordHasherBusyError):
+            await hasher.verify("s3cret-password", hashed)
+        assert await running
+        # The slot is released once the job finishes
+        assert await hasher.verify("s3cret-password", hashed)
+    finally:
+        hasher.shutdown()
+
+
+def test_login_returns_503_when_hasher_saturated(user, monkeypatch):
+    saturated = PasswordHasher(max_workers=1, queue_size=0)
+    saturated._slots.acquire()
+    monkeypatch.setattr(security, "password_hasher", saturated)
+
+    response = client.post("/api/v1/users/login", data={"username": "test@example.com", "password": "testpassword"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_decode_access_token_memoizes_verification(monkeypatch):
+    token = create_access_token({"sub": "42"})
+    calls = []
+    decode = security.jwt.decode
+    monkeypatch.setattr(security.jwt, "decode", lambda *a, **kw: calls.append(1) or decode(*a, **kw))
+
+    assert decode_access_token(token)["sub"] == "42"
+    assert decode_access_token(token)["sub"] == "42"
+    assert len(calls) == 1
+
+
+def test_decode_access_token_does_not_cache_invalid_tokens():
+    size = len(token_cache)
+    for i in range(3):
+        with pytest.raises(JWTError):
+            decode_access_token(f"not-a-token-{i}")
+    expired = create_access_token({"sub": "1"}, expires_delta=timedelta(seconds=-1))
+    with pytest.raises(JWTError):
+        decode_access_token(expired)
+    assert len(token_cache) == size
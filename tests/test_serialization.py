@@ -0,0 +1,34 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.schemas.contact import ContactCreate
+from app.services import contact as contact_service
+
+client = TestClient(app)
+
+
+def _get_both_ways(monkeypatch, url, headers, **params):
+    default = client.get(url, params=params, headers=headers)
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", True)
+    fast = client.get(url, params=params, headers=headers)
+    monkeypatch.setattr(settings, "FAST_JSON_RESPONSES", False)
+    assert default.status_code == fast.status_code == 200
+    assert fast.headers["content-type"] == "application/json"
+    return default, fast
+
+
+def test_fast_contact_page_matches_response_model(db, user, auth_headers, monkeypatch):
+    for i in range(3):
+        contact_service.create_contact(db, user.id, ContactCreate(
+            first_name=f"Contact{i}", last_name="Ünïcode", email=f"c{i}@example.com" if i else None
+        ))
+    default, fast = _get_both_ways(monkeypatch, "/api/v1/contacts/", auth_headers, limit=2)
+    assert fast.content == default.content
+    assert fast.json()["next_cursor"]
+
+
+def test_fast_user_page_matches_response_model(superuser_headers, user, monkeypatch):
+    default, fast = _get_both_ways(monkeypatch, "/api/v1/users/", superuser_headers)
+    assert fast.json() == default.json()
+    assert "hashed_password" not in fast.text
@@ -0,0 +1,115 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.server import engines_per_worker, local_state_warnings, main, pool_share
+
+
+def test_pool_share(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 5)
+    assert pool_share(100, 4, 2) == (5, 7)
+    assert pool_share(8, 2, 2) == (2, 0)
+    assert pool_share(40, 2, 4) == (5, 0)  # Sync, async and two replicas
+    monkeypatch.setattr(settings, "DB_REPLICA_URLS", ["sqlite:///a.db"])
+    assert engines_per_worker() == 3
+
+
+def test_pool_share_refuses_budget_below_one_connection_per_engine(monkeypatch, capsys):
+    with pytest.raises(ValueError, match="at least 8"):
+        pool_share(3, 4, 2)  # Was (1, 0) each: 8 connections for a budget of 3
+
+    # The server refuses to start, before binding its socket
+    monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", 3)
+    with pytest.raises(SystemExit):
+        main(["--workers", "4", "--port", "0"])
+    assert "DB_MAX_CONNECTIONS=3" in capsys.readouterr().err
+
+
+def test_local_state_warnings(monkeypatch):
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_BACKEND", "local")
+    monkeypatch.setattr(settings, "RATE_LIMIT_BACKEND", "local")
+    monkeypatch.setattr(settings, "RATE_LIMIT_PER_MINUTE", 60)
+    assert local_state_warnings(1) == []
+    warnings = local_state_warnings(4)
+    assert any(w.startswith("RESPONSE_CACHE_BACKEND=local") for w in warnings)
+    assert any(w.startswith("User cache") for w in warnings)
+    assert any(w.startswith("Token cache") for w in warnings)
+    assert any("up to 4 times the configured limits" in w for w in warnings)
+
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_BACKEND", "redis")
+    monkeypatch.setattr(settings, "RATE_LIMIT_BACKEND", "redis")
+    assert not any("BACKEND=local" in w for w in local_state_warnings(4))
+
+
+def test_forked_worker_gets_empty_pools():
+    script = """
+import os
+from sqlalchemy import text
+from app.core.database import engine
+connection = engine.connect()  # Checked out in the parent
+pid = os.fork()
+if pid == 0:
+    ok = engine.pool.checkedout() == 0
+    with engine.connect() as own:
+        ok = ok and own.execute(text("SELECT 1")).scalar() == 1
+    os._exit(0 if ok else 1)
+_, status = os.waitpid(pid, 0)
+assert os.waitstatus_to_exitcode(status) == 0, "child saw the parent's pool"
+assert connection.execute(text("SELECT 1")).scalar() == 1
+"""
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _workers(pid: int):
+    with open(f"/proc/{pid}/task/{pid}/children") as f:
+        return f.read().split()
+
+
+def test_server_replaces_dead_workers_and_drains_on_sigterm():
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server", "--port", str(port), "--workers", "2"],
+        env={**os.environ, "LOG_LEVEL": "WARNING"},
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    url = f"http://127.0.0.1:{port}{settings.API_V1_PREFIX}/openapi.json"
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                if httpx.get(url).status_code == 200:
+                    break
+            except httpx.TransportError:
+                assert time.monotonic() < deadline, "server did not start"
+                time.sleep(0.2)
+        workers = _workers(server.pid)
+        assert len(workers) == 2
+
+        os.kill(int(workers[0]), signal.SIGKILL)
+        deadline = time.monotonic() + 10
+        while len(replaced := _workers(server.pid)) < 2 or workers[0] in replaced:
+            assert time.monotonic() < deadline, "dead worker was not replaced"
+            time.sleep(0.1)
+        assert httpx.get(url).status_code == 200
+
+        server.send_signal(signal.SIGTERM)
+        assert server.wait(timeout=20) == 0
+    finally:
+        if server.poll() is None:
+            server.kill()
+            server.wait()
+    assert b"Traceback" not in server.stderr.read()
@@ -0,0 +1,50 @@
+import os
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+
+pytestmark = pytest.mark.skipif(settings.DB_TYPE != "sqlite", reason="SQLite only")
+
+PRAGMAS = "SELECT * FROM pragma_synchronous, pragma_busy_timeout, pragma_cache_size, pragma_journal_mode"
+
+
+def _expected():
+    journal_mode = "memory" if settings.SQLITE_IN_MEMORY else "wal"
+    return (1, 5000, -8192, journal_mode)  # synchronous=NORMAL is 1
+
+
+def test_pragmas_on_sync_connections(db):
+    assert tuple(db.execute(text(PRAGMAS)).one()) == _expected()
+
+
+@pytest.mark.asyncio
+async def test_pragmas_on_async_connections():
+    async with AsyncSessionLocal() as db:
+        assert tuple((await db.execute(text(PRAGMAS))).one()) == _expected()
+
+
+def test_in_memory_database_is_shared_by_both_engines():
+    script = """
+import asyncio
+from sqlalchemy import text
+from app.core.database import Base, SessionLocal, AsyncSessionLocal, engine
+import app.models.user
+Base.metadata.create_all(bind=engine)
+with SessionLocal() as db:
+    db.execute(text("INSERT INTO t_user (email, hashed_password) VALUES ('a@example.com', 'x')"))
+    db.commit()
+engine.dispose()  # The database outlives the pooled connections
+async def count():
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(text("SELECT count(*) FROM t_user"))
+print(asyncio.run(count()))
+"""
+    env = {**os.environ, "DB_NAME": ":memory:"}
+    result = subprocess.run([sys.executable, "-c", script], env=env, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "1"
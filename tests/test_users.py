@@ -4,7 +4,53 @@ from app.main import app
 
 client = TestClient(app)
 
-def test_login():
-    response = client.post("/auth/login", json={"email": "test@example.com", "password": "testpassword"})
+def test_login(user):
+    response = client.post("/api/v1/users/login", data={"username": "test@example.com", "password": "testpassword"})
     assert response.status_code == 200
     assert "access_token" in response.json()
+
+def test_login_wrong_password(user):
+    response = client.post("/api/v1/users/login", data={"username": "test@example.com", "password": "wrongpassword"})
+    assert response.status_code == 401
+
+def test_register_and_read_me():
+    response = client.post("/api/v1/users/register", json={"email": "new@example.com", "password": "newpassword"})
+    assert response.status_code == 201
+    assert response.json()["email"] == "new@example.com"
+
+    response = client.post("/api/v1/users/login", data={"username": "new@example.com", "password": "newpassword"})
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    response = client.get("/api/v1/users/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["email"] == "new@example.com"
+
+def test_register_duplicate_email(user):
+    response = client.post("/api/v1/users/register", json={"email": "test@example.com", "password": "testpassword"})
+    assert response.status_code == 400
+
+def test_update_me(auth_headers):
+    response = client.put("/api/v1/users/me", json={"full_name": "Renamed"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["full_name"] == "Renamed"
+
+def test_read_users_requires_superuser(auth_headers):
+    response = client.get("/api/v1/users/", headers=auth_headers)
+    assert response.status_code == 403
+
+def test_read_users(superuser_headers, user):
+    response = client.get("/api/v1/users/", params={"email": "test@"}, headers=superuser_headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 1
+    assert body["items"][0]["email"] == "test@example.com"
+
+def test_read_users_cursor_pagination(superuser_headers, user):
+    body = client.get("/api/v1/users/", params={"limit": 1}, headers=superuser_headers).json()
+    assert body["total"] == 2
+    assert body["page"] == 1
+    first = body["items"][0]["id"]
+
+    body = client.get("/api/v1/users/", params={"limit": 1, "cursor": body["next_cursor"]}, headers=superuser_headers).json()
+    assert body["items"][0]["id"] > first
+    assert body["next_cursor"] is None
+    assert body["page"] is None